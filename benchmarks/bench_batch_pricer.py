@@ -0,0 +1,69 @@
+"""
+Compares batch repricing with pricing every cart through Cart.calculate_total.
+
+Usage:
+    python -m benchmarks.bench_batch_pricer [CARTS ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.batch_pricer import BatchPricer
+from classes.cart import Cart
+from classes.columnar_store import ColumnarStore
+from classes.pricing import PricingEngine
+
+CATALOG_SIZE = 100_000
+LINES_PER_CART = 20
+
+
+def per_cart_loop(store, carts, members):
+    """
+    Prices every cart on its own, as a reconciliation job would without the batch API.
+
+    Returns:
+        dict: The (subtotal, tax, total) of every cart.
+    """
+    engine = PricingEngine()
+    return {
+        cart_id: engine.totals(cart.calculate_total(store, members.get(cart_id, False)))
+        for cart_id, cart in carts.items()
+    }
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (1_000, 10_000))
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        store = ColumnarStore(inventory_file)
+        pricer = BatchPricer(store)
+        print(f"{'carts':>8} {'lines':>9} {'loop s':>8} {'batch s':>8} {'speedup':>8}")
+        for size in sizes:
+            rng = random.Random(size)
+            carts = {}
+            for cart_id in range(size):
+                cart = Cart()
+                for _ in range(LINES_PER_CART):
+                    cart.add_item(rng.choice(names), rng.randint(1, 5))
+                carts[cart_id] = cart
+            members = {cart_id: rng.random() < 0.5 for cart_id in carts}
+
+            start = time.perf_counter()
+            expected = per_cart_loop(store, carts, members)
+            loop_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            result = pricer.reprice_carts(carts, members)
+            batch_seconds = time.perf_counter() - start
+            assert all(tuple(result.carts[cart_id]) == totals for cart_id, totals in expected.items())
+            print(
+                f"{size:>8} {size * LINES_PER_CART:>9} {loop_seconds:>8.3f} "
+                f"{batch_seconds:>8.3f} {loop_seconds / batch_seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+"""
+Compares memory use, load time and lookup speed of the dict and columnar stores.
+
+Usage:
+    python -m benchmarks.bench_columnar_store [SIZE ...]
+"""
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.store import Store
+
+LOOKUPS = 200_000
+
+
+def measure(store_class, inventory_file, sample):
+    """
+    Loads a store and times lookups against it.
+
+    Args:
+        store_class (type): The store class to benchmark.
+        inventory_file (str): The inventory file to load.
+        sample (list): The item names to look up.
+
+    Returns:
+        tuple: Load seconds, retained bytes and lookups per second.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = store_class(inventory_file)
+    load_seconds = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for item in sample:
+        store.get_item_price(item, False)
+        store.get_item_tax_status(item)
+        store.is_item_available(item, 0)
+    lookups_per_second = len(sample) / (time.perf_counter() - start)
+    return load_seconds, retained, lookups_per_second
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (10_000, 100_000, 1_000_000))
+    print(f"{'SKUs':>10} {'backend':>9} {'load s':>8} {'MiB':>8} {'B/SKU':>7} {'lookups/s':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            inventory_file = os.path.join(directory, f"inventory_{size}.txt")
+            names = write_inventory(inventory_file, size)
+            rng = random.Random(1)
+            sample = [rng.choice(names) for _ in range(LOOKUPS)]
+            for label, store_class in (("dict", Store), ("columnar", ColumnarStore)):
+                load_seconds, retained, rate = measure(store_class, inventory_file, sample)
+                print(
+                    f"{size:>10} {label:>9} {load_seconds:>8.3f} "
+                    f"{retained / 2**20:>8.1f} {retained / size:>7.0f} {rate:>12,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
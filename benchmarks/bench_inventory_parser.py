@@ -0,0 +1,102 @@
+"""
+Compares the inventory parser against the original split-based loader.
+
+Usage:
+    python -m benchmarks.bench_inventory_parser [SIZE ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.inventory_parser import InventoryParser
+from classes.store import Store
+
+
+def split_loader(inventory_file):
+    """
+    The loader Store used before the dedicated parser, kept as the baseline.
+
+    Args:
+        inventory_file (str): The inventory file to load.
+
+    Returns:
+        dict: The inventory as a dict of dicts.
+    """
+    inventory = {}
+    with open(inventory_file, "r") as file:
+        for line in file:
+            (
+                item_and_quantity,
+                reg_price,
+                mem_price,
+                tax_status,
+            ) = line.strip().split(", ")
+            item, quantity = item_and_quantity.strip().split(": ")
+            inventory[item] = {
+                "quantity": int(quantity),
+                "regular_price": float(reg_price[1:]),
+                "member_price": float(mem_price[1:]),
+                "tax_status": tax_status,
+            }
+    return inventory
+
+
+def parser_loader(inventory_file):
+    """
+    Reads the file in one bulk read and parses it with InventoryParser.
+
+    Args:
+        inventory_file (str): The inventory file to load.
+
+    Returns:
+        tuple: The parsed columns.
+    """
+    with open(inventory_file, "rb") as file:
+        return InventoryParser().parse_columns(file.read())
+
+
+def best_of(function, argument, repeat=3):
+    """
+    Times a function and returns the fastest run.
+
+    Args:
+        function (callable): The function to time.
+        argument (object): The argument to pass to the function.
+        repeat (int): The number of runs.
+
+    Returns:
+        float: The fastest run in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (100_000, 1_000_000))
+    print(
+        f"{'lines':>10} {'split s':>9} {'parser s':>9} {'ratio':>7} "
+        f"{'Store s':>9} {'Columnar s':>11}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            inventory_file = os.path.join(directory, f"inventory_{size}.txt")
+            write_inventory(inventory_file, size)
+            baseline = best_of(split_loader, inventory_file)
+            parsed = best_of(parser_loader, inventory_file)
+            store = best_of(Store, inventory_file)
+            columnar = best_of(ColumnarStore, inventory_file)
+            print(
+                f"{size:>10} {baseline:>9.3f} {parsed:>9.3f} {parsed / baseline:>7.2f} "
+                f"{store:>9.3f} {columnar:>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+"""
+Compares applying an edit of the inventory file to a running store with
+loading the whole file again.
+
+For each number of edited lines, that many lines of a 100,000 item catalog get
+a new price and quantity. The time to diff and parse the changed lines, the
+whole reload_inventory call, and a full load of a new store are reported.
+
+Usage:
+    python -m benchmarks.bench_inventory_reload [EDITED_LINES ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.inventory_diff import diff_inventory
+
+CATALOG_SIZE = 100_000
+
+
+def edit_lines(data, count, rng):
+    lines = data.splitlines(keepends=True)
+    for number in rng.sample(range(len(lines)), count):
+        item = lines[number].split(b": ")[0].decode()
+        lines[number] = (
+            f"{item}: {rng.randint(0, 500)}, ${rng.randint(50, 5000) / 100:.2f}, $0.40, Taxable\n"
+        ).encode()
+    return b"".join(lines)
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (1, 100, 10_000))
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        write_inventory(inventory_file, CATALOG_SIZE)
+        store = ColumnarStore(inventory_file)
+        store.reload_inventory()
+        print(f"{'edited':>8} {'diff ms':>8} {'reload ms':>10} {'full load ms':>13}")
+        for size in sizes:
+            with open(inventory_file, "rb") as file:
+                old_data = file.read()
+            new_data = edit_lines(old_data, size, rng)
+            start = time.perf_counter()
+            diff_inventory(old_data, new_data)
+            diff_ms = (time.perf_counter() - start) * 1e3
+            with open(inventory_file, "wb") as file:
+                file.write(new_data)
+            start = time.perf_counter()
+            store.reload_inventory()
+            reload_ms = (time.perf_counter() - start) * 1e3
+            start = time.perf_counter()
+            ColumnarStore(inventory_file)
+            full_ms = (time.perf_counter() - start) * 1e3
+            print(f"{size:>8} {diff_ms:>8.1f} {reload_ms:>10.1f} {full_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,47 @@
+"""
+Measures item lookup index build time and per-query latency.
+
+Usage:
+    python -m benchmarks.bench_item_index [SKUS ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+
+QUERIES = 10_000
+
+
+def per_query_us(function, queries):
+    start = time.perf_counter()
+    for query in queries:
+        function(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (100_000, 1_000_000))
+    print(f"{'skus':>9} {'build s':>8} {'resolve us':>11} {'complete us':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            inventory_file = os.path.join(directory, "inventory.txt")
+            names = write_inventory(inventory_file, size)
+            store = ColumnarStore(inventory_file)
+            rng = random.Random(size)
+            typed = [rng.choice(names).lower() for _ in range(QUERIES)]
+            prefixes = [name[:9] for name in typed]
+
+            start = time.perf_counter()
+            store._item_index()
+            build = time.perf_counter() - start
+            resolve = per_query_us(store.resolve_item, typed)
+            complete = per_query_us(store.complete_items, prefixes)
+            print(f"{size:>9} {build:>8.3f} {resolve:>11.2f} {complete:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,59 @@
+"""
+Measures the cost of logging an error on the caller's thread.
+
+Compares a synchronous FileHandler, as ErrorLogger used, with the queued
+ErrorLogger, for distinct messages and for a flood of one repeated message.
+
+Usage:
+    python -m benchmarks.bench_logger [MESSAGES ...]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv
+from classes.logger import ErrorLogger
+
+
+def synchronous_logger(path):
+    logger = logging.getLogger("bench_synchronous")
+    logger.setLevel(logging.ERROR)
+    logger.propagate = False
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    logger.addHandler(handler)
+    return logger, handler
+
+
+def per_message_us(log, messages):
+    start = time.perf_counter()
+    for message in messages:
+        log(message)
+    return (time.perf_counter() - start) / len(messages) * 1e6
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (10_000, 100_000))
+    print(f"{'messages':>9} {'sync us':>8} {'queued us':>10} {'flood us':>9} {'queued s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            distinct = [f"Invalid input: {number}" for number in range(size)]
+            logger, handler = synchronous_logger(os.path.join(directory, f"sync-{size}.log"))
+            synchronous = per_message_us(logger.error, distinct)
+            logger.removeHandler(handler)
+            handler.close()
+
+            error_logger = ErrorLogger(os.path.join(directory, f"queued-{size}.log"), name="bench_queued",
+                                       max_bytes=0)
+            queued = per_message_us(lambda message: error_logger.log_error(message, choice="x"), distinct)
+            flood = per_message_us(lambda message: error_logger.log_error("Invalid input: x"), distinct)
+            start = time.perf_counter()
+            error_logger.close()
+            drained = time.perf_counter() - start
+            print(f"{size:>9} {synchronous:>8.2f} {queued:>10.2f} {flood:>9.2f} {drained:>9.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,165 @@
+"""
+Benchmarks the whole menu flow by replaying synthetic sessions headlessly.
+
+Each session picks a customer type, adds CART_SIZE random items one by one,
+views the cart, removes one unit and checks out. For every catalog and cart
+size it reports the per-operation latency (mean, p50 and p99), checkouts per
+second and the peak traced memory of a second, traced replay. The store is
+loaded and its item index built before the replay starts, so the timings
+cover the operations only while the peak memory includes the loaded catalog.
+The results are written as JSON so runs can be compared; --baseline prints
+the ratio of each mean latency to a previous results file.
+
+Usage:
+    python -m benchmarks.bench_menu_replay [--catalogs N ...] [--carts N ...]
+        [--transactions N] [--output FILE] [--baseline FILE]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import write_inventory
+from interfaces.replay import ReplayDriver, scratch_context
+
+OPERATIONS = ("add", "remove", "view", "checkout")
+
+
+def percentile(samples, fraction):
+    """
+    Returns the sample at the given fraction of the sorted samples.
+    """
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def session_script(names, cart_size, transactions, seed):
+    """
+    Generates the answers of a session of back to back transactions.
+
+    Args:
+        names (list): The item names to buy.
+        cart_size (int): The number of distinct items per transaction.
+        transactions (int): The number of transactions.
+        seed (int): The seed for the random generator.
+
+    Returns:
+        list: The answers of the session script.
+    """
+    rng = random.Random(seed)
+    answers = []
+    for _ in range(transactions):
+        answers += ["1", rng.choice("YN")]
+        items = rng.sample(names, cart_size)
+        for item in items:
+            answers += ["2", item, "1"]
+        answers += ["4", "3", items[0], "1", "5"]
+    return answers
+
+
+def replay(inventory_file, answers, traced):
+    """
+    Replays a script on a scratch copy of the inventory.
+
+    Args:
+        inventory_file (str): The inventory to copy.
+        answers (list): The answers of the session script.
+        traced (bool): Whether to trace memory allocations.
+
+    Returns:
+        tuple: The ReplayResult and the peak traced memory in bytes, or None
+            when not traced.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        context = scratch_context(inventory_file, directory)
+        if traced:
+            tracemalloc.start()
+        try:
+            context.store._item_index()
+            result = ReplayDriver(context).run(answers)
+            context.close()
+            peak = tracemalloc.get_traced_memory()[1] if traced else None
+        finally:
+            if traced:
+                tracemalloc.stop()
+    return result, peak
+
+
+def summarize(result, peak):
+    """
+    Builds the JSON record of one benchmark run.
+    """
+    operations = {}
+    for operation in OPERATIONS:
+        samples = result.timings.get(operation, [])
+        if samples:
+            operations[operation] = {
+                "count": len(samples),
+                "mean_us": sum(samples) / len(samples) * 1e6,
+                "p50_us": percentile(samples, 0.5) * 1e6,
+                "p99_us": percentile(samples, 0.99) * 1e6,
+            }
+    return {
+        "transactions": result.transactions,
+        "errors": len(result.errors),
+        "transactions_per_second": result.transactions_per_second,
+        "peak_memory_bytes": peak,
+        "operations": operations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--catalogs", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--carts", type=int, nargs="+", default=[5, 50])
+    parser.add_argument("--transactions", type=int, default=50)
+    parser.add_argument("--output", default="bench_menu_replay.json")
+    parser.add_argument("--baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            for run in json.load(file)["runs"]:
+                baseline[run["catalog"], run["cart_size"]] = run
+
+    runs = []
+    print(f"{'catalog':>8} {'cart':>5} {'op':>9} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'vs base':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for catalog in args.catalogs:
+            inventory_file = os.path.join(directory, f"inventory-{catalog}.txt")
+            names = write_inventory(inventory_file, catalog)
+            for cart_size in args.carts:
+                answers = session_script(names, cart_size, args.transactions, catalog + cart_size)
+                result, _ = replay(inventory_file, answers, traced=False)
+                _, peak = replay(inventory_file, answers, traced=True)
+                run = {"catalog": catalog, "cart_size": cart_size, **summarize(result, peak)}
+                runs.append(run)
+                previous = baseline.get((catalog, cart_size), {}).get("operations", {})
+                for operation, stats in run["operations"].items():
+                    ratio = ""
+                    if operation in previous:
+                        ratio = f"{stats['mean_us'] / previous[operation]['mean_us']:.2f}x"
+                    print(f"{catalog:>8} {cart_size:>5} {operation:>9} {stats['mean_us']:>9.1f} "
+                          f"{stats['p50_us']:>9.1f} {stats['p99_us']:>9.1f} {ratio:>8}")
+                print(f"{catalog:>8} {cart_size:>5} {run['transactions_per_second']:>8.1f} tx/s, "
+                      f"peak {peak / 2**20:.1f} MiB, {run['errors']} error(s)")
+
+    with open(args.output, "w") as file:
+        json.dump({
+            "benchmark": "menu_replay",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "transactions": args.transactions,
+            "runs": runs,
+        }, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures the per-call cost of the operation metrics on two hot paths.
+
+Usage:
+    python -m benchmarks.bench_metrics [CALLS ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.cart import Cart
+from classes.columnar_store import ColumnarStore
+from classes.metrics import Metrics, disable_metrics, enable_metrics
+
+CATALOG_SIZE = 10_000
+CART_SIZE = 20
+
+
+def per_call_ns(function, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def measure(store, cart, names, calls):
+    item = names[0]
+    return (
+        per_call_ns(lambda: store.is_item_available(item, 0), calls),
+        per_call_ns(lambda: cart.calculate_total(store, False), calls // 100),
+    )
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (100_000, 1_000_000))
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        store = ColumnarStore(inventory_file)
+        cart = Cart(store=store)
+        for item in names[:CART_SIZE]:
+            cart.add_item(item, 1)
+        print(f"{'calls':>9} {'available ns':>13} {'enabled ns':>11} {'total ns':>9} {'enabled ns':>11}")
+        for size in sizes:
+            disabled = measure(store, cart, names, size)
+            enable_metrics(Metrics())
+            try:
+                enabled = measure(store, cart, names, size)
+            finally:
+                disable_metrics()
+            print(f"{size:>9} {disabled[0]:>13.0f} {enabled[0]:>11.0f} {disabled[1]:>9.0f} {enabled[1]:>11.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
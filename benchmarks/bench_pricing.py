@@ -0,0 +1,83 @@
+"""
+Compares the integer-cent pricing engine with the float pricing it replaced.
+
+Usage:
+    python -m benchmarks.bench_pricing [LINES ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.pricing import PricingEngine
+from classes.store import Store
+
+CATALOG_SIZE = 100_000
+
+
+def float_pricing(store, items, rewards_member):
+    """
+    The float pricing Cart.calculate_total used to do, kept as the baseline.
+
+    Args:
+        store (Store): The store to price against.
+        items (list): (item, quantity) pairs.
+        rewards_member (bool): Indicates whether the customer is a rewards member.
+
+    Returns:
+        dict: The priced lines.
+    """
+    result = {}
+    for item, quantity in items:
+        price = store.get_item_price(item, rewards_member)
+        subtotal = price * quantity
+        taxes = 0.0
+        if store.get_item_tax_status(item) == 'Taxable':
+            taxes = subtotal * 0.065
+            subtotal *= 1.065
+        result[item] = {
+            "quantity": int(quantity),
+            "unit_price": price,
+            "unit_tax": taxes,
+            "total": subtotal,
+        }
+    return result
+
+
+def timed(function, *args):
+    """
+    Times a single call.
+
+    Returns:
+        float: The elapsed seconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (1_000, 100_000))
+    engine = PricingEngine()
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        stores = (("dict", Store(inventory_file)), ("columnar", ColumnarStore(inventory_file)))
+        print(f"{'lines':>8} {'backend':>9} {'float s':>9} {'cents s':>9} {'lines/s':>12}")
+        for size in sizes:
+            rng = random.Random(size)
+            items = [(rng.choice(names), rng.randint(1, 5)) for _ in range(size)]
+            for label, store in stores:
+                baseline = timed(float_pricing, store, items, False)
+                engine_seconds = timed(engine.price_items, store, items, False)
+                print(
+                    f"{size:>8} {label:>9} {baseline:>9.4f} {engine_seconds:>9.4f} "
+                    f"{size / engine_seconds:>12,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
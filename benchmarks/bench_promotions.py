@@ -0,0 +1,88 @@
+"""
+Measures compiling promotions and pricing carts with them.
+
+A promotions file of each size is generated over a catalog of 100,000 items,
+mixing multi-buy deals, member coupons and category discounts. The compile
+time and the cost of pricing a 20-line cart are compared with pricing
+without promotions.
+
+Usage:
+    python -m benchmarks.bench_promotions [PROMOTIONS ...]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.pricing import PricingEngine
+from classes.promotions import PromotionTable, read_promotions
+
+CATALOG_SIZE = 100_000
+CATEGORIES = 50
+CART_SIZE = 20
+CARTS = 2_000
+
+
+def write_categories(path, names):
+    with open(path, "w") as file:
+        for number, item in enumerate(names):
+            file.write(f"{item}: Category {number % CATEGORIES:02d}\n")
+
+
+def write_promotions(path, names, count, rng):
+    with open(path, "w") as file:
+        for number in range(count):
+            item = rng.choice(names)
+            kind = number % 10
+            if kind == 0:
+                promotion = {"type": "category_percent_off",
+                             "category": f"Category {rng.randrange(CATEGORIES):02d}",
+                             "percent": rng.choice((5, 10, 15))}
+            elif kind < 5:
+                promotion = {"type": "multi_buy", "item": item, "quantity": rng.randint(2, 4),
+                             "price_cents": rng.randint(100, 10_000)}
+            else:
+                promotion = {"type": "member_coupon", "item": item, "amount_off_cents": rng.randint(10, 100)}
+            file.write(json.dumps(promotion) + "\n")
+
+
+def cart_us(engine, store, carts):
+    start = time.perf_counter()
+    for items in carts:
+        engine.totals(engine.price_items(store, items, False))
+    return (time.perf_counter() - start) / len(carts) * 1e6
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (10, 10_000))
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        write_categories(inventory_file + ".categories", names)
+        store = ColumnarStore(inventory_file)
+        store.item_categories()
+        carts = [[(item, rng.randint(1, 6)) for item in rng.sample(names, CART_SIZE)] for _ in range(CARTS)]
+        baseline = cart_us(PricingEngine(), store, carts)
+        print(f"{'promotions':>10} {'promoted':>9} {'read ms':>8} {'compile ms':>11} "
+              f"{'cart us':>8} {'no promo us':>12}")
+        for size in sizes:
+            promotions_file = os.path.join(directory, f"promotions-{size}.jsonl")
+            write_promotions(promotions_file, names, size, rng)
+            start = time.perf_counter()
+            promotions = read_promotions(promotions_file)
+            read_ms = (time.perf_counter() - start) * 1e3
+            start = time.perf_counter()
+            table = PromotionTable.compile(promotions, store)
+            compile_ms = (time.perf_counter() - start) * 1e3
+            promoted = cart_us(PricingEngine(promotions=table), store, carts)
+            print(f"{size:>10} {len(table):>9} {read_ms:>8.1f} {compile_ms:>11.1f} "
+                  f"{promoted:>8.1f} {baseline:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,102 @@
+"""
+Compares receipt render throughput with the original f-string writer.
+
+The baseline reproduces the original Receipt.generate_receipt: one write call
+per fragment, into an in-memory file so that only rendering is measured.
+
+Usage:
+    python -m benchmarks.bench_receipt_render [LINES ...]
+"""
+import io
+import random
+import sys
+import time
+from datetime import date
+
+from classes.pricing import LineItem, format_cents
+from classes.receipt_renderers import RENDERERS
+
+
+def legacy_render(lines, rewards_member, transaction_number, today):
+    """
+    Renders a receipt the way the original Receipt.generate_receipt wrote it.
+    """
+    file = io.StringIO()
+    file.write(today.strftime("%B %d, %Y"))
+    file.write(f"\n")
+    file.write(f"Transaction No. {transaction_number:06d}")
+    file.write(f"\n")
+    if rewards_member:
+        file.write(f"Client is a rewards member\n")
+    else:
+        file.write(f"Client is not a rewards member\n")
+    file.write(f"\n")
+    file.write(f"Item      Quantity      Unit Price    Tax       Total\n")
+    file.write(f"\n")
+    total = 0
+    taxes = 0
+    items_sold = 0
+    for line in lines:
+        total += line.total
+        taxes += line.tax
+        items_sold += 1
+        file.write(
+            f"{line.item}:        {line.quantity}       x    ${format_cents(line.unit_price)}  +   "
+            f"${format_cents(line.tax)}  =   ${format_cents(line.total)}\n"
+        )
+    file.write(f"\n")
+    file.write(f"**************************")
+    file.write(f"\n")
+    file.write(f"Items sold: {items_sold}\n")
+    file.write(f"Taxes: ${format_cents(taxes)}\n")
+    file.write(f"Total: ${format_cents(total)}\n")
+    return file.getvalue()
+
+
+def make_lines(count, seed=0):
+    """
+    Builds priced lines for a synthetic cart.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for number in range(count):
+        unit_price = rng.randint(50, 5000)
+        quantity = rng.randint(1, 5)
+        tax = (unit_price * quantity * 650 + 5000) // 10000 if rng.random() < 0.5 else 0
+        lines.append(LineItem(f"Item {number:07d}", quantity, unit_price, tax, unit_price * quantity + tax))
+    return lines
+
+
+def throughput(render, lines, today):
+    """
+    Renders the cart repeatedly for about half a second and returns receipts per second.
+    """
+    count = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < 0.5:
+        render(lines, True, count, today)
+        count += 1
+        elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or [10, 100, 10_000]
+    today = date.today()
+    renderers = {name: renderer_class().render for name, renderer_class in RENDERERS.items()}
+    assert renderers["text"](make_lines(10), True, 1, today) == legacy_render(make_lines(10), True, 1, today)
+    columns = ["legacy"] + list(renderers)
+    print(f"{'lines':>7} " + " ".join(f"{name + ' r/s':>12}" for name in columns) + f" {'text speedup':>13}")
+    for size in sizes:
+        lines = make_lines(size)
+        rates = [throughput(legacy_render, lines, today)]
+        rates += [throughput(render, lines, today) for render in renderers.values()]
+        print(
+            f"{size:>7} " + " ".join(f"{rate:>12.0f}" for rate in rates)
+            + f" {rates[1] / rates[0]:>12.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,89 @@
+"""
+Compares checkout-side receipt latency with writing each receipt synchronously.
+
+The synchronous baseline writes and fsyncs every receipt before returning,
+as checkout did before receipts moved to the background writer.
+
+Usage:
+    python -m benchmarks.bench_receipts [RECEIPTS ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.cart import Cart
+from classes.columnar_store import ColumnarStore
+from classes.receipt import Receipt
+
+LINES_PER_CART = 10
+
+
+class SyncWriter:
+    """
+    Writes each receipt immediately, for comparison.
+    """
+    def submit(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def on_close(self, callback):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def run(receipt, store, cart, count):
+    """
+    Generates receipts and returns the p50 latency and the time until all are on disk.
+    """
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(count):
+        begin = time.perf_counter()
+        receipt.generate_receipt(cart, store, False)
+        latencies.append(time.perf_counter() - begin)
+    receipt.flush()
+    latencies.sort()
+    return latencies[len(latencies) // 2], time.perf_counter() - start
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (200, 1_000))
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, 1_000)
+        store = ColumnarStore(inventory_file)
+        cart = Cart(store=store)
+        for name in names[:LINES_PER_CART]:
+            cart.add_item(name, 1)
+        stdout = sys.stdout
+        print(f"{'receipts':>9} {'sync p50 ms':>12} {'async p50 ms':>13} {'sync s':>8} {'async s':>8}")
+        for size in sizes:
+            results = []
+            for name, writer in (("sync", SyncWriter()), ("async", None)):
+                receipt = Receipt(os.path.join(directory, f"{name}_{size}"), writer=writer)
+                sys.stdout = open(os.devnull, "w")
+                try:
+                    results.append(run(receipt, store, cart, size))
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+                receipt.close()
+            (sync_p50, sync_total), (async_p50, async_total) = results
+            print(
+                f"{size:>9} {sync_p50 * 1000:>12.3f} {async_p50 * 1000:>13.3f} "
+                f"{sync_total:>8.3f} {async_total:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
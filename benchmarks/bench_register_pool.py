@@ -0,0 +1,72 @@
+"""
+Measures checkout throughput of the register pool as lanes are added.
+
+Every session buys ITEMS_PER_SESSION random items and checks out, writing a
+receipt. The in-process row runs the same sessions on one thread over a
+SharedMemoryStore, so it pays the same costs minus the process hand-off. Scaling needs as many free cores as lanes.
+
+Usage:
+    python -m benchmarks.bench_register_pool [WORKERS ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.receipt import Receipt
+from classes.shared_store import SharedMemoryStore
+from interfaces.register_pool import RegisterPool, run_session
+
+CATALOG_SIZE = 10_000
+SESSIONS = 2_000
+ITEMS_PER_SESSION = 5
+
+
+def make_sessions(names, seed):
+    rng = random.Random(seed)
+    return [
+        (rng.random() < 0.5, [(item, 1) for item in rng.sample(names, ITEMS_PER_SESSION)])
+        for _ in range(SESSIONS)
+    ]
+
+
+def in_process(inventory_file, sessions, directory):
+    store = SharedMemoryStore(inventory_file)
+    receipt = Receipt(os.path.join(directory, "in-process"))
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            start = time.perf_counter()
+            for rewards_member, items in sessions:
+                run_session(store, 0, receipt, rewards_member, items)
+            return time.perf_counter() - start
+        finally:
+            sys.stdout = stdout
+            receipt.close()
+            store.close()
+
+
+def main(argv):
+    workers = sizes_from_argv(argv, (1, 2, 4))
+    print(f"{os.cpu_count()} CPU(s), {SESSIONS} sessions of {ITEMS_PER_SESSION} items")
+    print(f"{'lanes':>12} {'sessions/s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        sessions = make_sessions(names, 0)
+        baseline = SESSIONS / in_process(inventory_file, sessions, directory)
+        print(f"{'in-process':>12} {baseline:>11.0f} {1:>7.2f}x")
+        for count in workers:
+            write_inventory(inventory_file, CATALOG_SIZE)
+            with RegisterPool(inventory_file, count, os.path.join(directory, f"pool-{count}")) as pool:
+                pool.run(make_sessions(names, 1)[:count * 16])
+                start = time.perf_counter()
+                pool.run(sessions)
+                rate = SESSIONS / (time.perf_counter() - start)
+            print(f"{count:>12} {rate:>11.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+"""
+Stress-tests reserve/commit from many register threads against one store.
+
+Every register thread sells random units of a small set of hot items until
+the stock runs out. The benchmark reports throughput per register count and
+checks that exactly the stocked quantity was sold.
+
+Usage:
+    python -m benchmarks.bench_reservations [REGISTERS ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.errors import InsufficientQuantityError
+
+CATALOG_SIZE = 10_000
+HOT_ITEMS = 256
+ATTEMPTS_PER_REGISTER = 20_000
+
+
+def run_register(store, items, seed, sold):
+    """
+    Reserves and commits single units of random items.
+
+    Args:
+        store (Store): The shared store.
+        items (list): The items to sell.
+        seed (int): The seed for the register's random generator.
+        sold (list): Receives the number of units this register sold.
+    """
+    rng = random.Random(seed)
+    count = 0
+    for _ in range(ATTEMPTS_PER_REGISTER):
+        item = rng.choice(items)
+        try:
+            reservation = store.reserve(item, 1)
+        except InsufficientQuantityError:
+            continue
+        if rng.random() < 0.1:
+            store.release(reservation)
+            continue
+        store.commit(reservation)
+        count += 1
+    sold.append(count)
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (1, 2, 4, 8, 16))
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        items = names[:HOT_ITEMS]
+        hot = set(items)
+        print(f"{'registers':>9} {'ops':>9} {'seconds':>8} {'ops/s':>10} {'sold':>8} {'stock':>8}")
+        for size in sizes:
+            store = ColumnarStore(inventory_file)
+            stock = sum(row[1] for row in store._iter_rows() if row[0] in hot)
+            sold = []
+            threads = [
+                threading.Thread(target=run_register, args=(store, items, seed, sold))
+                for seed in range(size)
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            seconds = time.perf_counter() - start
+            remaining = sum(row[1] for row in store._iter_rows() if row[0] in hot)
+            assert min(row[1] for row in store._iter_rows()) >= 0, "oversold"
+            assert sum(sold) == stock - remaining, "lost or duplicated units"
+            operations = size * ATTEMPTS_PER_REGISTER
+            print(
+                f"{size:>9} {operations:>9} {seconds:>8.3f} {operations / seconds:>10.0f} "
+                f"{sum(sold):>8} {stock:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,54 @@
+"""
+Compares loading a scan file in one batch with adding its lines one by one.
+
+The one-by-one baseline does what the interactive menu does per line:
+resolve the name, reserve the stock and add the item to the cart. The item
+index is built before either is timed.
+
+Usage:
+    python -m benchmarks.bench_scan_batch [LINES ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.register import Register
+
+CATALOG_SIZE = 100_000
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (1_000, 10_000))
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        store = ColumnarStore(inventory_file)
+        store._item_index()
+        stocked = [item for item, quantity, *_ in store._iter_rows() if quantity >= 50]
+        print(f"{'lines':>7} {'per-line ms':>12} {'batch ms':>9} {'speedup':>8}")
+        for size in sizes:
+            rng = random.Random(size)
+            lines = [f"{rng.choice(stocked).lower()},1\n" for _ in range(size)]
+
+            register = Register(store)
+            start = time.perf_counter()
+            for line in lines:
+                name, _, quantity = line.rpartition(",")
+                register.add_item(store.resolve_item(name), int(quantity))
+            per_line = time.perf_counter() - start
+            register.clear()
+
+            register = Register(store)
+            start = time.perf_counter()
+            register.add_scan(lines)
+            batch = time.perf_counter() - start
+            register.clear()
+            print(f"{size:>7} {per_line * 1000:>12.1f} {batch * 1000:>9.1f} {per_line / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,116 @@
+"""
+Load generator for the register server.
+
+Starts the server in a subprocess on a Unix socket, then runs many concurrent
+client sessions that each add a few items and check out. Reports completed
+sessions per second and the p50/p99 checkout latency.
+
+Usage:
+    python -m benchmarks.bench_server [CONCURRENT_SESSIONS ...]
+"""
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import remove_quietly, sizes_from_argv, write_inventory
+
+CATALOG_SIZE = 10_000
+SESSIONS_PER_CLIENT = 50
+ITEMS_PER_SESSION = 3
+
+
+def percentile(samples, fraction):
+    """
+    Returns the sample at the given fraction of the sorted samples.
+    """
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+async def run_client(socket_path, names, seed, latencies):
+    """
+    Runs sessions back to back over one connection.
+
+    Args:
+        socket_path (str): The server's Unix socket.
+        names (list): The item names to buy.
+        seed (int): The seed for the client's random generator.
+        latencies (list): Receives the checkout latency of every session in seconds.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+
+    async def request(**fields):
+        writer.write(json.dumps(fields).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    for _ in range(SESSIONS_PER_CLIENT):
+        await request(op="customer", rewards_member=rng.random() < 0.5)
+        for _ in range(ITEMS_PER_SESSION):
+            await request(op="add", item=rng.choice(names), quantity=1)
+        start = time.perf_counter()
+        await request(op="checkout")
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def wait_for_socket(socket_path, process):
+    """
+    Waits until the server accepts connections.
+    """
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError("the server exited during startup")
+        try:
+            _, writer = await asyncio.open_unix_connection(socket_path)
+        except OSError:
+            await asyncio.sleep(0.05)
+            continue
+        writer.close()
+        return
+
+
+async def run_load(socket_path, process, names, clients):
+    await wait_for_socket(socket_path, process)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(socket_path, names, seed, latencies) for seed in range(clients)
+    ))
+    return time.perf_counter() - start, latencies
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (1, 10, 50, 200))
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        socket_path = os.path.join(directory, "server.sock")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        print(f"{'clients':>8} {'sessions':>9} {'sessions/s':>11} {'p50 ms':>8} {'p99 ms':>8}")
+        for size in sizes:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "interfaces.server",
+                 "--inventory", inventory_file, "--unix", socket_path],
+                stdout=subprocess.DEVNULL,
+            )
+            try:
+                seconds, latencies = asyncio.run(run_load(socket_path, process, names, size))
+            finally:
+                process.terminate()
+                process.wait()
+                remove_quietly(socket_path)
+            print(
+                f"{size:>8} {len(latencies):>9} {len(latencies) / seconds:>11.0f} "
+                f"{percentile(latencies, 0.50) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,51 @@
+"""
+Compares store startup from the text file against startup from the binary snapshot.
+
+Usage:
+    python -m benchmarks.bench_snapshot_cache [SIZE ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import remove_quietly, sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.store import Store
+
+
+def timed(function):
+    """
+    Times a single call.
+
+    Args:
+        function (callable): The function to call.
+
+    Returns:
+        float: The elapsed seconds.
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (100_000, 1_000_000))
+    print(f"{'SKUs':>10} {'backend':>9} {'text s':>8} {'snapshot s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            inventory_file = os.path.join(directory, f"inventory_{size}.txt")
+            write_inventory(inventory_file, size)
+            for label, store_class in (("dict", Store), ("columnar", ColumnarStore)):
+                remove_quietly(inventory_file + ".snapshot")
+                text = timed(lambda: store_class(inventory_file))
+                store_class(inventory_file, use_snapshot=True)
+                snapshot = timed(lambda: store_class(inventory_file, use_snapshot=True))
+                print(
+                    f"{size:>10} {label:>9} {text:>8.3f} {snapshot:>11.3f} "
+                    f"{text / snapshot:>7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,84 @@
+"""
+Compares the SQLite backend with the text backend.
+
+Reports the time to open each backend (text: parse the inventory file;
+SQLite: one-shot import, then reopening the database) and checkouts per
+second from register threads. A checkout reserves a few items, commits them
+and saves the inventory, which fsyncs the journal on the text backend.
+
+Usage:
+    python -m benchmarks.bench_sqlite_store [SKUS ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.errors import InsufficientQuantityError
+from classes.sqlite_store import SQLiteStore
+from classes.store import Store
+
+REGISTERS = 4
+CHECKOUTS_PER_REGISTER = 250
+ITEMS_PER_CHECKOUT = 3
+
+
+def run_register(store, names, seed):
+    rng = random.Random(seed)
+    for _ in range(CHECKOUTS_PER_REGISTER):
+        reservations = []
+        for _ in range(ITEMS_PER_CHECKOUT):
+            try:
+                reservations.append(store.reserve(rng.choice(names), 1))
+            except InsufficientQuantityError:
+                pass
+        for reservation in reservations:
+            store.commit(reservation)
+        store.save_inventory()
+
+
+def checkouts_per_second(store, names):
+    threads = [
+        threading.Thread(target=run_register, args=(store, names, seed))
+        for seed in range(REGISTERS)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return REGISTERS * CHECKOUTS_PER_REGISTER / (time.perf_counter() - start)
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (10_000, 100_000))
+    print(f"{'skus':>8} {'text load s':>12} {'sqlite import s':>16} {'sqlite open s':>14} "
+          f"{'text co/s':>10} {'sqlite co/s':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            inventory_file = os.path.join(directory, "inventory.txt")
+            database_file = os.path.join(directory, "inventory.db")
+            names = write_inventory(inventory_file, size)
+
+            start = time.perf_counter()
+            text_store = Store(inventory_file)
+            text_load = time.perf_counter() - start
+            start = time.perf_counter()
+            SQLiteStore(database_file, inventory_file).close()
+            sqlite_import = time.perf_counter() - start
+            start = time.perf_counter()
+            sqlite_store = SQLiteStore(database_file)
+            sqlite_open = time.perf_counter() - start
+
+            text_rate = checkouts_per_second(text_store, names)
+            sqlite_rate = checkouts_per_second(sqlite_store, names)
+            sqlite_store.close()
+            print(f"{size:>8} {text_load:>12.3f} {sqlite_import:>16.3f} {sqlite_open:>14.4f} "
+                  f"{text_rate:>10.0f} {sqlite_rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
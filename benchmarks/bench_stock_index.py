@@ -0,0 +1,71 @@
+"""
+Measures what the stock index costs on every stock change and what it saves
+when looking for low-stock items.
+
+For each catalog size, reserving and releasing one unit of random items is
+timed without and with the index, and lowest(10) and below_threshold() are
+timed against a full scan of the inventory doing the same.
+
+Usage:
+    python -m benchmarks.bench_stock_index [CATALOG_SIZE ...]
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.store import Store
+
+OPERATIONS = 20_000
+QUERIES = 100
+THRESHOLD = 5
+
+
+def reserve_release(store, items):
+    start = time.perf_counter()
+    for item in items:
+        store.release(store.reserve(item, 1))
+    return (time.perf_counter() - start) / (2 * len(items)) * 1e6
+
+
+def time_queries(query):
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        query()
+    return (time.perf_counter() - start) / QUERIES * 1e3
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (10_000, 100_000))
+    rng = random.Random(0)
+    print(f"{'items':>8} {'plain us':>9} {'indexed us':>11} {'scan low ms':>12} "
+          f"{'lowest ms':>10} {'scan below ms':>14} {'below ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            inventory_file = os.path.join(directory, f"inventory_{size}.txt")
+            names = write_inventory(inventory_file, size)
+            items = rng.choices(names, k=OPERATIONS)
+            store = Store(inventory_file)
+            items = [item for item in items if store._stock(item) > 0]
+            plain_us = reserve_release(store, items)
+            index = store.track_stock(THRESHOLD)
+            indexed_us = reserve_release(store, items)
+
+            def scan_lowest():
+                return heapq.nsmallest(10, ((row[1], row[0]) for row in store._iter_rows()))
+
+            def scan_below():
+                return sorted((row[1], row[0]) for row in store._iter_rows() if row[1] < THRESHOLD)
+
+            assert [(item, quantity) for quantity, item in scan_lowest()] == index.lowest(10)
+            assert len(scan_below()) == len(index.below_threshold())
+            print(f"{size:>8} {plain_us:>9.2f} {indexed_us:>11.2f} "
+                  f"{time_queries(scan_lowest):>12.2f} {time_queries(lambda: index.lowest(10)):>10.3f} "
+                  f"{time_queries(scan_below):>14.2f} {time_queries(index.below_threshold):>9.3f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+"""
+Measures resolving items to tax rate codes and pricing with per-category rates.
+
+Every item of a 100,000 item catalog gets one of 50 categories, each with its
+own rate. Resolving the rate codes once per store load is timed, and pricing
+lines with the category table is compared with a flat table and with the
+string comparison of the tax status the cart used to do per line.
+
+Usage:
+    python -m benchmarks.bench_tax [LINES ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import sizes_from_argv, write_inventory
+from classes.columnar_store import ColumnarStore
+from classes.pricing import PricingEngine
+from classes.tax import Jurisdiction, TaxEngine, TaxTable
+
+CATALOG_SIZE = 100_000
+CATEGORIES = 50
+
+
+def string_status_tax(store, items):
+    """
+    The per-line tax status comparison Cart.calculate_total used to do, kept as the baseline.
+    """
+    tax = 0
+    for item, quantity in items:
+        subtotal = store.get_item_pricing(item, False)[0] * quantity
+        if store.get_item_tax_status(item) == "Taxable":
+            tax += (subtotal * 650 + 5000) // 10000
+    return tax
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    sizes = sizes_from_argv(argv, (1_000, 100_000))
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.txt")
+        names = write_inventory(inventory_file, CATALOG_SIZE)
+        with open(inventory_file + ".categories", "w") as file:
+            for number, item in enumerate(names):
+                file.write(f"{item}: Category {number % CATEGORIES:02d}\n")
+        store = ColumnarStore(inventory_file)
+        store.item_categories()
+        rates = {f"Category {number:02d}": 100 + number * 20 for number in range(CATEGORIES)}
+        tax = TaxEngine(TaxTable({"county": Jurisdiction(650, rates, ())}, "county"))
+        resolve_ms = timed(tax.item_codes, store) * 1e3
+        print(f"resolved {len(tax.item_codes(store))} taxable categorized items in {resolve_ms:.1f} ms")
+        flat = PricingEngine()
+        categorized = PricingEngine(tax=tax)
+        print(f"{'lines':>8} {'status str s':>13} {'flat s':>8} {'category s':>11} {'lines/s':>10}")
+        for size in sizes:
+            rng = random.Random(size)
+            items = [(rng.choice(names), rng.randint(1, 5)) for _ in range(size)]
+            baseline = timed(string_status_tax, store, items)
+            flat_seconds = timed(flat.price_items, store, items, False)
+            category_seconds = timed(categorized.price_items, store, items, False)
+            print(f"{size:>8} {baseline:>13.4f} {flat_seconds:>8.4f} {category_seconds:>11.4f} "
+                  f"{size / category_seconds:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
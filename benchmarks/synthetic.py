@@ -0,0 +1,58 @@
+import os
+import random
+
+
+def write_inventory(path, count, seed=0):
+    """
+    Writes a synthetic inventory file in the store's text format.
+
+    Args:
+        path (str): The path of the inventory file to write.
+        count (int): The number of items to generate.
+        seed (int): The seed for the random generator.
+
+    Returns:
+        list: The generated item names.
+    """
+    rng = random.Random(seed)
+    names = []
+    with open(path, "w") as file:
+        for number in range(count):
+            item = f"Item {number:07d}"
+            regular = rng.randint(50, 5000)
+            member = max(regular - rng.randint(0, 50), 1)
+            tax_status = "Taxable" if rng.random() < 0.5 else "Tax-Exempt"
+            file.write(
+                f"{item}: {rng.randint(0, 500)}, ${regular / 100:.2f}, "
+                f"${member / 100:.2f}, {tax_status}\n"
+            )
+            names.append(item)
+    return names
+
+
+def sizes_from_argv(argv, default):
+    """
+    Reads catalog sizes from the command line.
+
+    Args:
+        argv (list): The command line arguments after the script name.
+        default (tuple): The sizes to use when none are given.
+
+    Returns:
+        list: The catalog sizes to benchmark.
+    """
+    return [int(arg) for arg in argv] or list(default)
+
+
+def remove_quietly(*paths):
+    """
+    Removes files that a benchmark created, ignoring missing ones.
+
+    Args:
+        *paths (str): The files to remove.
+    """
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
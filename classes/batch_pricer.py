@@ -0,0 +1,192 @@
+from array import array
+from collections import Counter, namedtuple
+from itertools import accumulate, chain, compress, repeat
+from operator import add, floordiv, itemgetter, mul, sub
+
+from classes.errors import ItemNotFoundError
+from classes.inventory_parser import paused_gc
+from classes.promotions import PromotionTable
+from classes.tax import TAX_RATE_BASIS_POINTS, TaxEngine, TaxTable
+
+CartTotals = namedtuple("CartTotals", ["subtotal", "tax", "total"])
+BatchResult = namedtuple("BatchResult", ["carts", "subtotal", "tax", "total"])
+
+
+class BatchPricer:
+    """
+    Reprices many carts at once against a store's current prices.
+
+    Item names are resolved to rows of the store's price columns once for the
+    whole batch. Prices, taxes and totals are then computed column by column
+    with C-level maps over every line, and summed per cart over contiguous
+    slices. This is the NumPy-style formulation using only the standard
+    library. Amounts are in integer cents and rounded like PricingEngine.
+
+    The per-row price and rate columns are kept between batches until the
+    store is reloaded or the day's tax rates change. Lines of promoted items
+    are then repriced one by one with the compiled promotions, before tax.
+
+    Attributes:
+        store (Store): The store whose prices are used.
+        tax (TaxEngine): The tax engine resolving the rate of every item.
+        promotions (PromotionTable): The compiled promotions applied to the lines.
+    """
+    def __init__(self, store, tax_rate_basis_points=TAX_RATE_BASIS_POINTS, tax=None, promotions=None):
+        """
+        Initializes a BatchPricer object.
+
+        Args:
+            store (Store): The store whose prices are used.
+            tax_rate_basis_points (int): The tax rate for taxable items in
+                hundredths of a percent, used when no tax engine is given.
+            tax (TaxEngine): The tax engine resolving the rate of every item.
+                None taxes every taxable item at tax_rate_basis_points.
+            promotions (PromotionTable): The compiled promotions applied to
+                the lines. None applies no promotions.
+        """
+        self.store = store
+        self.tax = tax if tax is not None else TaxEngine(TaxTable.flat(tax_rate_basis_points))
+        self.promotions = promotions if promotions is not None else PromotionTable()
+        self._catalog = None
+        self._catalog_key = None
+
+    def reprice_carts(self, carts, members):
+        """
+        Reprices a batch of carts.
+
+        Args:
+            carts (dict): A dictionary mapping cart ids to Cart objects.
+            members (dict): A dictionary mapping cart ids to whether the customer
+                is a rewards member. Missing carts are priced as regular customers.
+
+        Returns:
+            BatchResult: The totals of every cart and of the whole batch.
+
+        Raises:
+            ItemNotFoundError: If an item is not found in the inventory.
+        """
+        cart_ids = list(carts)
+        lines = [carts[cart_id].items for cart_id in cart_ids]
+        flat = list(chain.from_iterable(lines))
+        items = list(map(itemgetter(0), flat))
+        quantities = list(map(itemgetter(1), flat))
+        return self._reprice(cart_ids, list(map(len, lines)), items, quantities, members)
+
+    def reprice_table(self, cart_ids, items, quantities, members):
+        """
+        Reprices a flat table of cart lines.
+
+        Lines of the same cart do not need to be adjacent.
+
+        Args:
+            cart_ids (list): The cart id of every line.
+            items (list): The item of every line.
+            quantities (list): The quantity of every line.
+            members (dict): A dictionary mapping cart ids to whether the customer
+                is a rewards member. Missing carts are priced as regular customers.
+
+        Returns:
+            BatchResult: The totals of every cart and of the whole batch.
+
+        Raises:
+            ItemNotFoundError: If an item is not found in the inventory.
+        """
+        unique_ids = list(dict.fromkeys(cart_ids))
+        positions = dict(zip(unique_ids, range(len(unique_ids))))
+        keys = list(map(positions.__getitem__, cart_ids))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        counts = Counter(keys)
+        return self._reprice(
+            unique_ids,
+            list(map(counts.__getitem__, range(len(unique_ids)))),
+            list(map(items.__getitem__, order)),
+            list(map(quantities.__getitem__, order)),
+            members,
+        )
+
+    def _reprice(self, cart_ids, lengths, items, quantities, members):
+        """
+        Prices lines grouped into contiguous runs per cart.
+
+        Args:
+            cart_ids (list): The cart ids, in the order of their runs.
+            lengths (list): The number of lines of every cart.
+            items (list): The item of every line.
+            quantities (list): The quantity of every line.
+            members (dict): A dictionary mapping cart ids to rewards membership.
+
+        Returns:
+            BatchResult: The totals of every cart and of the whole batch.
+        """
+        index, unit_prices, rates = self._columns()
+        rows = list(map(index.get, items))
+        if None in rows:
+            missing = items[rows.index(None)]
+            raise ItemNotFoundError(f"{missing} not found in the inventory.")
+
+        flags = chain.from_iterable(
+            map(repeat, (bool(members.get(cart_id)) for cart_id in cart_ids), lengths)
+        )
+        keys = list(map(add, map(mul, rows, repeat(2)), flags))
+        subtotals = list(map(mul, map(unit_prices.__getitem__, keys), quantities))
+        promoted = self.promotions.prices
+        if promoted:
+            for position in compress(range(len(items)), map(promoted.__contains__, items)):
+                price = promoted[items[position]]
+                subtotals[position] = price.subtotal(quantities[position], keys[position] & 1)
+        taxes = list(
+            map(
+                floordiv,
+                map(add, map(mul, subtotals, map(rates.__getitem__, keys)), repeat(5000)),
+                repeat(10000),
+            )
+        )
+
+        # Per-cart sums are differences of the running sums at the cart boundaries.
+        bounds = [0]
+        bounds.extend(accumulate(lengths))
+        cumulative_subtotals = [0]
+        cumulative_subtotals.extend(accumulate(subtotals))
+        cumulative_taxes = [0]
+        cumulative_taxes.extend(accumulate(taxes))
+        at_bounds = list(map(cumulative_subtotals.__getitem__, bounds))
+        cart_subtotals = map(sub, at_bounds[1:], at_bounds)
+        at_bounds = list(map(cumulative_taxes.__getitem__, bounds))
+        cart_taxes = map(sub, at_bounds[1:], at_bounds)
+        with paused_gc():
+            carts = {
+                cart_id: CartTotals(subtotal, tax, subtotal + tax)
+                for cart_id, subtotal, tax in zip(cart_ids, cart_subtotals, cart_taxes)
+            }
+        subtotal = cumulative_subtotals[-1]
+        tax = cumulative_taxes[-1]
+        return BatchResult(carts, subtotal, tax, subtotal + tax)
+
+    def _columns(self):
+        """
+        Returns the row index of the store with the unit prices and tax rates
+        of every row, rebuilding them when the store was reloaded or the
+        rates changed.
+
+        Regular and member prices are interleaved, so that a line's price is
+        at 2 * row + rewards flag, with the matching tax rate at the same key.
+
+        Returns:
+            tuple: The dict mapping items to rows, the unit prices and the rates.
+        """
+        version = self.store.version
+        code_rates, codes = self.tax.resolve(self.store)
+        key = self._catalog_key
+        catalog = self._catalog
+        if catalog is None or key[0] != version or key[1] is not code_rates or key[2] is not codes:
+            index, regular_cents, member_cents, taxable = self.store.price_columns()
+            unit_prices = array("q", bytes(16 * len(regular_cents)))
+            unit_prices[0::2] = array("q", regular_cents)
+            unit_prices[1::2] = array("q", member_cents)
+            rates = array("q", map(code_rates.__getitem__, taxable))
+            for item, code in codes.items():
+                rates[index[item]] = code_rates[code]
+            rates = array("q", chain.from_iterable(zip(rates, rates)))
+            catalog = self._catalog = (index, unit_prices, rates)
+            self._catalog_key = (version, code_rates, codes)
+        return catalog
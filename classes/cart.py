@@ -1,90 +1,294 @@
+from operator import attrgetter
+
 from classes.errors import ItemNotFoundError
+from classes.pricing import PricingEngine
 
 class Cart:
     """
     Represents a cart for storing and managing items.
 
+    Items are kept in an insertion-ordered mapping of item to quantity, so
+    adding an item that is already in the cart merges the quantities. Once the
+    cart is bound to a store, every line is priced for both customer types
+    when it changes, and running subtotals and taxes are kept for both, so
+    totals cost O(1) regardless of the number of lines. Every line is priced
+    again when the store's inventory is reloaded, the promotions change or
+    the day's tax rates change, and items the store no longer carries are
+    dropped from the cart.
+
     Attributes:
-        items (dict): A dictionary containing the items in the cart.
+        items (list): The (item, quantity) pairs in the cart, in insertion order.
     """
-    def __init__(self):   
+    def __init__(self, pricing_engine=None, store=None):
         """
         Initializes a Cart object.
-        """     
-        self._items = []       
+
+        Args:
+            pricing_engine (PricingEngine): The engine used to price the cart.
+            store (Store): The store the cart is priced against. A cart without
+                a store is bound to the first store it is priced against.
+        """
+        self._items = {}
+        self._pricing_engine = pricing_engine if pricing_engine is not None else PricingEngine()
+        self._store = store
+        self._version = None
+        self._promotions = None
+        self._rates = None
+        self._lines = {}
+        self._running = [[0, 0], [0, 0]]
+
+    def __len__(self):
+        """
+        Returns the number of distinct items in the cart.
+        """
+        return len(self._items)
+
+    def __contains__(self, item):
+        """
+        Checks whether the given item is in the cart.
+        """
+        return item in self._items
 
     @property
     def items(self):
         """
         Item property
         """
-        return self._items
+        return list(self._items.items())
 
     @items.setter
     def items(self, value):
         """
         Setter  for the items property
         """
-        self._items = value
+        del self.items
+        for item, quantity in value:
+            self.add_item(item, quantity)
 
-    @items.deleter    
+    @items.deleter
     def items(self):
         """
         Deleter for the items property
         """
-        self._items = []
+        self._items = {}
+        self._lines = {}
+        self._running = [[0, 0], [0, 0]]
+
+    def quantity_of(self, item):
+        """
+        Returns the quantity of the given item in the cart.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            int: The quantity of the item, 0 if it is not in the cart.
+        """
+        return self._items.get(item, 0)
 
     def add_item(self, item, quantity):
         """
-        Adds an item to the cart with the specified quantity.
+        Adds an item to the cart with the specified quantity, merging it with
+        the quantity already in the cart.
 
         Args:
             item (str): The item to add.
             quantity (int): The quantity of the item to add.
-        """  
-        self._items.append((item, quantity)) 
-           
-    def remove_item(self, item):
+
+        Raises:
+            ValueError: If the quantity is not positive.
+            ItemNotFoundError: If the cart is bound to a store that does not have the item.
+        """
+        if quantity <= 0:
+            raise ValueError(f"The quantity must be positive, not {quantity}.")
+        new_quantity = self._items.get(item, 0) + quantity
+        self._set_line(item, new_quantity)
+        self._items[item] = new_quantity
+
+    def add_items(self, quantities):
+        """
+        Adds several items to the cart, all or nothing, pricing every changed
+        line in one pass.
+
+        Args:
+            quantities (dict): A dictionary mapping items to the quantities to add.
+
+        Raises:
+            ValueError: If a quantity is not positive.
+            ItemNotFoundError: If the cart is bound to a store that does not
+                have one of the items. Nothing is added then.
         """
-        Removes an item from the cart.
+        for quantity in quantities.values():
+            if quantity <= 0:
+                raise ValueError(f"The quantity must be positive, not {quantity}.")
+        new_quantities = {item: self._items.get(item, 0) + quantity for item, quantity in quantities.items()}
+        store = self._store
+        if store is not None:
+            self._refresh()
+            pairs = self._pricing_engine.price_line_pairs(store, new_quantities.items())
+            lines = self._lines
+            old_pairs = [lines[item] for item in pairs if item in lines]
+            for sign, changed in ((-1, old_pairs), (1, pairs.values())):
+                for running, column in zip(self._running, zip(*changed)):
+                    tax = sum(map(attrgetter("tax"), column))
+                    running[0] += sign * (sum(map(attrgetter("total"), column)) - tax)
+                    running[1] += sign * tax
+            lines.update(pairs)
+        self._items.update(new_quantities)
+
+    def remove_item(self, item, quantity=None):
+        """
+        Removes an item, or part of its quantity, from the cart.
 
         Args:
             item (str): The item to remove.
+            quantity (int): The quantity to remove. The whole line is removed
+                when it is omitted or not less than the quantity in the cart.
+
+        Returns:
+            int: The quantity that was removed.
 
         Raises:
+            ValueError: If the quantity is not positive.
             ItemNotFoundError: If the item is not found in the cart.
         """
-        for i, (cart_item, _) in enumerate(self._items):
-            if cart_item == item:
-                del self._items[i]
-                break
-        else:
-            raise ItemNotFoundError("Item not found in the cart.")    
+        if quantity is not None and quantity <= 0:
+            raise ValueError(f"The quantity must be positive, not {quantity}.")
+        self._refresh()
+        current = self._items.get(item)
+        if current is None:
+            raise ItemNotFoundError("Item not found in the cart.")
+        if quantity is None or quantity >= current:
+            self._set_line(item, 0)
+            del self._items[item]
+            return current
+        self._set_line(item, current - quantity)
+        self._items[item] = current - quantity
+        return quantity
+
+    def _set_line(self, item, quantity):
+        """
+        Re-prices the line of an item and updates the running totals.
+
+        Does nothing while the cart is not bound to a store.
+
+        Args:
+            item (str): The item whose quantity changes.
+            quantity (int): The new quantity, 0 to drop the line.
+        """
+        if self._store is None:
+            return
+        self._refresh()
+        self._price_line(item, quantity)
+
+    def _price_line(self, item, quantity):
+        """
+        Prices the line of an item against the bound store and updates the
+        running totals, without checking whether the other lines are current.
+
+        Args:
+            item (str): The item whose quantity changes.
+            quantity (int): The new quantity, 0 to drop the line.
+        """
+        pair = None
+        if quantity:
+            pair = self._pricing_engine.price_line_pair(self._store, item, quantity)
+        old_pair = self._lines.pop(item, None)
+        if old_pair is not None:
+            for running, line in zip(self._running, old_pair):
+                running[0] -= line.total - line.tax
+                running[1] -= line.tax
+        if pair is not None:
+            self._lines[item] = pair
+            for running, line in zip(self._running, pair):
+                running[0] += line.total - line.tax
+                running[1] += line.tax
+
+    def _refresh(self):
+        """
+        Prices every line again if the store reloaded its inventory, the
+        promotions changed or the tax rates changed since the cart was last priced.
+        """
+        store = self._store
+        if store is not None and not self._is_current(store):
+            self._reprice()
+
+    def _bind(self, store):
+        """
+        Binds the cart to a store, pricing every line if the store changed,
+        reloaded its inventory, the promotions changed or the tax rates changed.
+
+        Args:
+            store (Store): The store the cart is priced against.
+        """
+        if store is self._store and self._is_current(store):
+            return
+        self._store = store
+        self._reprice()
+
+    def _is_current(self, store):
+        """
+        Checks whether the lines were priced against the store's current
+        inventory, the current promotions and today's tax rates.
+
+        The tax engine hands out the same rates object until the day rolls
+        over or its table changes, so an identity check is enough.
+
+        Args:
+            store (Store): The store the cart is priced against.
+
+        Returns:
+            bool: True if no line needs pricing again.
+        """
+        engine = self._pricing_engine
+        return (store.version == self._version and engine.promotions is self._promotions
+                and engine.tax.rates() is self._rates)
 
-    def calculate_total(self, store, rewards_member): 
+    def _reprice(self):
+        """
+        Prices every line against the current prices, promotions and tax
+        rates, dropping the items the store no longer carries.
+        """
+        self._version = self._store.version
+        self._promotions = self._pricing_engine.promotions
+        self._rates = self._pricing_engine.tax.rates()
+        self._lines = {}
+        self._running = [[0, 0], [0, 0]]
+        for item, quantity in list(self._items.items()):
+            try:
+                self._price_line(item, quantity)
+            except ItemNotFoundError:
+                del self._items[item]
+
+    def calculate_total(self, store, rewards_member):
         """
         Calculates the price, tax, quantity and total for every item.
 
+        Lines are priced when they change, so this only collects them.
+
+        Args:
+            store (Store): The store object containing the inventory and pricing information.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            list: A LineItem record per cart line, with amounts in cents.
+        """
+        self._bind(store)
+        member = 1 if rewards_member else 0
+        lines = self._lines
+        return [lines[item][member] for item in self._items]
+
+    def totals(self, store, rewards_member):
+        """
+        Returns the running subtotal, tax and total of the cart.
+
         Args:
             store (Store): The store object containing the inventory and pricing information.
             rewards_member (bool): Indicates whether the customer is a rewards member.
 
-        
         Returns:
-            dict: The price of the item.
-        """      
-        result = {}
-        for item, quantity in self._items:           
-            price = store.get_item_price(item, rewards_member)                        
-            subtotal = price * quantity
-            taxes = 0.0    
-            if store.get_item_tax_status(item) == 'Taxable':
-                taxes = subtotal * 0.065
-                subtotal *= 1.065  # Apply 6.5% tax rate
-            result[item] = {
-                    "quantity": int(quantity),
-                    "unit_price": price,
-                    "unit_tax" : taxes,
-                    "total": subtotal,
-                }                                   
-        return result
\ No newline at end of file
+            tuple: The subtotal, tax and total in cents.
+        """
+        self._bind(store)
+        subtotal, tax = self._running[1 if rewards_member else 0]
+        return subtotal, tax, subtotal + tax
@@ -0,0 +1,287 @@
+from array import array
+
+from classes.errors import InsufficientQuantityError, ItemNotFoundError
+from classes.store import Store
+
+TAXABLE = 1  # Code of the "Taxable" status, see _tax_statuses
+
+
+class ColumnarStore(Store):
+    """
+    Store backend that keeps the inventory in typed columns instead of a dict per item.
+
+    Each item is assigned a row index. Quantities and prices (in integer cents)
+    are held in int64 arrays and tax statuses in a uint8 array of codes, which
+    takes a fraction of the memory of the dict-of-dicts layout.
+
+    Attributes:
+        inventory_file (str): The path to the inventory file.
+    """
+    def __init__(self, inventory_file, compact_every=100, skip_invalid_lines=False,
+                 use_snapshot=False, reservation_timeout=None):
+        """
+        Initializes a ColumnarStore object with the given inventory file.
+
+        Args:
+            inventory_file (str): The path to the inventory file.
+            compact_every (int): Number of journaled checkouts after which the
+                inventory file is rewritten and the journal emptied.
+            skip_invalid_lines (bool): Whether malformed inventory lines are
+                skipped and recorded in load_errors instead of raising.
+            use_snapshot (bool): Whether a binary snapshot of the parsed
+                inventory is kept next to the inventory file and loaded
+                instead of parsing when it is current.
+            reservation_timeout (float): Seconds after which an uncommitted
+                reservation returns its stock, or None to hold it until released.
+        """
+        self._index = {}
+        self._names = []
+        self._quantities = array("q")
+        self._regular_cents = array("q")
+        self._member_cents = array("q")
+        self._tax_codes = array("B")
+        self._tax_statuses = ["Tax-Exempt", "Taxable"]
+        super().__init__(
+            inventory_file, compact_every, skip_invalid_lines, use_snapshot, reservation_timeout
+        )
+
+    def _tax_code(self, tax_status):
+        """
+        Maps a tax status to its uint8 code, registering unseen statuses.
+
+        Args:
+            tax_status (str): The tax status of an item.
+
+        Returns:
+            int: The code of the tax status.
+        """
+        try:
+            return self._tax_statuses.index(tax_status)
+        except ValueError:
+            self._tax_statuses.append(tax_status)
+            return len(self._tax_statuses) - 1
+
+    def _build_inventory(self, columns):
+        """
+        Builds the inventory columns from parsed columns.
+
+        Args:
+            columns (tuple): Lists of item names, quantities, regular prices in
+                cents, member prices in cents and tax statuses.
+        """
+        names, quantities, regular_cents, member_cents, tax_statuses = columns
+        codes = {status: self._tax_code(status) for status in set(tax_statuses)}
+        index = dict(zip(names, range(len(names))))
+        if not self._names and len(index) == len(names):
+            self._index = index
+            self._names = list(names)
+            self._quantities = self._as_int64(quantities)
+            self._regular_cents = self._as_int64(regular_cents)
+            self._member_cents = self._as_int64(member_cents)
+            self._tax_codes = array("B", map(codes.__getitem__, tax_statuses))
+            return
+        for item, quantity, regular, member, tax_status in zip(*columns):
+            row = self._index.get(item)
+            if row is None:
+                self._index[item] = len(self._names)
+                self._names.append(item)
+                self._quantities.append(quantity)
+                self._regular_cents.append(regular)
+                self._member_cents.append(member)
+                self._tax_codes.append(codes[tax_status])
+            else:
+                self._quantities[row] = quantity
+                self._regular_cents[row] = regular
+                self._member_cents[row] = member
+                self._tax_codes[row] = codes[tax_status]
+
+    def _as_int64(self, column):
+        """
+        Converts a column to an int64 array, adopting arrays that already are one.
+
+        Args:
+            column (list or array.array): A column of integers.
+
+        Returns:
+            array.array: The column as an int64 array.
+        """
+        if isinstance(column, array) and column.typecode == "q":
+            return column
+        return array("q", column)
+
+    def _iter_rows(self):
+        """
+        Iterates over the inventory columns.
+
+        Yields:
+            tuple: An (item, quantity, regular_cents, member_cents, tax_status) tuple.
+        """
+        statuses = self._tax_statuses
+        for item, row in self._index.items():
+            yield (
+                item,
+                self._quantities[row],
+                self._regular_cents[row],
+                self._member_cents[row],
+                statuses[self._tax_codes[row]],
+            )
+
+    def _has_item(self, item):
+        """
+        Checks whether the given item is in the inventory.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            bool: True if the item is in the inventory, False otherwise.
+        """
+        return item in self._index
+
+    def _adjust_quantity(self, item, delta):
+        """
+        Adds a delta to the quantity of the given item.
+
+        Args:
+            item (str): The item to adjust.
+            delta (int): The quantity to add (negative to subtract).
+        """
+        self._quantities[self._index[item]] += delta
+
+    def _stock(self, item):
+        """
+        Returns the quantity column entry of the given item.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            int: The quantity in stock, without the stock held by reservations.
+        """
+        return self._quantities[self._index[item]]
+
+    def _remove_item(self, item):
+        """
+        Removes the given item from the index. Its row is left unused.
+
+        Args:
+            item (str): The item to remove.
+        """
+        del self._index[item]
+
+    def get_item_price(self, item, rewards_member):
+        """
+        Retrieves the price of the given item.
+
+        Args:
+            item (str): The item to retrieve the price for.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            float: The price of the item.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        row = self._index.get(item)
+        if row is None:
+            raise ItemNotFoundError("Item not found in the inventory.")
+        if rewards_member:
+            return self._member_cents[row] / 100
+        return self._regular_cents[row] / 100
+
+    def get_item_pricing(self, item, rewards_member):
+        """
+        Retrieves the price and tax status of the given item in a single lookup.
+
+        Args:
+            item (str): The item to look up.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            tuple: The price in cents and whether the item is taxable.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        row = self._index.get(item)
+        if row is None:
+            raise ItemNotFoundError(f"{item} not found in the inventory.")
+        price = self._member_cents[row] if rewards_member else self._regular_cents[row]
+        return price, self._tax_codes[row] == TAXABLE
+
+    def get_item_prices(self, item):
+        """
+        Retrieves both prices and the tax status of the given item in a single lookup.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            tuple: The regular price in cents, the member price in cents and
+                whether the item is taxable.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        row = self._index.get(item)
+        if row is None:
+            raise ItemNotFoundError(f"{item} not found in the inventory.")
+        return self._regular_cents[row], self._member_cents[row], self._tax_codes[row] == TAXABLE
+
+    def price_columns(self):
+        """
+        Exports the current prices as columns indexed by row.
+
+        The columns are the store's own arrays, so no copy is made.
+
+        Returns:
+            tuple: A dict mapping items to rows, the regular prices in cents,
+                the member prices in cents and a 0/1 taxable flag per row.
+        """
+        taxable = self._tax_codes
+        if len(self._tax_statuses) > 2:
+            taxable = array("B", [code == TAXABLE for code in taxable])
+        return self._index, self._regular_cents, self._member_cents, taxable
+
+    def get_item_tax_status(self, item):
+        """
+        Retrieves the tax status of the given item.
+
+        Args:
+            item (str): The item to retrieve the tax status for.
+
+        Returns:
+            str: The tax status of the item.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        row = self._index.get(item)
+        if row is None:
+            raise ItemNotFoundError(f"{item} not found in the inventory.")
+        return self._tax_statuses[self._tax_codes[row]]
+
+    def is_item_available(self, item, quantity):
+        """
+        Checks whether the given quantity of an item is in stock.
+
+        Args:
+            item (str): The item to check.
+            quantity (int): The quantity requested.
+
+        Returns:
+            bool: True if the quantity is available.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the stock.
+        """
+        row = self._index.get(item)
+        if row is None:
+            raise ItemNotFoundError("Item not found in the inventory.")
+        if self._quantities[row] >= quantity:
+            return True
+        raise InsufficientQuantityError(
+            "Insufficient quantity available for the item."
+        )
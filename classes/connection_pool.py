@@ -0,0 +1,100 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """
+    Small pool of SQLite connections shared by register threads.
+
+    Connections are opened lazily up to the pool size, in autocommit mode and
+    with WAL journaling, so readers never block the single writer. sqlite3
+    keeps a cache of prepared statements per connection, so reusing pooled
+    connections reuses the prepared statements too.
+
+    Attributes:
+        database_file (str): The path to the SQLite database.
+        size (int): The maximum number of open connections.
+    """
+    def __init__(self, database_file, size=4, busy_timeout=5.0):
+        """
+        Initializes a ConnectionPool object.
+
+        Args:
+            database_file (str): The path to the SQLite database.
+            size (int): The maximum number of open connections.
+            busy_timeout (float): Seconds a connection waits for a lock held by another process.
+        """
+        self.database_file = database_file
+        self.size = size
+        self._busy_timeout = busy_timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._all = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """
+        Lends a connection for the duration of a with block.
+
+        Yields:
+            sqlite3.Connection: A connection in autocommit mode.
+        """
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self):
+        """
+        Closes every connection of the pool.
+        """
+        for connection in self._all:
+            connection.close()
+        self._all = []
+        self._opened = 0
+        self._idle = queue.LifoQueue()
+
+    def _acquire(self):
+        """
+        Takes an idle connection, opening one if the pool is not full yet.
+
+        Returns:
+            sqlite3.Connection: A connection in autocommit mode.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            opening = self._opened < self.size
+            if opening:
+                self._opened += 1
+        if opening:
+            try:
+                return self._open()
+            except sqlite3.Error:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        return self._idle.get()
+
+    def _open(self):
+        """
+        Opens and configures a new connection.
+
+        Returns:
+            sqlite3.Connection: A connection in autocommit mode.
+        """
+        connection = sqlite3.connect(
+            self.database_file, timeout=self._busy_timeout, isolation_level=None,
+            check_same_thread=False, cached_statements=64,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self._all.append(connection)
+        return connection
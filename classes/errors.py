@@ -17,4 +17,73 @@ class InvalidInputError(Exception):
     Custom exception class for invalid input errors.
     Raised when an invalid input is provided in the store application's user interface.
     """
-    pass
\ No newline at end of file
+    pass
+
+class InventoryFormatError(ValueError):
+    """
+    Custom exception class for malformed inventory files.
+    Raised when one or more lines of an inventory file cannot be parsed.
+
+    Attributes:
+        errors (list): A list of (line_number, line, reason) tuples.
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        line_number, _, reason = errors[0]
+        message = f"Line {line_number}: {reason}"
+        if len(errors) > 1:
+            message += f" (and {len(errors) - 1} more malformed lines)"
+        super().__init__(message)
+
+
+class PromotionFormatError(InventoryFormatError):
+    """
+    Custom exception class for malformed promotions files.
+    Raised when one or more lines of a promotions file cannot be parsed.
+
+    Attributes:
+        errors (list): A list of (line_number, line, reason) tuples.
+    """
+    pass
+
+
+class TaxTableError(ValueError):
+    """
+    Custom exception class for malformed tax rate tables.
+    Raised when a tax rate table cannot be parsed or names an unknown jurisdiction.
+    """
+    pass
+
+
+class ReloadError(Exception):
+    """
+    Custom exception class for stores that cannot reload their inventory.
+    Raised when changes of the inventory file cannot be applied to a running store.
+    """
+    pass
+
+
+class ReservationError(Exception):
+    """
+    Custom exception class for invalid reservation use.
+    Raised when a stock reservation is committed or released after it was already committed or released.
+    """
+    pass
+
+
+class BatchError(Exception):
+    """
+    Custom exception class for failed batches of cart changes.
+    Raised when one or more entries of a batch cannot be applied; nothing in the batch is applied.
+
+    Attributes:
+        errors (list): A list of (location, reason) tuples, where the location
+            names the item or the scan line at fault.
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        location, reason = errors[0]
+        message = f"{location}: {reason}"
+        if len(errors) > 1:
+            message += f" (and {len(errors) - 1} more problems)"
+        super().__init__(message)
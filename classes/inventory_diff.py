@@ -0,0 +1,106 @@
+from collections import namedtuple
+
+from classes.errors import InventoryFormatError
+from classes.inventory_parser import InventoryParser
+
+# The lines of an inventory file that changed, parsed into columns whose
+# quantities are the change from the old line (from 0 for a new item), and the
+# items whose lines were removed.
+InventoryDelta = namedtuple("InventoryDelta", ["columns", "removed"])
+
+# The outcome of applying an InventoryDelta to a store: the items updated,
+# added and removed, and the reservations that lost their stock.
+InventoryReload = namedtuple("InventoryReload", ["changed", "added", "removed", "reservations"])
+
+
+def diff_inventory(old_data, new_data, skip_errors=False):
+    """
+    Compares two versions of an inventory file, parsing only the lines that differ.
+
+    The common leading and trailing lines are skipped by comparing bytes,
+    so an edit in one place costs a few memory compares; the lines in
+    between are matched as sets.
+
+    Args:
+        old_data (bytes): The raw contents the store was loaded from.
+        new_data (bytes): The raw contents of the changed file.
+        skip_errors (bool): Whether malformed new lines are skipped instead of raising.
+
+    Returns:
+        InventoryDelta: The changed lines and the removed items.
+
+    Raises:
+        InventoryFormatError: If a new line is malformed and skip_errors is
+            False, with the line numbers of the new file.
+    """
+    start, old_end, new_end = _changed_range(old_data, new_data)
+    old_lines = old_data[start:old_end].splitlines()
+    new_lines = new_data[start:new_end].splitlines()
+    old_set = set(old_lines)
+    new_set = set(new_lines)
+    first_line = new_data.count(b"\n", 0, start) + 1
+    line_numbers = []
+    added_lines = []
+    for line_number, line in enumerate(new_lines, first_line):
+        if line not in old_set and line.strip():
+            line_numbers.append(line_number)
+            added_lines.append(line)
+    gone_lines = [line for line in old_lines if line not in new_set and line.strip()]
+
+    try:
+        columns = _parse_lines(added_lines, skip_errors)
+    except InventoryFormatError as error:
+        raise InventoryFormatError([
+            (line_numbers[number - 1], line, reason) for number, line, reason in error.errors
+        ]) from None
+    old_names, old_quantities = _parse_lines(gone_lines, True)[:2]
+    previous = dict(zip(old_names, old_quantities))
+    names, quantities = columns[:2]
+    changes = [quantity - previous.get(item, 0) for item, quantity in zip(names, quantities)]
+    kept = set(names)
+    removed = [item for item in old_names if item not in kept]
+    return InventoryDelta((names, changes) + tuple(columns[2:]), removed)
+
+
+def _changed_range(old_data, new_data):
+    """
+    Finds the lines between the longest common leading and trailing lines.
+
+    Returns:
+        tuple: The offset where the changed lines start in both versions, and
+            where they end in the old and in the new version.
+    """
+    limit = min(len(old_data), len(new_data))
+    # Binary searches that compare only the bytes not compared yet.
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old_data[low:middle] == new_data[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    start = old_data.rfind(b"\n", 0, low) + 1
+    old_length = len(old_data)
+    new_length = len(new_data)
+    low, high = 0, limit - start
+    while low < high:
+        middle = (low + high + 1) // 2
+        if (old_data[old_length - middle:old_length - low]
+                == new_data[new_length - middle:new_length - low]):
+            low = middle
+        else:
+            high = middle - 1
+    old_end = old_length - low
+    if old_end > start and old_data[old_end - 1:old_end] != b"\n":
+        old_end = old_data.find(b"\n", old_end)
+        old_end = old_length if old_end < 0 else old_end + 1
+    return start, old_end, new_length - (old_length - old_end)
+
+
+def _parse_lines(lines, skip_errors):
+    """
+    Parses a list of inventory lines into columns.
+    """
+    if not lines:
+        return [], [], [], [], []
+    return InventoryParser(skip_errors=skip_errors).parse_columns(b"\n".join(lines) + b"\n")
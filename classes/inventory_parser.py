@@ -0,0 +1,257 @@
+import gc
+import re
+from contextlib import contextmanager
+
+from classes.errors import InventoryFormatError
+
+# <item>: <quantity>, $<regular price>, $<member price>, <tax status>
+LINE_PATTERN = re.compile(
+    r"^[ \t]*([^\n]+?): (-?\d+), \$(\d+)\.(\d\d), \$(\d+)\.(\d\d), "
+    r"([^\n,]*[^\s,])[ \t\r]*$",
+    re.MULTILINE,
+)
+# The fields of a line as _scan_columns splits them: the quantity keeps the
+# ':' of its separator, the prices their '$' and the tax status the newline.
+QUANTITY_FIELD = re.compile(r":(-?\d+)")
+PRICE_FIELD = re.compile(r"\$(\d+)\.(\d\d)")
+TAX_STATUS_FIELD = re.compile(r"(?!:)([^\n,]*[^\s,])\n")
+
+
+def format_inventory_line(item, quantity, regular_cents, member_cents, tax_status):
+    """
+    Formats one inventory row in the inventory file format.
+
+    Args:
+        item (str): The item name.
+        quantity (int): The quantity in stock.
+        regular_cents (int): The regular price in cents.
+        member_cents (int): The member price in cents.
+        tax_status (str): The tax status of the item.
+
+    Returns:
+        str: The formatted line, including the trailing newline.
+    """
+    return (
+        f"{item}: {quantity}, ${regular_cents // 100}.{regular_cents % 100:02d}, "
+        f"${member_cents // 100}.{member_cents % 100:02d}, {tax_status}\n"
+    )
+
+
+@contextmanager
+def paused_gc():
+    """
+    Suspends the cyclic garbage collector while bulk-loading an inventory.
+
+    Loading allocates millions of tracked objects that are never garbage, which
+    would otherwise trigger repeated full collections.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class InventoryParser:
+    """
+    Parser for the inventory text format.
+
+    Well-formed files are scanned column-wise: the whole file is split in one
+    call, and each column is checked and converted through its distinct
+    values instead of in a Python loop per line.
+    When the file does not have that exact shape it is re-scanned line by line
+    with a precompiled pattern, so that each malformed line can be reported.
+
+    Attributes:
+        skip_errors (bool): Whether malformed lines are skipped instead of raising.
+        errors (list): A list of (line_number, line, reason) tuples from the last parse.
+    """
+    def __init__(self, skip_errors=False):
+        """
+        Initializes an InventoryParser object.
+
+        Args:
+            skip_errors (bool): Whether malformed lines are skipped instead of raising.
+        """
+        self.skip_errors = skip_errors
+        self.errors = []
+
+    def parse(self, data):
+        """
+        Parses the raw contents of an inventory file into rows.
+
+        Args:
+            data (bytes): The raw contents of the inventory file.
+
+        Returns:
+            list: A list of (item, quantity, regular_cents, member_cents, tax_status) tuples.
+
+        Raises:
+            InventoryFormatError: If a line is malformed and skip_errors is False.
+        """
+        return list(zip(*self.parse_columns(data)))
+
+    def parse_columns(self, data):
+        """
+        Parses the raw contents of an inventory file into columns.
+
+        Args:
+            data (bytes): The raw contents of the inventory file.
+
+        Returns:
+            tuple: Lists of item names, quantities, regular prices in cents,
+                member prices in cents and tax statuses, in file order.
+
+        Raises:
+            InventoryFormatError: If a line is malformed and skip_errors is False.
+        """
+        self.errors = []
+        text = data.decode()
+        with paused_gc():
+            columns = self._scan_columns(text)
+            if columns is None:
+                columns = tuple(map(list, zip(*self._parse_lines(text)))) or ([], [], [], [], [])
+        return columns
+
+    def _scan_columns(self, text):
+        """
+        Scans a well-formed inventory file in bulk.
+
+        The whole file is split on ', ' once, with ': ' turned into ', :' and
+        every newline into a newline plus ', ', so each line yields exactly
+        five fields and each field keeps the mark of the separator before or
+        after it. Every field but the item name takes few distinct values, so
+        each distinct value is checked against its pattern and converted once.
+
+        Args:
+            text (str): The decoded contents of the inventory file.
+
+        Returns:
+            tuple: The parsed columns, or None if the file is not well-formed.
+        """
+        if "\r" in text:
+            text = text.replace("\r\n", "\n")
+        if not text:
+            return [], [], [], [], []
+        if not text.endswith("\n"):
+            text += "\n"
+        if text[0].isspace() or text.startswith(": ") or any(
+            separator in text for separator in ("\n ", "\n\t", "\n: ", ", :")
+        ):
+            return None
+        line_count = text.count("\n")
+        fields = text.replace(": ", ", :").replace("\n", "\n, ").split(", ")
+        # The split leaves an empty field after the last newline.
+        if len(fields) != 5 * line_count + 1:
+            return None
+        del fields[-1]
+        # Every tax status field ends with one of the line_count newlines, so
+        # no other field holds one and every line has exactly five fields.
+        quantities = self._convert_column(fields[1::5], QUANTITY_FIELD, int)
+        regular_cents = self._convert_column(fields[2::5], PRICE_FIELD, self._to_cents)
+        member_cents = self._convert_column(fields[3::5], PRICE_FIELD, self._to_cents)
+        tax_statuses = self._convert_column(fields[4::5], TAX_STATUS_FIELD, str)
+        if None in (quantities, regular_cents, member_cents, tax_statuses):
+            return None
+        return fields[0::5], quantities, regular_cents, member_cents, tax_statuses
+
+    @staticmethod
+    def _convert_column(column, pattern, convert):
+        """
+        Checks and converts a column through its distinct values.
+
+        Args:
+            column (list): The fields of one column.
+            pattern (re.Pattern): The pattern every field must match in full.
+            convert (callable): Builds the value from the groups of a match.
+
+        Returns:
+            list: The converted column, or None if a field does not match.
+        """
+        values = {}
+        for field in set(column):
+            match = pattern.fullmatch(field)
+            if match is None:
+                return None
+            values[field] = convert(*match.groups())
+        return list(map(values.__getitem__, column))
+
+    @staticmethod
+    def _to_cents(dollars, cents):
+        """
+        Converts the digits of a price to integer cents.
+
+        Args:
+            dollars (str): The digits before the decimal point.
+            cents (str): The two digits after it.
+
+        Returns:
+            int: The price in cents.
+        """
+        return int(dollars + cents)
+
+    def _parse_lines(self, text):
+        """
+        Parses the inventory line by line, recording malformed lines.
+
+        Args:
+            text (str): The decoded contents of the inventory file.
+
+        Returns:
+            list: A list of (item, quantity, regular_cents, member_cents, tax_status) tuples.
+
+        Raises:
+            InventoryFormatError: If a line is malformed and skip_errors is False.
+        """
+        rows = []
+        for line_number, line in enumerate(text.split("\n"), 1):
+            if not line.strip():
+                continue
+            match = LINE_PATTERN.match(line)
+            if match:
+                item, quantity, reg_dollars, reg_cents, mem_dollars, mem_cents, tax_status = match.groups()
+                rows.append(
+                    (item, int(quantity), int(reg_dollars + reg_cents),
+                     int(mem_dollars + mem_cents), tax_status)
+                )
+                continue
+            try:
+                rows.append(self._parse_loose_line(line))
+            except ValueError as error:
+                self.errors.append((line_number, line, str(error)))
+        if self.errors and not self.skip_errors:
+            raise InventoryFormatError(self.errors)
+        return rows
+
+    def _parse_loose_line(self, line):
+        """
+        Parses a line whose prices are not written with exactly two decimals.
+
+        Args:
+            line (str): A line of the inventory file.
+
+        Returns:
+            tuple: An (item, quantity, regular_cents, member_cents, tax_status) tuple.
+
+        Raises:
+            ValueError: If the line is malformed.
+        """
+        fields = line.strip().split(", ")
+        if len(fields) != 4:
+            raise ValueError(f"expected 4 comma-separated fields, found {len(fields)}")
+        item_and_quantity, reg_price, mem_price, tax_status = fields
+        parts = item_and_quantity.split(": ")
+        if len(parts) != 2:
+            raise ValueError("expected '<item>: <quantity>'")
+        item, quantity = parts
+        if not reg_price.startswith("$") or not mem_price.startswith("$"):
+            raise ValueError("prices must start with '$'")
+        return (
+            item,
+            int(quantity),
+            round(float(reg_price[1:]) * 100),
+            round(float(mem_price[1:]) * 100),
+            tax_status,
+        )
@@ -0,0 +1,234 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+# inotify(7) constants.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len, then the name
+
+
+def open_inotify(directory):
+    """
+    Starts watching a directory for files written or renamed into it.
+
+    Args:
+        directory (str): The directory to watch.
+
+    Returns:
+        int: The inotify file descriptor, or None where inotify is unavailable.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    fd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        return None
+    if inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def read_event_names(fd):
+    """
+    Reads the pending events of an inotify descriptor.
+
+    Args:
+        fd (int): The non-blocking inotify file descriptor.
+
+    Returns:
+        set: The names of the files the events are about.
+    """
+    names = set()
+    while True:
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            names.add(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+
+
+class InventoryWatcher:
+    """
+    Watches the inventory file of a store and applies its changes to the
+    running store with reload_inventory.
+
+    On Linux the directory of the file is watched with inotify, so a change is
+    applied as soon as the file is closed after writing or renamed into place.
+    Elsewhere, or when inotify is unavailable, the size, modification time and
+    inode of the file are polled, and a change is applied once it has stayed
+    the same for a whole interval, so that a file still being written is not
+    read half way. Errors, including those of on_reload, go to on_error and
+    the watcher keeps running.
+
+    Attributes:
+        store (Store): The store kept in sync with its inventory file.
+        interval (float): Seconds between polls, and the longest wait for an inotify event.
+        on_reload (callable): Called with the InventoryReload of every applied change.
+        on_error (callable): Called with the exception when a change cannot be applied.
+    """
+    def __init__(self, store, interval=1.0, on_reload=None, on_error=None, use_inotify=True):
+        """
+        Initializes an InventoryWatcher object.
+
+        Args:
+            store (Store): The store kept in sync with its inventory file.
+            interval (float): Seconds between polls, and the longest wait for an inotify event.
+            on_reload (callable): Called with the InventoryReload of every applied change.
+            on_error (callable): Called with the exception when a change cannot be applied.
+            use_inotify (bool): Whether to use inotify where it is available.
+        """
+        self.store = store
+        self.interval = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._use_inotify = use_inotify
+        self._fd = None
+        self._signature = None
+        self._seen = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def using_inotify(self):
+        """
+        Whether changes are detected with inotify rather than by polling.
+        """
+        return self._fd is not None
+
+    def start(self):
+        """
+        Records the current file as the version to compare with and starts
+        watching it in a background thread.
+
+        Raises:
+            ReloadError: If the store cannot reload its inventory file.
+        """
+        self._signature = self._stat()
+        self.store.reload_inventory()
+        if self._use_inotify:
+            self._fd = open_inotify(os.path.dirname(os.path.abspath(self.store.file)))
+        self._thread = threading.Thread(target=self._run, name="inventory-watcher", daemon=True)
+        self._thread.start()
+
+    def check(self):
+        """
+        Applies the changes of the inventory file if it changed since the last check.
+
+        Returns:
+            InventoryReload: The applied changes, or None if there were none
+                or they could not be applied.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            return None
+        return self._reload(signature)
+
+    def stop(self):
+        """
+        Stops watching the file, waiting for a change being applied.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _run(self):
+        """
+        Waits for changes of the file until the watcher is stopped.
+        """
+        name = os.path.basename(self.store.file)
+        while not self._stopped.is_set():
+            try:
+                if self._fd is not None:
+                    readable, _, _ = select.select([self._fd], [], [], self.interval)
+                    if readable and name in read_event_names(self._fd):
+                        self.check()
+                elif not self._stopped.wait(self.interval):
+                    self._poll()
+            except Exception as error:
+                self._report(error)
+                self._stopped.wait(self.interval)
+
+    def _poll(self):
+        """
+        Applies a change of the file once it was seen unchanged for one interval.
+        """
+        signature = self._stat()
+        if signature == self._signature:
+            self._seen = None
+        elif signature == self._seen:
+            self._reload(signature)
+        else:
+            self._seen = signature
+
+    def _reload(self, signature):
+        """
+        Applies the changes of the file and reports them.
+
+        Args:
+            signature (tuple): The stat signature of the file being applied.
+
+        Returns:
+            InventoryReload: The applied changes, or None.
+        """
+        try:
+            reload = self.store.reload_inventory()
+        except Exception as error:
+            self._report(error)
+            if not isinstance(error, ValueError):
+                return None
+            # A malformed file is not retried until it changes again.
+            reload = None
+        self._signature = signature
+        self._seen = None
+        if reload is not None and self.on_reload is not None:
+            try:
+                self.on_reload(reload)
+            except Exception as error:
+                self._report(error)
+        return reload
+
+    def _report(self, error):
+        """
+        Passes an exception to on_error, so that it never stops the watcher.
+
+        Args:
+            error (Exception): The exception.
+        """
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def _stat(self):
+        """
+        Returns the size, modification time and inode of the file, or None if it is missing.
+        """
+        try:
+            stat = os.stat(self.store.file)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,139 @@
+from bisect import bisect_left
+
+
+def normalize_name(name):
+    """
+    Normalizes an item name for lookups: case-folded, with runs of
+    whitespace collapsed to one space.
+
+    Args:
+        name (str): The name as typed.
+
+    Returns:
+        str: The normalized name.
+    """
+    return " ".join(name.split()).casefold()
+
+
+class ItemIndex:
+    """
+    Lookup index over item names for case-insensitive, alias and prefix queries.
+
+    A hash map resolves normalized names and aliases (barcodes, SKU codes) to
+    the inventory's own item names. A sorted array of normalized names answers
+    prefix queries with a binary search, so both stay sub-millisecond on a
+    catalog of millions of items. When several items share a normalized
+    name, the first one indexed is found and the others take its place in
+    turn as it is removed.
+
+    Attributes:
+        aliases (dict): A dictionary mapping normalized aliases to item names.
+    """
+    def __init__(self, items=()):
+        """
+        Initializes an ItemIndex object.
+
+        Args:
+            items (iterable): The item names to index.
+        """
+        self._names = {}
+        self._shadowed = {}
+        for item in items:
+            key = normalize_name(item)
+            if self._names.setdefault(key, item) != item:
+                self._shadowed.setdefault(key, []).append(item)
+        self._sorted = sorted(self._names)
+        self.aliases = {}
+        self._aliases_of = {}
+
+    def __len__(self):
+        """
+        Returns the number of distinct normalized names.
+        """
+        return len(self._names)
+
+    def resolve(self, name):
+        """
+        Finds the item a typed name or alias refers to.
+
+        Args:
+            name (str): The name, in any case, or an alias.
+
+        Returns:
+            str: The item name, or None if nothing matches.
+        """
+        key = normalize_name(name)
+        item = self._names.get(key)
+        if item is None:
+            item = self.aliases.get(key)
+        return item
+
+    def complete(self, prefix, limit=10):
+        """
+        Lists the items whose names start with a prefix, in name order.
+
+        Args:
+            prefix (str): The typed prefix, in any case.
+            limit (int): The maximum number of items returned.
+
+        Returns:
+            list: The matching item names.
+        """
+        key = normalize_name(prefix)
+        names = self._sorted
+        matches = []
+        position = bisect_left(names, key)
+        while position < len(names) and len(matches) < limit and names[position].startswith(key):
+            matches.append(self._names[names[position]])
+            position += 1
+        return matches
+
+    def add(self, item):
+        """
+        Indexes a new item name.
+
+        Args:
+            item (str): The item name.
+        """
+        key = normalize_name(item)
+        indexed = self._names.get(key)
+        if indexed is None:
+            self._names[key] = item
+            self._sorted.insert(bisect_left(self._sorted, key), key)
+        elif indexed != item and item not in self._shadowed.get(key, ()):
+            self._shadowed.setdefault(key, []).append(item)
+
+    def remove(self, item):
+        """
+        Removes an item name and its aliases from the index.
+
+        Args:
+            item (str): The item name.
+        """
+        key = normalize_name(item)
+        shadowed = self._shadowed.get(key, [])
+        if self._names.get(key) == item:
+            if shadowed:
+                self._names[key] = shadowed.pop(0)
+            else:
+                del self._names[key]
+                del self._sorted[bisect_left(self._sorted, key)]
+        elif item in shadowed:
+            shadowed.remove(item)
+        if not shadowed:
+            self._shadowed.pop(key, None)
+        for alias in self._aliases_of.pop(item, ()):
+            if self.aliases.get(alias) == item:
+                del self.aliases[alias]
+
+    def add_alias(self, alias, item):
+        """
+        Registers an alternative name, such as a barcode or SKU code, for an item.
+
+        Args:
+            alias (str): The alternative name.
+            item (str): The item name.
+        """
+        key = normalize_name(alias)
+        self.aliases[key] = item
+        self._aliases_of.setdefault(item, set()).add(key)
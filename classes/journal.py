@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+
+
+def content_digest(data):
+    """
+    Computes the digest used to identify an inventory snapshot.
+
+    Args:
+        data (bytes): The raw contents of the inventory file.
+
+    Returns:
+        str: A hex digest of the contents.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def fsync_directory(path):
+    """
+    Flushes a directory entry to disk so that renames and new files survive a crash.
+
+    Args:
+        path (str): A file inside the directory to flush.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class InventoryJournal:
+    """
+    Append-only write-ahead journal of inventory quantity deltas.
+
+    The first line of the journal is a header naming the digest of the snapshot
+    the deltas apply to. Every following line is one committed checkout.
+
+    Attributes:
+        file (str): The path to the journal file.
+        compact_every (int): Number of records after which the journal should be compacted.
+        records (int): Number of records currently in the journal.
+    """
+    def __init__(self, journal_file, compact_every=100):
+        """
+        Initializes an InventoryJournal object.
+
+        Args:
+            journal_file (str): The path to the journal file.
+            compact_every (int): Number of records after which the journal should be compacted.
+        """
+        self.file = journal_file
+        self.compact_every = compact_every
+        self.records = 0
+        self._snapshot_digest = None
+
+    def replay(self, snapshot_digest):
+        """
+        Reads the committed deltas recorded on top of the given snapshot.
+
+        A torn record at the end of the file (a write that never returned) is
+        discarded and truncated away. During a compaction the header names
+        both the new snapshot and the one it replaces, with the number of
+        records the new one includes, so whichever of the two a crash left in
+        place gets exactly the records it lacks. A journal naming neither
+        belongs to an inventory file edited while the store was closed: its
+        deltas are moved onto the edited file, as a reload would, since the
+        quantities the editor saw did not include them.
+
+        Args:
+            snapshot_digest (str): The digest of the snapshot that was loaded.
+
+        Returns:
+            list: A list of dictionaries mapping items to quantity deltas.
+        """
+        self._snapshot_digest = snapshot_digest
+        self.records = 0
+        if not os.path.exists(self.file):
+            return []
+        with open(self.file, "rb") as file:
+            data = file.read()
+
+        lines = data.split(b"\n")
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            header = {}
+        records = []
+        # The last element is either empty or an incomplete record.
+        for raw in lines[1:-1]:
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            records.append((raw, record["deltas"]))
+        if header.get("snapshot") == snapshot_digest:
+            kept = records[header.get("skip", 0):]
+        else:
+            kept = records
+        if header == {"snapshot": snapshot_digest}:
+            good_end = len(lines[0]) + 1 + sum(len(raw) + 1 for raw, _ in records)
+            if good_end != len(data):
+                with open(self.file, "r+b") as file:
+                    file.truncate(good_end)
+                    file.flush()
+                    os.fsync(file.fileno())
+        else:
+            self._replace(snapshot_digest, b"".join(raw + b"\n" for raw, _ in kept))
+        self.records = len(kept)
+        return [deltas for _, deltas in kept]
+
+    def append(self, deltas):
+        """
+        Appends one record of quantity deltas and forces it to disk.
+
+        Args:
+            deltas (dict): A dictionary mapping items to quantity deltas.
+        """
+        if not os.path.exists(self.file):
+            self.reset(self._snapshot_digest)
+        line = json.dumps({"deltas": deltas}, separators=(",", ":")) + "\n"
+        with open(self.file, "ab") as file:
+            file.write(line.encode())
+            file.flush()
+            os.fsync(file.fileno())
+        self.records += 1
+
+    def reset(self, snapshot_digest):
+        """
+        Atomically replaces the journal with an empty one for the given snapshot.
+
+        Args:
+            snapshot_digest (str): The digest of the snapshot new deltas apply to.
+        """
+        self._replace(snapshot_digest, b"")
+        self.records = 0
+
+    def size(self):
+        """
+        Returns the size of the journal file, to mark the records written so far.
+
+        Returns:
+            int: The size in bytes, or 0 if there is no journal file yet.
+        """
+        try:
+            return os.path.getsize(self.file)
+        except FileNotFoundError:
+            return 0
+
+    def begin_fold(self, snapshot_digest, offset):
+        """
+        Atomically points the journal at a new snapshot that already includes
+        the records before offset, before that snapshot replaces the current one.
+
+        The records are kept and the header names both snapshots, so a crash
+        before finish_fold loses no record, whichever file it leaves in place.
+
+        Args:
+            snapshot_digest (str): The digest of the new snapshot.
+            offset (int): The size of the journal when the snapshot was taken.
+        """
+        header = b""
+        records = b""
+        if os.path.exists(self.file):
+            with open(self.file, "rb") as file:
+                header = file.readline()
+                records = file.read()
+        folded = records[:max(offset - len(header), 0)].count(b"\n")
+        self._replace(snapshot_digest, records, base=self._snapshot_digest, skip=folded)
+
+    def finish_fold(self):
+        """
+        Atomically drops the records included in the snapshot named by
+        begin_fold, once that snapshot is in place.
+        """
+        with open(self.file, "rb") as file:
+            header = json.loads(file.readline())
+            records = file.read()
+        records = records.split(b"\n", header.get("skip", 0))[-1]
+        self._replace(self._snapshot_digest, records)
+        self.records = records.count(b"\n")
+
+    def _replace(self, snapshot_digest, records, **fold):
+        """
+        Atomically replaces the journal with a header for the given snapshot
+        followed by the given records.
+
+        Args:
+            snapshot_digest (str): The digest of the snapshot the records apply to.
+            records (bytes): The records, one per line.
+            **fold: The "base" snapshot and the number of records to "skip"
+                on top of the new one, while a compaction is in progress.
+        """
+        self._snapshot_digest = snapshot_digest
+        header = json.dumps({"snapshot": snapshot_digest, **fold}) + "\n"
+        temp_file = self.file + ".tmp"
+        with open(temp_file, "wb") as file:
+            file.write(header.encode() + records)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_file, self.file)
+        fsync_directory(self.file)
+
+    def rebase(self, snapshot_digest):
+        """
+        Atomically moves the recorded deltas onto another snapshot, for an
+        inventory file changed in a way the deltas still apply to.
+
+        Args:
+            snapshot_digest (str): The digest of the snapshot the deltas now apply to.
+        """
+        records = b""
+        if os.path.exists(self.file):
+            with open(self.file, "rb") as file:
+                file.readline()
+                records = file.read()
+        self._replace(snapshot_digest, records)
+
+    def needs_compaction(self):
+        """
+        Checks whether the journal has grown past its compaction threshold.
+
+        Returns:
+            bool: True if the journal should be compacted, False otherwise.
+        """
+        return self.records >= self.compact_every
@@ -1,38 +1,256 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# The listeners writing each configured logger's records, by logger name.
+_LISTENERS = {}
+
+
+class _SharedListener:
+    """
+    The listener and dedupe state shared by every ErrorLogger with one name.
+
+    Attributes:
+        listener (QueueListener): Writes the queued records to the log file.
+        recent (dict): The first time and repeat count of each recent message.
+        users (int): The number of started ErrorLogger objects using it.
+    """
+    def __init__(self, listener):
+        self.listener = listener
+        self.recent = {}
+        self.users = 0
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """
+    A file handler that starts a new file when the current one would grow past
+    max_bytes or has been written to for longer than interval seconds.
+
+    Rotated files are numbered like RotatingFileHandler's: error_log.log.1 is
+    the newest, up to backup_count of them are kept.
+
+    Attributes:
+        interval (float): The number of seconds after which the file is rotated.
+        rollover_at (float): The time of the next time-based rotation.
+    """
+    def __init__(self, filename, max_bytes=0, backup_count=0, interval=0):
+        """
+        Initializes a SizeAndTimeRotatingFileHandler object. The file is opened
+        when the first record is written.
+
+        Args:
+            filename (str): The path of the log file.
+            max_bytes (int): The size that triggers a rotation, or 0 for none.
+            backup_count (int): The number of rotated files to keep.
+            interval (float): The age in seconds that triggers a rotation, or 0 for none.
+        """
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        self.interval = interval
+        started = os.stat(filename).st_mtime if os.path.exists(filename) else time.time()
+        self.rollover_at = started + interval if interval else None
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, with the record's context
+    fields next to its time, level and message.
+    """
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+                    + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "context", ()))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
 
 class ErrorLogger:
     """
     Logger class for recording and handling error messages in the application.
+
+    Records are put on a queue and written by a background listener thread, so
+    logging never waits for the disk. They are written as JSON lines to a file
+    rotated by size and age. A message repeated within dedup_window seconds is
+    only counted; the count is logged as the "repeated" field of its next
+    occurrence after the window, or when the logger is closed.
+
+    The log file is opened when the first error is written. Every ErrorLogger
+    with the same name shares one handler, listener and dedupe state; the
+    listener is stopped when the last of them is closed.
+
+    Attributes:
+        name (str): The name of the underlying logging.Logger.
+        log_file (str): The path of the log file.
+        max_bytes (int): The size that triggers a rotation.
+        backup_count (int): The number of rotated files kept.
+        rotate_interval (float): The age in seconds that triggers a rotation.
+        dedup_window (float): Seconds during which a repeated message is only counted.
     """
-    def __init__(self):
-        self.logger = self.setup_logger()
+    def __init__(self, log_file="logs/error_log.log", name="error_logger", max_bytes=10 * 1024 * 1024,
+                 backup_count=5, rotate_interval=24 * 60 * 60, dedup_window=60.0):
+        """
+        Initializes an ErrorLogger object. Nothing is opened until the first error.
+
+        Args:
+            log_file (str): The path of the log file.
+            name (str): The name of the underlying logging.Logger.
+            max_bytes (int): The size that triggers a rotation, or 0 for none.
+            backup_count (int): The number of rotated files to keep.
+            rotate_interval (float): The age in seconds that triggers a rotation,
+                or 0 for none.
+            dedup_window (float): Seconds during which a repeated message is
+                only counted, or 0 to log every message.
+        """
+        self.name = name
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotate_interval = rotate_interval
+        self.dedup_window = dedup_window
+        self._logger = None
+        self._shared = None
+        self._records = None
+
+    @property
+    def logger(self):
+        """
+        The configured logger, set up on first access.
+        """
+        if self._logger is None:
+            self._start()
+        return self._logger
+
+    def _start(self):
+        """
+        Sets up the logger and joins the users of its shared listener.
+        """
+        self._logger = self.setup_logger()
+        self._shared = _LISTENERS[self.name]
+        self._shared.users += 1
+        self._records = self._shared.listener.queue
+        atexit.register(self.close)
 
     def setup_logger(self):
         """
-        Set up the logger with appropriate configuration.
+        Set up the logger with a queue handler and start its listener, unless
+        another ErrorLogger already did.
+
         Returns:
             logging.Logger: The configured logger instance.
         """
-        logger = logging.getLogger("error_logger")
+        logger = logging.getLogger(self.name)
+        if self.name in _LISTENERS:
+            return logger
         logger.setLevel(logging.ERROR)
+        logger.propagate = False
 
-        # Create file handler and set level to ERROR
-        file_handler = logging.FileHandler("logs/error_log.log")
-        file_handler.setLevel(logging.ERROR)
-
-        # Create formatter and add it to the handler
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        file_handler.setFormatter(formatter)
-
-        # Add the handler to the logger
-        logger.addHandler(file_handler)
+        directory = os.path.dirname(self.log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        file_handler = SizeAndTimeRotatingFileHandler(
+            self.log_file, self.max_bytes, self.backup_count, self.rotate_interval
+        )
+        file_handler.setFormatter(JsonFormatter())
 
+        records = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(records))
+        listener = QueueListener(records, file_handler)
+        listener.start()
+        _LISTENERS[self.name] = _SharedListener(listener)
         return logger
 
-    def log_error(self, message):
+    def log_error(self, message, **context):
         """
         Log an error message.
+
         Args:
             message (str): The error message to log.
+            **context: Fields recorded with the message, such as the menu
+                choice or the state of the transaction.
+        """
+        if self._shared is None:
+            self._start()
+        recent_messages = self._shared.recent
+        now = time.monotonic()
+        recent = recent_messages.get(message)
+        if recent is not None and now - recent[0] < self.dedup_window:
+            recent[1] += 1
+            return
+        if recent is not None and recent[1]:
+            context["repeated"] = recent[1]
+        if len(recent_messages) >= 1024:
+            self._flush_repeats(now)
+            if len(recent_messages) >= 1024:
+                self._flush_repeats()
+        recent_messages[message] = [now, 0]
+        self._put(message, context)
+
+    def _put(self, message, context):
+        """
+        Queues a record for the listener, skipping the logger's caller lookup
+        and the handler's record copy, so the caller only pays for the put.
+
+        Args:
+            message (str): The error message.
+            context (dict): The fields recorded with the message.
+        """
+        if self._records is None:
+            self._start()
+        record = logging.LogRecord(self.name, logging.ERROR, "", 0, message, None, None)
+        record.context = context
+        self._records.put(record)
+
+    def _flush_repeats(self, now=None):
+        """
+        Logs and forgets the counts of the repeated messages whose window has
+        passed, or of all of them when no time is given.
+
+        Args:
+            now (float): The current monotonic time.
+        """
+        recent_messages = self._shared.recent
+        for message, (first, repeated) in list(recent_messages.items()):
+            if now is None or now - first >= self.dedup_window:
+                del recent_messages[message]
+                if repeated:
+                    self._put(message, {"repeated": repeated})
+
+    def close(self):
+        """
+        Leaves the shared listener. The last ErrorLogger to close it logs the
+        pending repeat counts and waits for every queued record to be written.
         """
-        self.logger.error(message)
+        if self._shared is None:
+            return
+        atexit.unregister(self.close)
+        self._shared.users -= 1
+        if not self._shared.users:
+            self._flush_repeats()
+            del _LISTENERS[self.name]
+            self._shared.listener.stop()
+            for handler in self._shared.listener.handlers:
+                handler.close()
+            for handler in list(self._logger.handlers):
+                if isinstance(handler, QueueHandler):
+                    self._logger.removeHandler(handler)
+        self._logger = None
+        self._shared = None
+        self._records = None
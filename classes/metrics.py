@@ -0,0 +1,298 @@
+import functools
+import importlib
+import json
+import os
+import signal
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds of the latency buckets in seconds: 1, 2.5 and 5 per decade
+# from a microsecond to ten seconds.
+BUCKET_BOUNDS = tuple(
+    float(f"{mantissa}e{exponent}") for exponent in range(-6, 1) for mantissa in (1, 2.5, 5)
+) + (10.0,)
+
+# The instrumented methods: (module, class, method, operation name). Overrides
+# in subclasses are listed separately, as they replace the base method. An
+# override that calls the base method, like SharedMemoryStore.compact_inventory,
+# is left out so that its calls are not counted twice.
+HOT_PATHS = (
+    ("classes.store", "Store", "_load_inventory", "load_inventory"),
+    ("classes.store", "Store", "is_item_available", "is_item_available"),
+    ("classes.columnar_store", "ColumnarStore", "is_item_available", "is_item_available"),
+    ("classes.sqlite_store", "SQLiteStore", "is_item_available", "is_item_available"),
+    ("classes.store", "Store", "reserve", "reserve"),
+    ("classes.store", "Store", "reserve_many", "reserve_many"),
+    ("classes.store", "Store", "release", "release"),
+    ("classes.store", "Store", "commit", "commit"),
+    ("classes.store", "Store", "commit_many", "commit_many"),
+    ("classes.store", "Store", "update_inventory", "update_inventory"),
+    ("classes.sqlite_store", "SQLiteStore", "update_inventory", "update_inventory"),
+    ("classes.store", "Store", "save_inventory", "save_inventory"),
+    ("classes.sqlite_store", "SQLiteStore", "save_inventory", "save_inventory"),
+    ("classes.shared_store", "SharedMemoryStore", "save_inventory", "save_inventory"),
+    ("classes.store", "Store", "compact_inventory", "compact_inventory"),
+    ("classes.sqlite_store", "SQLiteStore", "compact_inventory", "compact_inventory"),
+    ("classes.cart", "Cart", "calculate_total", "calculate_total"),
+    ("classes.receipt", "Receipt", "generate_receipt", "generate_receipt"),
+)
+
+PREFIX = "quickmart_operation"
+
+
+class LatencyHistogram:
+    """
+    Counts the calls, errors and durations of one operation.
+
+    Updates take no lock, to keep recording cheap: calls recorded by several
+    threads at the same instant may rarely be lost, so the counts are a close
+    approximation under concurrency.
+
+    Attributes:
+        counts (list): The number of durations in each bucket, the last one
+            counting those above every bound.
+        sum (float): The total duration in seconds.
+        errors (int): The number of calls that raised.
+    """
+    def __init__(self):
+        """
+        Initializes an empty LatencyHistogram object.
+        """
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.sum = 0.0
+        self.errors = 0
+
+    def observe(self, seconds, failed=False):
+        """
+        Records one call.
+
+        Args:
+            seconds (float): The duration of the call.
+            failed (bool): Whether the call raised.
+        """
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.sum += seconds
+        if failed:
+            self.errors += 1
+
+    def clear(self):
+        """
+        Forgets every recorded call.
+        """
+        self.counts[:] = [0] * len(self.counts)
+        self.sum = 0.0
+        self.errors = 0
+
+    @property
+    def count(self):
+        """
+        The number of recorded calls.
+        """
+        return sum(self.counts)
+
+    def cumulative_counts(self):
+        """
+        Returns the number of calls at or below each bucket bound, ending with
+        the total for the +Inf bucket.
+        """
+        total = 0
+        cumulative = []
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class Metrics:
+    """
+    A registry of operation latency histograms.
+
+    Attributes:
+        histograms (dict): A dictionary mapping operation names to their LatencyHistogram.
+    """
+    def __init__(self):
+        """
+        Initializes an empty Metrics object.
+        """
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, operation):
+        """
+        Returns the histogram of an operation, creating it on first use.
+
+        Args:
+            operation (str): The operation name.
+
+        Returns:
+            LatencyHistogram: The histogram.
+        """
+        histogram = self.histograms.get(operation)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(operation, LatencyHistogram())
+        return histogram
+
+    def reset(self):
+        """
+        Forgets every recorded call, keeping the histograms the instrumented
+        methods record into.
+        """
+        for histogram in list(self.histograms.values()):
+            histogram.clear()
+
+    def snapshot(self):
+        """
+        Returns the recorded metrics as plain data.
+
+        Returns:
+            dict: A dictionary mapping operation names to their calls, errors,
+                total and mean seconds and cumulative bucket counts.
+        """
+        operations = {}
+        for operation, histogram in sorted(self.histograms.items()):
+            cumulative = histogram.cumulative_counts()
+            calls = cumulative[-1]
+            operations[operation] = {
+                "calls": calls,
+                "errors": histogram.errors,
+                "sum_seconds": histogram.sum,
+                "mean_seconds": histogram.sum / calls if calls else 0.0,
+                "buckets": dict(zip([repr(bound) for bound in BUCKET_BOUNDS] + ["+Inf"], cumulative)),
+            }
+        return {"operations": operations}
+
+    def to_json(self):
+        """
+        Returns the snapshot as a JSON document.
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        lines = [
+            f"# HELP {PREFIX}_duration_seconds Duration of store, cart and receipt operations.",
+            f"# TYPE {PREFIX}_duration_seconds histogram",
+        ]
+        snapshot = self.snapshot()["operations"]
+        for operation, stats in snapshot.items():
+            for bound, count in stats["buckets"].items():
+                lines.append(f'{PREFIX}_duration_seconds_bucket{{operation="{operation}",le="{bound}"}} {count}')
+            lines.append(f'{PREFIX}_duration_seconds_sum{{operation="{operation}"}} {stats["sum_seconds"]!r}')
+            lines.append(f'{PREFIX}_duration_seconds_count{{operation="{operation}"}} {stats["calls"]}')
+        for name, field, description in (("calls", "calls", "Calls"), ("errors", "errors", "Failed calls")):
+            lines.append(f"# HELP {PREFIX}_{name}_total {description} of store, cart and receipt operations.")
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            for operation, stats in snapshot.items():
+                lines.append(f'{PREFIX}_{name}_total{{operation="{operation}"}} {stats[field]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """
+        Atomically writes the metrics to a file, as JSON if its name ends in
+        .json and in the Prometheus text format otherwise.
+
+        The directory of the file is created if it does not exist.
+
+        Args:
+            path (str): The file to write.
+        """
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as file:
+            file.write(text)
+        os.replace(tmp_path, path)
+
+
+METRICS = Metrics()
+
+_originals = {}
+
+
+def _timed(method, histogram):
+    """
+    Wraps a method so every call is recorded in a histogram.
+    """
+    clock = time.perf_counter
+    counts = histogram.counts
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            result = method(*args, **kwargs)
+        except BaseException:
+            histogram.observe(clock() - start, True)
+            raise
+        # Inlined observe(), as this runs on every call.
+        seconds = clock() - start
+        counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        histogram.sum += seconds
+        return result
+
+    return timed
+
+
+def enable_metrics(metrics=METRICS):
+    """
+    Starts recording the hot paths by wrapping their methods.
+
+    Nothing is wrapped while metrics are disabled, so they cost nothing then.
+
+    Args:
+        metrics (Metrics): The registry to record into.
+    """
+    if _originals:
+        disable_metrics()
+    for module_name, class_name, method_name, operation in HOT_PATHS:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        method = cls.__dict__[method_name]
+        _originals[cls, method_name] = method
+        setattr(cls, method_name, _timed(method, metrics.histogram(operation)))
+
+
+def disable_metrics():
+    """
+    Stops recording and restores the original methods.
+    """
+    for (cls, method_name), method in _originals.items():
+        setattr(cls, method_name, method)
+    _originals.clear()
+
+
+def metrics_enabled():
+    """
+    Returns whether the hot paths are being recorded.
+    """
+    return bool(_originals)
+
+
+def install_dump_signal(path, signum=signal.SIGUSR1, metrics=METRICS, on_error=None):
+    """
+    Writes the metrics to a file whenever the process receives a signal.
+
+    A failed write never raises out of the handler, which runs in the
+    middle of whatever the process was doing.
+
+    Args:
+        path (str): The file to write, JSON if its name ends in .json and
+            Prometheus text otherwise.
+        signum (int): The signal to handle.
+        metrics (Metrics): The registry to dump.
+        on_error (callable): Called with the OSError of a failed write.
+            None ignores the failure.
+    """
+    def dump(received, frame):
+        try:
+            metrics.dump(path)
+        except OSError as error:
+            if on_error is not None:
+                on_error(error)
+
+    signal.signal(signum, dump)
@@ -0,0 +1,210 @@
+from collections import namedtuple
+
+from classes.promotions import PromotionTable
+from classes.tax import TAX_RATE_BASIS_POINTS, TaxEngine, TaxTable
+
+# Prices, taxes and totals are in integer cents. The unit price is the list
+# price for the customer; the discount from promotions and the tax are for the
+# whole line, so the total is quantity * unit_price - discount + tax.
+LineItem = namedtuple(
+    "LineItem", ["item", "quantity", "unit_price", "tax", "total", "discount"], defaults=(0,)
+)
+
+
+def format_cents(cents):
+    """
+    Formats an amount in cents as dollars with two decimals.
+
+    Args:
+        cents (int): The amount in cents.
+
+    Returns:
+        str: The amount in dollars, e.g. "3.75".
+    """
+    sign = "-" if cents < 0 else ""
+    dollars, remainder = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{remainder:02d}"
+
+
+def tax_cents(amount, rate_basis_points):
+    """
+    Computes the tax on an amount, rounding half a cent up.
+
+    Args:
+        amount (int): The taxable amount in cents.
+        rate_basis_points (int): The tax rate in hundredths of a percent.
+
+    Returns:
+        int: The tax in cents.
+    """
+    return (amount * rate_basis_points + 5000) // 10000
+
+
+class PricingEngine:
+    """
+    Prices cart lines in integer cents.
+
+    Each line costs one fused store lookup for its unit price and tax status,
+    one lookup in the compiled promotions and one in the item rate codes of
+    the tax engine, whose code indexes the day's rates. Tax is computed per
+    line on the discounted subtotal and rounded half a cent up, so totals are
+    exact and reproducible.
+
+    Attributes:
+        tax (TaxEngine): The tax engine resolving the rate of every line.
+        promotions (PromotionTable): The compiled promotions applied to the lines.
+    """
+    def __init__(self, tax_rate_basis_points=TAX_RATE_BASIS_POINTS, promotions=None, tax=None):
+        """
+        Initializes a PricingEngine object.
+
+        Args:
+            tax_rate_basis_points (int): The tax rate for taxable items in
+                hundredths of a percent, used when no tax engine is given.
+            promotions (PromotionTable): The compiled promotions applied to
+                the lines. None applies no promotions.
+            tax (TaxEngine): The tax engine resolving the rate of every line.
+                None taxes every taxable item at tax_rate_basis_points.
+        """
+        self.tax = tax if tax is not None else TaxEngine(TaxTable.flat(tax_rate_basis_points))
+        self.promotions = promotions if promotions is not None else PromotionTable()
+
+    def price_line(self, store, item, quantity, rewards_member):
+        """
+        Prices one cart line.
+
+        Args:
+            store (Store): The store object containing the inventory and pricing information.
+            item (str): The item to price.
+            quantity (int): The quantity of the item.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            LineItem: The priced line.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        unit_price, taxable = store.get_item_pricing(item, rewards_member)
+        subtotal = list_subtotal = unit_price * quantity
+        promoted = self.promotions.prices.get(item)
+        if promoted is not None:
+            subtotal = promoted.subtotal(quantity, rewards_member)
+        tax = tax_cents(subtotal, self.tax.rate_of(store, item, taxable))
+        return LineItem(item, int(quantity), unit_price, tax, subtotal + tax, list_subtotal - subtotal)
+
+    def price_line_pair(self, store, item, quantity):
+        """
+        Prices one cart line for a regular customer and for a rewards member.
+
+        Args:
+            store (Store): The store object containing the inventory and pricing information.
+            item (str): The item to price.
+            quantity (int): The quantity of the item.
+
+        Returns:
+            tuple: The regular and the member LineItem.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        regular_price, member_price, taxable = store.get_item_prices(item)
+        rate = self.tax.rate_of(store, item, taxable)
+        quantity = int(quantity)
+        promoted = self.promotions.prices.get(item)
+        lines = []
+        for rewards_member, unit_price in enumerate((regular_price, member_price)):
+            subtotal = list_subtotal = unit_price * quantity
+            if promoted is not None:
+                subtotal = promoted.subtotal(quantity, rewards_member)
+            tax = tax_cents(subtotal, rate)
+            lines.append(LineItem(item, quantity, unit_price, tax, subtotal + tax, list_subtotal - subtotal))
+        return tuple(lines)
+
+    def price_line_pairs(self, store, items):
+        """
+        Prices several cart lines for both customer types in one pass.
+
+        Args:
+            store (Store): The store object containing the inventory and pricing information.
+            items (iterable): (item, quantity) pairs.
+
+        Returns:
+            dict: A dictionary mapping each item to its regular and member LineItem.
+
+        Raises:
+            ItemNotFoundError: If an item is not found in the inventory.
+        """
+        get_item_prices = store.get_item_prices
+        get_promoted = self.promotions.prices.get
+        rates, codes = self.tax.resolve(store)
+        get_code = codes.get
+        new_line = tuple.__new__
+        pairs = {}
+        for item, quantity in items:
+            regular_price, member_price, taxable = get_item_prices(item)
+            rate = rates[get_code(item, taxable)]
+            quantity = int(quantity)
+            regular_list = regular_subtotal = regular_price * quantity
+            member_list = member_subtotal = member_price * quantity
+            promoted = get_promoted(item)
+            if promoted is not None:
+                regular_subtotal = promoted.subtotal(quantity, False)
+                member_subtotal = promoted.subtotal(quantity, True)
+            regular_tax = (regular_subtotal * rate + 5000) // 10000
+            member_tax = (member_subtotal * rate + 5000) // 10000
+            pairs[item] = (
+                new_line(LineItem, (item, quantity, regular_price, regular_tax,
+                                    regular_subtotal + regular_tax, regular_list - regular_subtotal)),
+                new_line(LineItem, (item, quantity, member_price, member_tax,
+                                    member_subtotal + member_tax, member_list - member_subtotal)),
+            )
+        return pairs
+
+    def price_items(self, store, items, rewards_member):
+        """
+        Prices a sequence of cart lines.
+
+        Args:
+            store (Store): The store object containing the inventory and pricing information.
+            items (iterable): (item, quantity) pairs.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            list: The priced lines as LineItem records.
+        """
+        get_item_pricing = store.get_item_pricing
+        get_promoted = self.promotions.prices.get
+        rates, codes = self.tax.resolve(store)
+        get_code = codes.get
+        new_line = tuple.__new__
+        lines = []
+        append = lines.append
+        for item, quantity in items:
+            unit_price, taxable = get_item_pricing(item, rewards_member)
+            subtotal = list_subtotal = unit_price * quantity
+            promoted = get_promoted(item)
+            if promoted is not None:
+                subtotal = promoted.subtotal(quantity, rewards_member)
+            tax = (subtotal * rates[get_code(item, taxable)] + 5000) // 10000
+            append(new_line(
+                LineItem, (item, int(quantity), unit_price, tax, subtotal + tax, list_subtotal - subtotal)
+            ))
+        return lines
+
+    def totals(self, lines):
+        """
+        Sums priced lines.
+
+        Args:
+            lines (iterable): LineItem records.
+
+        Returns:
+            tuple: The subtotal, tax and total in cents.
+        """
+        subtotal = 0
+        tax = 0
+        for line in lines:
+            subtotal += line.total - line.tax
+            tax += line.tax
+        return subtotal, tax, subtotal + tax
@@ -0,0 +1,273 @@
+import json
+from collections import namedtuple
+from datetime import date
+
+from classes.errors import ItemNotFoundError, PromotionFormatError
+
+MULTI_BUY = "multi_buy"
+CATEGORY_PERCENT_OFF = "category_percent_off"
+MEMBER_COUPON = "member_coupon"
+
+REQUIRED_FIELDS = {
+    MULTI_BUY: ("item", "quantity", "price_cents"),
+    CATEGORY_PERCENT_OFF: ("category", "percent"),
+    MEMBER_COUPON: ("item",),
+}
+
+
+def percent_of(amount, basis_points):
+    """
+    Computes a percentage of an amount, rounding half a cent up.
+
+    Args:
+        amount (int): The amount in cents.
+        basis_points (int): The percentage in hundredths of a percent.
+
+    Returns:
+        int: The percentage of the amount in cents.
+    """
+    return (amount * basis_points + 5000) // 10000
+
+
+def _basis_points(percent):
+    """
+    Converts a percentage between 0 and 100 to hundredths of a percent.
+
+    Raises:
+        ValueError: If the percentage is out of range.
+    """
+    if isinstance(percent, bool) or not isinstance(percent, (int, float)) or not 0 < percent <= 100:
+        raise ValueError(f"invalid percent {percent!r}")
+    return round(percent * 100)
+
+
+def _positive_int(value, field):
+    """
+    Checks that a field is a positive integer.
+
+    Raises:
+        ValueError: If it is not.
+    """
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        raise ValueError(f"invalid {field} {value!r}")
+    return value
+
+
+def parse_promotion(entry):
+    """
+    Validates a promotion and normalizes its amounts.
+
+    Args:
+        entry (dict): The promotion as read from the promotions file.
+
+    Returns:
+        dict: The promotion, with percentages converted to "basis_points".
+
+    Raises:
+        ValueError: If the promotion is malformed.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("not a JSON object")
+    kind = entry.get("type")
+    if kind not in REQUIRED_FIELDS:
+        raise ValueError(f"unknown promotion type {kind!r}")
+    missing = [field for field in REQUIRED_FIELDS[kind] if field not in entry]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    promotion = dict(entry)
+    for field in ("start", "end"):
+        if field in entry:
+            promotion[field] = date.fromisoformat(entry[field])
+    if kind == MULTI_BUY:
+        _positive_int(entry["quantity"], "quantity")
+        _positive_int(entry["price_cents"], "price_cents")
+    elif kind == CATEGORY_PERCENT_OFF:
+        promotion["basis_points"] = _basis_points(entry["percent"])
+    elif ("percent" in entry) == ("amount_off_cents" in entry):
+        raise ValueError("a coupon needs either percent or amount_off_cents")
+    elif "percent" in entry:
+        promotion["basis_points"] = _basis_points(entry["percent"])
+    else:
+        _positive_int(entry["amount_off_cents"], "amount_off_cents")
+    return promotion
+
+
+def read_promotions(path, today=None):
+    """
+    Reads the promotions active on a day from a promotions file.
+
+    The file holds one JSON object per line, for example:
+
+        {"type": "multi_buy", "item": "Red Bull", "quantity": 3, "price_cents": 1000}
+        {"type": "category_percent_off", "category": "Drinks", "percent": 10}
+        {"type": "member_coupon", "item": "Milk", "amount_off_cents": 50}
+        {"type": "member_coupon", "item": "Milk", "percent": 20, "end": "2026-12-31"}
+
+    Optional "start" and "end" dates bound the days a promotion is active,
+    both included. Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        path (str): The path to the promotions file.
+        today (date): The day to select the promotions for. Defaults to today.
+
+    Returns:
+        list: The active promotions. Empty if the file does not exist.
+
+    Raises:
+        PromotionFormatError: If a line is malformed.
+    """
+    today = today or date.today()
+    promotions = []
+    errors = []
+    try:
+        with open(path) as file:
+            for line_number, line in enumerate(file, 1):
+                text = line.strip()
+                if not text or text.startswith("#"):
+                    continue
+                try:
+                    promotion = parse_promotion(json.loads(text))
+                except (TypeError, ValueError) as error:
+                    errors.append((line_number, line, str(error)))
+                    continue
+                if promotion.get("start", today) <= today <= promotion.get("end", today):
+                    promotions.append(promotion)
+    except FileNotFoundError:
+        return []
+    if errors:
+        raise PromotionFormatError(errors)
+    return promotions
+
+
+class PromotedPrice(namedtuple("PromotedPrice", ["regular_price", "member_price", "deal_quantity", "deal_price"])):
+    """
+    The compiled pricing of one promoted item: its unit prices in cents after
+    percentage and coupon discounts, and its best multi-buy deal of
+    deal_quantity units for deal_price cents, or 0 and 0 without one.
+    """
+    __slots__ = ()
+
+    def subtotal(self, quantity, rewards_member):
+        """
+        Prices a quantity of the item before tax.
+
+        Whole deals are charged the deal price when it is cheaper than the
+        unit price, the remaining units the unit price.
+
+        Args:
+            quantity (int): The quantity of the item.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            int: The subtotal in cents.
+        """
+        unit_price = self.member_price if rewards_member else self.regular_price
+        deal_quantity = self.deal_quantity
+        if deal_quantity and self.deal_price < unit_price * deal_quantity:
+            deals, rest = divmod(quantity, deal_quantity)
+            return deals * self.deal_price + rest * unit_price
+        return unit_price * quantity
+
+
+class PromotionTable:
+    """
+    Active promotions compiled against a store's prices into one PromotedPrice
+    per promoted item.
+
+    Pricing a line then costs a single lookup, however many promotions are
+    active. Promotions on the same item combine as follows: the largest
+    category discount applies to both prices, the best member coupon is taken
+    off the member price after it, and the multi-buy deal with the lowest
+    price per unit applies to both customer types.
+
+    Attributes:
+        prices (dict): A dictionary mapping promoted items to their PromotedPrice.
+        promotions (int): The number of promotions compiled.
+    """
+    def __init__(self, prices=None, promotions=0):
+        """
+        Initializes a PromotionTable object.
+
+        Args:
+            prices (dict): A dictionary mapping promoted items to their PromotedPrice.
+            promotions (int): The number of promotions compiled.
+        """
+        self.prices = prices if prices is not None else {}
+        self.promotions = promotions
+
+    def __len__(self):
+        """
+        Returns the number of promoted items.
+        """
+        return len(self.prices)
+
+    def get(self, item):
+        """
+        Returns the promoted pricing of an item.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            PromotedPrice: The compiled pricing, or None if no promotion applies.
+        """
+        return self.prices.get(item)
+
+    @classmethod
+    def compile(cls, promotions, store):
+        """
+        Compiles promotions against the current prices of a store.
+
+        Promotions for items the store does not carry are ignored.
+
+        Args:
+            promotions (list): The active promotions, as read by read_promotions.
+            store (Store): The store whose prices and categories are used.
+
+        Returns:
+            PromotionTable: The compiled table.
+        """
+        category_discounts = {}
+        coupons = {}
+        deals = {}
+        for promotion in promotions:
+            kind = promotion["type"]
+            if kind == CATEGORY_PERCENT_OFF:
+                category = promotion["category"]
+                category_discounts[category] = max(
+                    category_discounts.get(category, 0), promotion["basis_points"]
+                )
+            elif kind == MEMBER_COUPON:
+                coupons.setdefault(promotion["item"], []).append(promotion)
+            else:
+                deal = (promotion["quantity"], promotion["price_cents"])
+                best = deals.get(promotion["item"])
+                if best is None or deal[1] * best[0] < best[1] * deal[0]:
+                    deals[promotion["item"]] = deal
+
+        discounts = {}
+        if category_discounts:
+            for item, category in store.item_categories().items():
+                basis_points = category_discounts.get(category)
+                if basis_points is not None:
+                    discounts[item] = basis_points
+
+        prices = {}
+        for item in discounts.keys() | coupons.keys() | deals.keys():
+            try:
+                regular_price, member_price, _ = store.get_item_prices(item)
+            except ItemNotFoundError:
+                continue
+            basis_points = discounts.get(item, 0)
+            regular_price -= percent_of(regular_price, basis_points)
+            member_price -= percent_of(member_price, basis_points)
+            coupon_off = max(
+                (coupon["amount_off_cents"] if "amount_off_cents" in coupon
+                 else percent_of(member_price, coupon["basis_points"])
+                 for coupon in coupons.get(item, ())),
+                default=0,
+            )
+            member_price = max(member_price - coupon_off, 0)
+            deal_quantity, deal_price = deals.get(item, (0, 0))
+            prices[item] = PromotedPrice(regular_price, member_price, deal_quantity, deal_price)
+        return cls(prices, len(promotions))
@@ -1,25 +1,55 @@
+import os
 from datetime import date
 
-today = date.today()
+from classes.pricing import format_cents
+from classes.receipt_renderers import TextReceiptRenderer
+from classes.receipt_writer import ReceiptWriter
+from classes.transaction_counter import TransactionCounter
 
 
 class Receipt:
     """
     Represents a receipt for a transaction.
 
+    Each checkout gets the next transaction number and its own file,
+    transaction_<number>_<MMDDYYYY> with the renderer's extension. The receipt
+    is rendered in memory, dated when it is rendered, and handed to a
+    background writer, so checkout does not wait for the disk.
+
     Attributes:
-        receipt_file (str): The path to the receipt file.
+        receipt_directory (str): The directory the receipt files are written to.
     """
-    def __init__(self, receipt_file):
+    def __init__(self, receipt_directory, counter=None, writer=None, renderer=None):
         """
-        Initializes a Receipt object with the specified receipt file.
+        Initializes a Receipt object writing to the specified directory.
 
         Args:
-            receipt_file (str): The path to the receipt file.
+            receipt_directory (str): The directory the receipt files are written to.
+            counter (TransactionCounter): The source of transaction numbers.
+                Defaults to a counter file in the receipt directory.
+            writer (ReceiptWriter): The background writer. A new one is
+                created when none is given.
+            renderer: The receipt renderer, one of the classes in
+                classes.receipt_renderers. Defaults to plain text.
+        """
+        self.receipt_directory = receipt_directory
+        if counter is None:
+            counter = TransactionCounter(os.path.join(receipt_directory, "transaction_counter"))
+        self._counter = counter
+        self._writer = writer if writer is not None else ReceiptWriter()
+        self._writer.on_close(counter.close)
+        self._renderer = renderer if renderer is not None else TextReceiptRenderer()
+
+    def next_transaction_number(self):
         """
-        self._receipt_file = receipt_file
+        Takes the next transaction number from the counter.
 
-    def generate_receipt(self, cart, store, rewards_member):
+        Returns:
+            int: The transaction number.
+        """
+        return self._counter.next()
+
+    def generate_receipt(self, cart, store, rewards_member, transaction_number=None):
         """
         Generates a receipt based on the provided cart, store, and rewards membership information.
 
@@ -27,38 +57,50 @@ class Receipt:
             cart (Cart): The cart containing the items for the receipt.
             store (Store): The store object containing the inventory and pricing information.
             rewards_member (bool): Indicates whether the customer is a rewards member.
+            transaction_number (int): The transaction number, taken from the
+                counter when it is not given.
+
+        Returns:
+            str: The path the receipt is being written to.
+        """
+        if transaction_number is None:
+            transaction_number = self._counter.next()
+        today = date.today()
+        text = self.render(cart, store, rewards_member, transaction_number, today)
+        path = os.path.join(
+            self.receipt_directory,
+            f"transaction_{transaction_number:06d}_{today.strftime('%m%d%Y')}{self._renderer.extension}",
+        )
+        self._writer.submit(path, text)
+        _, taxes, total = cart.totals(store, rewards_member)
+        print(f"Total amount: ${format_cents(total)}, Taxes: ${format_cents(taxes)}")
+        return path
+
+    def render(self, cart, store, rewards_member, transaction_number, today):
+        """
+        Renders a receipt into a string.
+
+        Args:
+            cart (Cart): The cart containing the items for the receipt.
+            store (Store): The store object containing the inventory and pricing information.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+            transaction_number (int): The transaction number.
+            today (date): The date of the transaction.
+
+        Returns:
+            str: The rendered receipt.
+        """
+        lines = cart.calculate_total(store, rewards_member)
+        return self._renderer.render(lines, rewards_member, transaction_number, today)
+
+    def flush(self):
+        """
+        Blocks until every generated receipt is on disk.
+        """
+        self._writer.flush()
+
+    def close(self):
+        """
+        Flushes pending receipts, stops the writer and records the transaction counter.
         """
-        with open(self._receipt_file, "w") as file:
-            file.write(today.strftime("%B %d, %Y"))
-            file.write(f"\n")
-            file.write(f"Transaction No. 000001")            
-            file.write(f"\n")
-            if rewards_member:
-                file.write(f"Client is a rewards member\n")
-            else:
-                file.write(f"Client is not a rewards member\n")
-            file.write(f"\n")
-            file.write(f"Item      Quantity      Unit Price    Tax       Total\n")
-            file.write(f"\n")
-            total = 0.0
-            taxes = 0.0
-            items_sold = 0
-            result = cart.calculate_total(store, rewards_member)
-            for item, details in result.items():
-                quantity = details["quantity"]
-                unit_price = details["unit_price"]
-                unit_tax = details["unit_tax"]
-                unit_total = details["total"]
-                total += unit_total
-                taxes += unit_tax
-                items_sold += 1
-                file.write(
-                    f"{item}:        {quantity}       x    ${unit_price}  +   ${unit_tax:.2f}  =   ${unit_total:.2f}\n"
-                )
-            print(f"Total amount: ${total:.2f}, Taxes: ${taxes:.2f}")
-            file.write(f"\n")
-            file.write(f"**************************")
-            file.write(f"\n")
-            file.write(f"Items sold: {items_sold}\n")
-            file.write(f"Taxes: ${taxes:.2f}\n")
-            file.write(f"Total: ${total:.2f}\n")
+        self._writer.close()
@@ -0,0 +1,294 @@
+import csv
+import io
+from itertools import repeat
+from json.encoder import encode_basestring_ascii
+from operator import floordiv, mod
+from string import Formatter
+
+from classes.pricing import format_cents
+
+TEXT_LAYOUT = (
+    "{date:%B %d, %Y}\n"
+    "Transaction No. {transaction:06d}\n"
+    "{customer}\n"
+    "\n"
+    "Item      Quantity      Unit Price    Tax       Total\n"
+    "\n"
+    "{lines}"
+    "\n"
+    "**************************\n"
+    "Items sold: {items_sold}\n"
+    "Taxes: ${taxes}\n"
+    "Total: ${total}\n"
+)
+TEXT_LINE_LAYOUT = "{item}:        {quantity}       x    ${unit_price}  +   ${tax}  =   ${total}\n"
+TEXT_DISCOUNT_LINE_LAYOUT = (
+    "{item}:        {quantity}       x    ${unit_price}  -   ${discount}  +   ${tax}  =   ${total}\n"
+)
+LINE_FIELDS = ("item", "quantity", "unit_price", "discount", "tax", "total")
+MONEY_FIELDS = ("unit_price", "discount", "tax", "total")
+
+
+def _line_columns(lines):
+    """
+    Splits priced lines into columns and sums them.
+
+    Args:
+        lines (list): LineItem records.
+
+    Returns:
+        tuple: The items, quantities, unit prices, taxes, totals and discounts
+            columns, followed by the total tax and the grand total in cents.
+    """
+    if not lines:
+        return (), (), (), (), (), (), 0, 0
+    items, quantities, unit_prices, taxes, totals, discounts = zip(*lines)
+    return items, quantities, unit_prices, taxes, totals, discounts, sum(taxes), sum(totals)
+
+
+def _money_column(cents):
+    """
+    Formats a column of non-negative amounts in cents as dollars.
+
+    Args:
+        cents (iterable): The amounts in cents.
+
+    Returns:
+        iterator: The amounts as strings with two decimals.
+    """
+    hundred = repeat(100)
+    return map("%d.%02d".__mod__, zip(map(floordiv, cents, hundred), map(mod, cents, hundred)))
+
+
+def compile_line_layout(line_layout):
+    """
+    Compiles a line item template into a printf-style format.
+
+    Amounts are expanded into separate dollar and cent conversions, so a line
+    is formatted by one % operation on integers without calling format_cents.
+
+    Args:
+        line_layout (str): A str.format template using the fields item,
+            quantity, unit_price, discount, tax and total.
+
+    Returns:
+        tuple: The compiled format for non-negative amounts, the format with
+            preformatted amounts, and the fields in the order they are used.
+
+    Raises:
+        ValueError: If the template uses an unknown field, a format spec or a conversion.
+    """
+    fast = []
+    safe = []
+    fields = []
+    for literal, field, spec, conversion in Formatter().parse(line_layout):
+        literal = literal.replace("%", "%%")
+        fast.append(literal)
+        safe.append(literal)
+        if field is None:
+            continue
+        if field not in LINE_FIELDS or spec or conversion:
+            raise ValueError(f"Unsupported receipt line field: {{{field}}}")
+        fields.append(field)
+        if field in MONEY_FIELDS:
+            fast.append("%d.%02d")
+            safe.append("%s")
+        else:
+            fast.append("%s")
+            safe.append("%s")
+    return "".join(fast), "".join(safe), tuple(fields)
+
+
+class TextReceiptRenderer:
+    """
+    Renders receipts as plain text from a layout compiled once.
+
+    The layout is a str.format template with the fields date, transaction,
+    customer, lines, items_sold, taxes and total. The line layouts use the
+    fields item, quantity, unit_price, discount, tax and total and are
+    compiled once into printf-style formats, so all lines are formatted by a
+    single map over integer columns and joined once. Lines with a promotion
+    discount use the discount line layout, so that they add up.
+
+    Attributes:
+        extension (str): The file extension of rendered receipts.
+    """
+    extension = ".txt"
+
+    def __init__(self, layout=TEXT_LAYOUT, line_layout=TEXT_LINE_LAYOUT,
+                 discount_line_layout=TEXT_DISCOUNT_LINE_LAYOUT):
+        """
+        Initializes a TextReceiptRenderer object.
+
+        Args:
+            layout (str): The receipt template.
+            line_layout (str): The template of one line item.
+            discount_line_layout (str): The template of one line item with a
+                promotion discount.
+        """
+        self._format = layout.format
+        self._line_format = compile_line_layout(line_layout)
+        self._discount_line_format = compile_line_layout(discount_line_layout)
+
+    def render(self, lines, rewards_member, transaction_number, when):
+        """
+        Renders a receipt.
+
+        Args:
+            lines (list): The priced LineItem records.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+            transaction_number (int): The transaction number.
+            when (date): The date of the transaction.
+
+        Returns:
+            str: The receipt text.
+        """
+        items, quantities, unit_prices, taxes, totals, discounts, tax, total = _line_columns(lines)
+        columns = {
+            "item": items, "quantity": quantities, "unit_price": unit_prices,
+            "discount": discounts, "tax": taxes, "total": totals,
+        }
+        fast = bool(items) and min(min(unit_prices), min(discounts), min(taxes), min(totals)) >= 0
+        body = self._format_lines(self._line_format, columns, fast)
+        if any(discounts):
+            discounted = self._format_lines(self._discount_line_format, columns, fast)
+            body = [
+                discounted_line if discount else line
+                for line, discounted_line, discount in zip(body, discounted, discounts)
+            ]
+        return self._format(
+            date=when,
+            transaction=transaction_number,
+            customer="Client is a rewards member" if rewards_member else "Client is not a rewards member",
+            lines="".join(body),
+            items_sold=len(items),
+            taxes=format_cents(tax),
+            total=format_cents(total),
+        )
+
+    @staticmethod
+    def _format_lines(line_format, columns, fast):
+        """
+        Formats every line item with a compiled line layout.
+
+        Args:
+            line_format (tuple): The result of compile_line_layout.
+            columns (dict): The line columns by field name.
+            fast (bool): Whether every amount is non-negative, so the
+                integer format applies.
+
+        Returns:
+            list: The formatted lines.
+        """
+        fast_format, safe_format, fields = line_format
+        if fast:
+            hundred = repeat(100)
+            parts = []
+            for field in fields:
+                if field in MONEY_FIELDS:
+                    parts.append(map(floordiv, columns[field], hundred))
+                    parts.append(map(mod, columns[field], hundred))
+                else:
+                    parts.append(columns[field])
+            return list(map(fast_format.__mod__, zip(*parts)))
+        parts = [
+            map(format_cents, columns[field]) if field in MONEY_FIELDS else columns[field]
+            for field in fields
+        ]
+        return list(map(safe_format.__mod__, zip(*parts)))
+
+
+class JsonLinesReceiptRenderer:
+    """
+    Renders receipts as JSON lines: a receipt header record, one record per
+    line item and a summary record. Amounts are integer cents, and the total
+    of a line is its quantity times the unit price, less the discount, plus tax.
+
+    Attributes:
+        extension (str): The file extension of rendered receipts.
+    """
+    extension = ".jsonl"
+
+    _line_format = (
+        '{{"type": "line", "item": {0}, "quantity": {1}, "unit_price_cents": {2}, '
+        '"discount_cents": {3}, "tax_cents": {4}, "total_cents": {5}}}\n'
+    ).format
+
+    def render(self, lines, rewards_member, transaction_number, when):
+        """
+        Renders a receipt.
+
+        Args:
+            lines (list): The priced LineItem records.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+            transaction_number (int): The transaction number.
+            when (date): The date of the transaction.
+
+        Returns:
+            str: The receipt as JSON lines.
+        """
+        items, quantities, unit_prices, taxes, totals, discounts, tax, total = _line_columns(lines)
+        header = (
+            f'{{"type": "receipt", "transaction": {transaction_number}, '
+            f'"date": "{when.isoformat()}", "rewards_member": {"true" if rewards_member else "false"}}}\n'
+        )
+        body = "".join(map(
+            self._line_format, map(encode_basestring_ascii, items), quantities,
+            unit_prices, discounts, taxes, totals,
+        ))
+        summary = (
+            f'{{"type": "summary", "items_sold": {len(items)}, "discount_cents": {sum(discounts)}, '
+            f'"tax_cents": {tax}, "total_cents": {total}}}\n'
+        )
+        return header + body + summary
+
+
+class CsvReceiptRenderer:
+    """
+    Renders receipts as CSV with one row per line item. Every row repeats the
+    transaction number, date and membership flag, so files concatenate into
+    one table.
+
+    Attributes:
+        extension (str): The file extension of rendered receipts.
+    """
+    extension = ".csv"
+
+    HEADER = (
+        "transaction", "date", "rewards_member", "item", "quantity", "unit_price", "discount", "tax", "total",
+    )
+
+    def render(self, lines, rewards_member, transaction_number, when):
+        """
+        Renders a receipt.
+
+        Args:
+            lines (list): The priced LineItem records.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+            transaction_number (int): The transaction number.
+            when (date): The date of the transaction.
+
+        Returns:
+            str: The receipt as CSV.
+        """
+        items, quantities, unit_prices, taxes, totals, discounts, _, _ = _line_columns(lines)
+        count = len(items)
+        money = _money_column if items and min(map(min, (unit_prices, discounts, taxes, totals))) >= 0 else (
+            lambda column: map(format_cents, column)
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(self.HEADER)
+        writer.writerows(zip(
+            [transaction_number] * count, [when.isoformat()] * count,
+            [int(bool(rewards_member))] * count, items, quantities,
+            money(unit_prices), money(discounts), money(taxes), money(totals),
+        ))
+        return buffer.getvalue()
+
+
+RENDERERS = {
+    "text": TextReceiptRenderer,
+    "jsonl": JsonLinesReceiptRenderer,
+    "csv": CsvReceiptRenderer,
+}
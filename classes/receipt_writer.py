@@ -0,0 +1,180 @@
+import atexit
+import os
+import queue
+import threading
+
+from classes.journal import fsync_directory
+
+
+class ReceiptWriter:
+    """
+    Writes rendered receipts to disk on a background thread.
+
+    Checkout hands over the receipt text and returns immediately. The writer
+    thread takes every receipt queued so far as one batch, writes and fsyncs
+    the files, and then fsyncs each of their directories once for the whole
+    batch. The thread is started by the first submitted receipt, and pending
+    receipts are flushed when the interpreter exits.
+
+    A receipt that cannot be written, for any reason, is passed to on_error
+    and the thread goes on with the next one. Without on_error, the first
+    such error is raised again by the next flush() or close().
+
+    Attributes:
+        max_batch (int): The largest number of receipts written as one batch.
+        on_error (callable): Called with the path and the exception of every
+            receipt that could not be written, on the writer thread.
+        errors (list): (path, exception) pairs for receipts that could not be written.
+    """
+    def __init__(self, max_batch=256, on_error=None):
+        """
+        Initializes a ReceiptWriter object.
+
+        Args:
+            max_batch (int): The largest number of receipts written as one batch.
+            on_error (callable): Called with the path and the exception of every
+                receipt that could not be written, on the writer thread. None
+                raises the errors from flush() and close() instead.
+        """
+        self.max_batch = max_batch
+        self.on_error = on_error
+        self.errors = []
+        self._raised = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closers = []
+
+    def submit(self, path, text):
+        """
+        Queues a receipt to be written.
+
+        Args:
+            path (str): The path of the receipt file.
+            text (str): The rendered receipt.
+        """
+        if self._thread is None:
+            self._start()
+        self._queue.put((path, text))
+
+    def on_close(self, callback):
+        """
+        Registers a callback to run after the final flush in close().
+
+        Args:
+            callback (callable): A function taking no arguments.
+        """
+        self._closers.append(callback)
+
+    def flush(self):
+        """
+        Blocks until every submitted receipt is on disk.
+
+        Raises:
+            Exception: The error of a receipt that could not be written, if
+                there is no on_error.
+        """
+        self._queue.join()
+        self._raise_errors()
+
+    def close(self):
+        """
+        Flushes pending receipts and stops the writer thread.
+
+        Raises:
+            Exception: The error of a receipt that could not be written, if
+                there is no on_error.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+            atexit.unregister(self.close)
+        for callback in self._closers:
+            callback()
+        self._raise_errors()
+
+    def _raise_errors(self):
+        """
+        Raises the first error not raised yet, when there is no on_error to report it.
+
+        Raises:
+            Exception: The error of the first receipt that could not be written.
+        """
+        errors = self.errors[self._raised:]
+        self._raised += len(errors)
+        if errors and self.on_error is None:
+            raise errors[0][1]
+
+    def _start(self):
+        """
+        Starts the writer thread and arranges for it to be flushed at exit.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="receipt-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        """
+        Writes queued receipts in batches until close() queues None.
+        """
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = None in batch
+            try:
+                self._write_batch([entry for entry in batch if entry is not None])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stopping:
+                return
+
+    def _write_batch(self, batch):
+        """
+        Writes a batch of receipts and makes them durable.
+
+        Args:
+            batch (list): (path, text) pairs.
+        """
+        directories = {}
+        for path, text in batch:
+            try:
+                directory = os.path.dirname(path)
+                if directory and directory not in directories:
+                    os.makedirs(directory, exist_ok=True)
+                with open(path, "w") as file:
+                    file.write(text)
+                    file.flush()
+                    os.fsync(file.fileno())
+                directories.setdefault(directory, path)
+            except Exception as error:
+                self._report(path, error)
+        for path in directories.values():
+            fsync_directory(path)
+
+    def _report(self, path, error):
+        """
+        Records a receipt that could not be written and passes it to on_error.
+
+        An error raised by on_error itself is recorded too, rather than
+        stopping the writer thread.
+
+        Args:
+            path (str): The path of the receipt.
+            error (Exception): The exception.
+        """
+        self.errors.append((path, error))
+        if self.on_error is not None:
+            try:
+                self.on_error(path, error)
+            except Exception as handler_error:
+                self.errors.append((path, handler_error))
@@ -0,0 +1,204 @@
+from classes.cart import Cart
+from classes.customer import Customer
+from classes.errors import BatchError, InsufficientQuantityError, ItemNotFoundError
+from classes.inventory_parser import paused_gc
+from classes.reservation import ACTIVE, EXPIRED
+from classes.scan_batch import ScanBatch
+
+
+class Register:
+    """
+    Represents a checkout register working against a shared store.
+
+    Stock is reserved in the store as items are added to the cart, so two
+    registers can never sell the same unit. Removing items or cancelling the
+    transaction releases the reserved stock, and checkout commits it.
+
+    Attributes:
+        store (Store): The store shared by all registers.
+        cart (Cart): The cart of the current transaction.
+        customer (Customer): The customer of the current transaction.
+        ledger (SalesLedger): The ledger checkouts are recorded in, or None.
+    """
+    def __init__(self, store, cart=None, customer=None, ledger=None):
+        """
+        Initializes a Register object.
+
+        Args:
+            store (Store): The store shared by all registers.
+            cart (Cart): The cart of the current transaction. A new cart bound
+                to the store is created when none is given.
+            customer (Customer): The customer of the current transaction. A
+                regular customer is created when none is given.
+            ledger (SalesLedger): The ledger checkouts are recorded in, or None.
+        """
+        self.store = store
+        self.cart = cart if cart is not None else Cart(store=store)
+        self.customer = customer if customer is not None else Customer(False)
+        self.ledger = ledger
+        self._reservations = {}
+
+    def add_item(self, item, quantity):
+        """
+        Reserves stock of an item and adds it to the cart.
+
+        Args:
+            item (str): The item to add.
+            quantity (int): The quantity of the item to add.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the available stock.
+        """
+        reservation = self.store.reserve(item, quantity)
+        try:
+            self.cart.add_item(item, quantity)
+        except Exception:
+            self.store.release(reservation)
+            raise
+        self._reservations.setdefault(item, []).append(reservation)
+
+    def add_scan(self, lines):
+        """
+        Adds a batch of scanned lines to the cart, all or nothing.
+
+        Every line is validated and resolved against the store first, and the
+        stock for the whole batch is then reserved atomically and every line
+        is priced in one pass. If anything is wrong, every problem is reported
+        together and nothing is added.
+
+        Args:
+            lines (iterable): The lines of a scan file, "<item>,<quantity>" each.
+
+        Returns:
+            int: The number of units added.
+
+        Raises:
+            BatchError: If any line is malformed, names an unknown item or asks
+                for more than is in stock.
+        """
+        with paused_gc():
+            batch = ScanBatch.from_lines(lines)
+            errors = list(batch.errors)
+            quantities = {}
+            scanned_names = {}
+            for name, quantity in batch.quantities.items():
+                try:
+                    item = self.store.resolve_item(name)
+                except ItemNotFoundError as error:
+                    errors.append((batch.location(name), str(error)))
+                    continue
+                quantities[item] = quantities.get(item, 0) + quantity
+                scanned_names.setdefault(item, []).append(name)
+
+            def location(item):
+                return ", ".join(map(batch.location, scanned_names[item]))
+
+            if errors:
+                for item, quantity in quantities.items():
+                    try:
+                        self.store.is_item_available(item, quantity)
+                    except InsufficientQuantityError as error:
+                        errors.append((location(item), str(error)))
+                raise BatchError(errors)
+            try:
+                reservations = self.store.reserve_many(quantities)
+            except BatchError as error:
+                raise BatchError([(location(item), reason) for item, reason in error.errors]) from None
+            try:
+                self.cart.add_items(quantities)
+            except Exception:
+                for reservation in reservations.values():
+                    self.store.release(reservation)
+                raise
+            for item, reservation in reservations.items():
+                self._reservations.setdefault(item, []).append(reservation)
+            return sum(quantities.values())
+
+    def remove_item(self, item, quantity=None):
+        """
+        Removes an item, or part of its quantity, from the cart and releases its stock.
+
+        Args:
+            item (str): The item to remove.
+            quantity (int): The quantity to remove. The whole line is removed
+                when it is omitted.
+
+        Returns:
+            int: The quantity that was removed.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the cart.
+        """
+        removed = self.cart.remove_item(item, quantity)
+        remaining = removed
+        reservations = self._reservations.get(item, [])
+        while remaining and reservations:
+            reservation = reservations[-1]
+            if reservation.state not in (ACTIVE, EXPIRED):
+                # Released by the store when a reload removed the item.
+                reservations.pop()
+                continue
+            released = min(remaining, reservation.quantity)
+            self.store.release(reservation, released)
+            remaining -= released
+            if reservation.quantity == 0:
+                reservations.pop()
+        if not reservations:
+            self._reservations.pop(item, None)
+        return removed
+
+    def clear(self):
+        """
+        Empties the cart and releases all reserved stock.
+        """
+        for reservations in self._reservations.values():
+            for reservation in reservations:
+                if reservation.state in (ACTIVE, EXPIRED):
+                    self.store.release(reservation)
+        self._reservations = {}
+        del self.cart.items
+
+    def commit(self):
+        """
+        Commits the reserved stock of the cart as sold, without saving the inventory.
+
+        The reservations are committed all or nothing, so after a failure the
+        transaction can still be cancelled or retried.
+
+        Raises:
+            InsufficientQuantityError: If a reservation expired and its stock
+                was sold meanwhile. Nothing is committed then.
+        """
+        self.store.commit_many([
+            reservation
+            for reservations in self._reservations.values()
+            for reservation in reservations
+            if reservation.state in (ACTIVE, EXPIRED)
+        ])
+        self._reservations = {}
+
+    def checkout(self, receipt):
+        """
+        Commits the reserved stock, writes the receipt, saves the inventory
+        and records the sale in the ledger.
+
+        The sale is journaled before it is recorded, so a crash in between
+        can lose a ledger record but never records a sale the inventory
+        does not show.
+
+        Args:
+            receipt (Receipt): The receipt writer.
+
+        Raises:
+            InsufficientQuantityError: If a reservation expired and its stock was sold meanwhile.
+        """
+        self.commit()
+        rewards_member = self.customer.rewards_member
+        transaction_number = receipt.next_transaction_number()
+        receipt.generate_receipt(self.cart, self.store, rewards_member, transaction_number)
+        self.store.save_inventory()
+        if self.ledger is not None:
+            lines = self.cart.calculate_total(self.store, rewards_member)
+            self.ledger.record(transaction_number, lines, rewards_member)
+        del self.cart.items
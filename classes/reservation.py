@@ -0,0 +1,52 @@
+ACTIVE = "active"
+COMMITTED = "committed"
+RELEASED = "released"
+EXPIRED = "expired"
+
+
+class Reservation:
+    """
+    Represents stock held for a cart until it is committed by a checkout or released.
+
+    Attributes:
+        id (int): The reservation number, unique within a store.
+        item (str): The reserved item.
+        quantity (int): The reserved quantity.
+        expires_at (float): The time.monotonic() deadline of the reservation, or None.
+        state (str): One of "active", "committed", "released" or "expired".
+    """
+    __slots__ = ("id", "item", "quantity", "expires_at", "state")
+
+    def __init__(self, reservation_id, item, quantity, expires_at=None):
+        """
+        Initializes a Reservation object.
+
+        Args:
+            reservation_id (int): The reservation number.
+            item (str): The reserved item.
+            quantity (int): The reserved quantity.
+            expires_at (float): The time.monotonic() deadline of the reservation, or None.
+        """
+        self.id = reservation_id
+        self.item = item
+        self.quantity = quantity
+        self.expires_at = expires_at
+        self.state = ACTIVE
+
+    def __repr__(self):
+        """
+        Returns a string representation of the reservation.
+        """
+        return f"Reservation({self.id}, {self.item!r}, {self.quantity}, {self.state})"
+
+    def is_expired(self, now):
+        """
+        Checks whether the reservation deadline has passed.
+
+        Args:
+            now (float): The current time.monotonic() value.
+
+        Returns:
+            bool: True if the reservation has a deadline before now.
+        """
+        return self.expires_at is not None and self.expires_at <= now
@@ -0,0 +1,314 @@
+import json
+import os
+import re
+from datetime import date, datetime
+
+from classes.journal import fsync_directory
+
+SEGMENT_PATTERN = re.compile(r"^segment_(\d{6})\.jsonl$")
+CHECKPOINT_FILE = "aggregates.json"
+
+
+class SalesLedger:
+    """
+    Append-only, segmented record of every line item sold.
+
+    Each checkout appends one JSON record per line item (transaction number,
+    timestamp, item, quantity, unit price, tax, member flag and any promotion
+    discount) with a single write and fsync. Segments are rolled over once
+    they reach segment_bytes.
+
+    Aggregates by day, by month and by item and day are updated as sales are
+    recorded, so reports never scan the ledger. The aggregates are
+    checkpointed together with the ledger position they cover, and opening
+    the ledger replays only the records written after the checkpoint. A
+    transaction torn by a crash is dropped as a whole.
+
+    Amounts are integer cents; "sales" excludes tax and discounts.
+
+    Attributes:
+        directory (str): The directory holding the segments and the checkpoint.
+        segment_bytes (int): The size after which a new segment is started.
+        checkpoint_every (int): Number of transactions between aggregate checkpoints.
+    """
+    def __init__(self, directory, segment_bytes=16 * 1024 * 1024, checkpoint_every=100):
+        """
+        Initializes a SalesLedger object. The ledger is opened on first use.
+
+        Args:
+            directory (str): The directory holding the segments and the checkpoint.
+            segment_bytes (int): The size after which a new segment is started.
+            checkpoint_every (int): Number of transactions between aggregate checkpoints.
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.checkpoint_every = checkpoint_every
+        self._opened = False
+        self._segment = 1
+        self._offset = 0
+        self._days = {}
+        self._months = {}
+        self._items = {}
+        self._unsaved = 0
+
+    def record(self, transaction_number, lines, rewards_member, when=None):
+        """
+        Records the line items of a checkout and updates the aggregates.
+
+        Args:
+            transaction_number (int): The transaction number.
+            lines (list): The priced LineItem records of the checkout.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+            when (datetime): The time of the checkout. Defaults to now.
+        """
+        if not lines:
+            return
+        self._open()
+        timestamp = (when or datetime.now()).isoformat(timespec="seconds")
+        records = []
+        for line in lines:
+            record = {
+                "txn": transaction_number, "ts": timestamp, "item": line.item,
+                "qty": line.quantity, "unit_price": line.unit_price, "tax": line.tax,
+                "member": bool(rewards_member), "lines": len(lines),
+            }
+            if line.discount:
+                record["discount"] = line.discount
+            records.append(record)
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode()
+        if self._offset and self._offset + len(data) > self.segment_bytes:
+            self._segment += 1
+            self._offset = 0
+        path = self._segment_path(self._segment)
+        with open(path, "ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        if self._offset == 0:
+            fsync_directory(path)
+        self._offset += len(data)
+        self._apply(records)
+        self._unsaved += 1
+        if self._unsaved >= self.checkpoint_every:
+            self.checkpoint()
+
+    def units_sold(self, item, day=None):
+        """
+        Returns the units of an item sold on a day.
+
+        Args:
+            item (str): The item.
+            day (date): The day. Defaults to today.
+
+        Returns:
+            int: The units sold.
+        """
+        self._open()
+        day = (day or date.today()).isoformat()
+        return self._items.get(item, {}).get(day, [0, 0])[0]
+
+    def item_totals(self, item, start=None, end=None):
+        """
+        Returns the units and sales of an item over a range of days.
+
+        Args:
+            item (str): The item.
+            start (date): The first day, inclusive. Defaults to the first sale.
+            end (date): The last day, inclusive. Defaults to the last sale.
+
+        Returns:
+            tuple: The units sold and the sales in cents.
+        """
+        self._open()
+        units = sales = 0
+        for day, (day_units, day_sales) in self._items.get(item, {}).items():
+            if self._in_range(day, start, end):
+                units += day_units
+                sales += day_sales
+        return units, sales
+
+    def day_totals(self, day=None):
+        """
+        Returns the totals of one day.
+
+        Args:
+            day (date): The day. Defaults to today.
+
+        Returns:
+            dict: The units, sales, tax and transactions of the day.
+        """
+        self._open()
+        return self._totals(self._days.get((day or date.today()).isoformat()))
+
+    def month_totals(self, year, month):
+        """
+        Returns the totals of one month.
+
+        Args:
+            year (int): The year.
+            month (int): The month, 1 to 12.
+
+        Returns:
+            dict: The units, sales, tax and transactions of the month.
+        """
+        self._open()
+        return self._totals(self._months.get(f"{year:04d}-{month:02d}"))
+
+    def totals(self, start=None, end=None):
+        """
+        Returns the totals over a range of days.
+
+        Args:
+            start (date): The first day, inclusive. Defaults to the first sale.
+            end (date): The last day, inclusive. Defaults to the last sale.
+
+        Returns:
+            dict: The units, sales, tax and transactions of the range.
+        """
+        self._open()
+        summed = [0, 0, 0, 0]
+        for day, values in self._days.items():
+            if self._in_range(day, start, end):
+                for index, value in enumerate(values):
+                    summed[index] += value
+        return self._totals(summed)
+
+    def checkpoint(self):
+        """
+        Durably saves the aggregates and the ledger position they cover.
+        """
+        if not self._opened:
+            return
+        state = {
+            "segment": self._segment, "offset": self._offset,
+            "days": self._days, "months": self._months, "items": self._items,
+        }
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        temp_file = path + ".tmp"
+        with open(temp_file, "w") as file:
+            json.dump(state, file, separators=(",", ":"))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_file, path)
+        fsync_directory(path)
+        self._unsaved = 0
+
+    def close(self):
+        """
+        Checkpoints the aggregates if there are unsaved transactions.
+        """
+        if self._unsaved:
+            self.checkpoint()
+
+    def _open(self):
+        """
+        Loads the checkpoint and replays the records written after it.
+        """
+        if self._opened:
+            return
+        self._opened = True
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(os.path.join(self.directory, CHECKPOINT_FILE)) as file:
+                state = json.load(file)
+        except (FileNotFoundError, ValueError):
+            state = {}
+        self._segment = state.get("segment", 1)
+        self._offset = state.get("offset", 0)
+        self._days = state.get("days", {})
+        self._months = state.get("months", {})
+        self._items = state.get("items", {})
+        segments = sorted(
+            int(match.group(1)) for match in map(SEGMENT_PATTERN.match, os.listdir(self.directory))
+            if match
+        )
+        for segment in segments:
+            if segment < self._segment:
+                continue
+            offset = self._offset if segment == self._segment else 0
+            self._segment = segment
+            self._offset = self._replay_segment(segment, offset)
+
+    def _replay_segment(self, segment, offset):
+        """
+        Applies the complete transactions of a segment from an offset on,
+        truncating a torn transaction at its end.
+
+        Args:
+            segment (int): The segment number.
+            offset (int): The byte offset to start from.
+
+        Returns:
+            int: The offset of the end of the last complete transaction.
+        """
+        path = self._segment_path(segment)
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+        good_end = offset
+        position = offset
+        pending = []
+        for raw in data.split(b"\n")[:-1]:
+            position += len(raw) + 1
+            try:
+                record = json.loads(raw)
+            except ValueError:
+                break
+            pending.append(record)
+            if len(pending) == record["lines"]:
+                self._apply(pending)
+                self._unsaved += 1
+                pending = []
+                good_end = position
+        if good_end != offset + len(data):
+            with open(path, "r+b") as file:
+                file.truncate(good_end)
+                file.flush()
+                os.fsync(file.fileno())
+        return good_end
+
+    def _apply(self, records):
+        """
+        Adds the records of one transaction to the aggregates.
+
+        Args:
+            records (list): The ledger records of one transaction.
+        """
+        day = records[0]["ts"][:10]
+        for key, table in ((day, self._days), (day[:7], self._months)):
+            values = table.get(key)
+            if values is None:
+                values = table[key] = [0, 0, 0, 0]
+            values[3] += 1
+            for record in records:
+                values[0] += record["qty"]
+                values[1] += record["qty"] * record["unit_price"] - record.get("discount", 0)
+                values[2] += record["tax"]
+        for record in records:
+            item_days = self._items.get(record["item"])
+            if item_days is None:
+                item_days = self._items[record["item"]] = {}
+            values = item_days.get(day)
+            if values is None:
+                values = item_days[day] = [0, 0]
+            values[0] += record["qty"]
+            values[1] += record["qty"] * record["unit_price"] - record.get("discount", 0)
+
+    def _segment_path(self, segment):
+        """
+        Returns the path of a segment file.
+        """
+        return os.path.join(self.directory, f"segment_{segment:06d}.jsonl")
+
+    def _in_range(self, day, start, end):
+        """
+        Checks whether an ISO day lies within an optional inclusive range.
+        """
+        return (start is None or day >= start.isoformat()) and (end is None or day <= end.isoformat())
+
+    def _totals(self, values):
+        """
+        Names the fields of an aggregate.
+        """
+        units, sales, tax, transactions = values or (0, 0, 0, 0)
+        return {"units": units, "sales": sales, "tax": tax, "transactions": transactions}
@@ -0,0 +1,69 @@
+class ScanBatch:
+    """
+    A batch of scanned cart lines, read from a scan file or a pipe.
+
+    Each line is "<item>,<quantity>", or just "<item>" for a single unit, as
+    scanners emit one code per scan. Blank lines and lines starting with '#'
+    are ignored. Repeated items are merged.
+
+    Attributes:
+        quantities (dict): A dictionary mapping the scanned names to their total quantity.
+        line_numbers (dict): A dictionary mapping the scanned names to the
+            numbers of the lines they appear on.
+        errors (list): (location, reason) tuples for the malformed lines.
+    """
+    def __init__(self):
+        """
+        Initializes an empty ScanBatch object.
+        """
+        self.quantities = {}
+        self.line_numbers = {}
+        self.errors = []
+
+    @classmethod
+    def from_lines(cls, lines):
+        """
+        Parses scan lines.
+
+        Args:
+            lines (iterable): The lines of the scan file.
+
+        Returns:
+            ScanBatch: The parsed batch, with malformed lines recorded in errors.
+        """
+        batch = cls()
+        quantities = batch.quantities
+        line_numbers = batch.line_numbers
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, separator, quantity = line.rpartition(",")
+            if not separator:
+                name, quantity = line, "1"
+            name = name.strip()
+            quantity = quantity.strip()
+            if not name:
+                batch.errors.append((f"Line {line_number}", "missing item"))
+                continue
+            if not quantity.isdecimal() or int(quantity) == 0:
+                batch.errors.append((f"Line {line_number}", f"invalid quantity {quantity!r}"))
+                continue
+            quantities[name] = quantities.get(name, 0) + int(quantity)
+            line_numbers.setdefault(name, []).append(line_number)
+        return batch
+
+    def location(self, name):
+        """
+        Describes where a scanned name appears, for error messages.
+
+        Args:
+            name (str): The scanned name.
+
+        Returns:
+            str: The line numbers of the name.
+        """
+        numbers = self.line_numbers.get(name, [])
+        label = "Line" if len(numbers) == 1 else "Lines"
+        shown = ", ".join(map(str, numbers[:5])) + (", ..." if len(numbers) > 5 else "")
+        return f"{label} {shown} ({name})"
@@ -0,0 +1,175 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+from classes.columnar_store import ColumnarStore
+from classes.errors import ReloadError
+from classes.store import LOCK_STRIPES
+
+# The int64 columns kept in the shared memory block, followed by the uint8 tax codes.
+SHARED_COLUMNS = ("_quantities", "_regular_cents", "_member_cents")
+
+
+class SharedMemoryStore(ColumnarStore):
+    """
+    Columnar store whose quantities and prices live in a shared memory block,
+    so that register processes sell from one inventory.
+
+    The store is loaded once by its owner, which copies the quantity, price and
+    tax code columns into the block. Handing the store to a worker process
+    attaches the worker to the same block; only the item names and their row
+    index are copied. The stripe locks are process-shared locks picked by row,
+    so a check-and-decrement is atomic across processes.
+
+    Every process sees a sale in the block at once, and journals it itself
+    when it saves the inventory. The journal is shared, and appends from
+    different processes are serialized by a process-shared save lock, so a
+    crash of any process loses no sale that was saved. Only the owner
+    compacts, when it is told to or closes the store.
+
+    Attributes:
+        inventory_file (str): The path to the inventory file.
+    """
+    def __init__(self, inventory_file, skip_invalid_lines=False, use_snapshot=False,
+                 reservation_timeout=None):
+        """
+        Initializes a SharedMemoryStore object, loading the inventory file into
+        a new shared memory block.
+
+        Args:
+            inventory_file (str): The path to the inventory file.
+            skip_invalid_lines (bool): Whether malformed inventory lines are
+                skipped and recorded in load_errors instead of raising.
+            use_snapshot (bool): Whether a binary snapshot of the parsed
+                inventory is kept next to the inventory file and loaded
+                instead of parsing when it is current.
+            reservation_timeout (float): Seconds after which an uncommitted
+                reservation returns its stock, or None to hold it until released.
+        """
+        super().__init__(
+            inventory_file, skip_invalid_lines=skip_invalid_lines, use_snapshot=use_snapshot,
+            reservation_timeout=reservation_timeout,
+        )
+        self._owner_pid = os.getpid()
+        rows = len(self._names)
+        self._shared = shared_memory.SharedMemory(create=True, size=max(rows * 25, 1))
+        columns = [getattr(self, name) for name in SHARED_COLUMNS] + [self._tax_codes]
+        self._attach()
+        for name, column in zip(SHARED_COLUMNS + ("_tax_codes",), columns):
+            getattr(self, name)[:] = column
+
+    @property
+    def owner(self):
+        """
+        Whether this is the process that created the block and persists the
+        inventory, rather than a worker forked or spawned from it.
+        """
+        return os.getpid() == self._owner_pid
+
+    def _init_reservations(self, reservation_timeout):
+        """
+        Sets up the reservation bookkeeping with process-shared stripe locks.
+
+        Args:
+            reservation_timeout (float): Seconds after which an uncommitted
+                reservation returns its stock, or None to hold it until released.
+        """
+        super()._init_reservations(reservation_timeout)
+        self._stripes = [multiprocessing.Lock() for _ in range(LOCK_STRIPES)]
+        self._save_lock = multiprocessing.Lock()
+        self._compact_lock = multiprocessing.Lock()
+
+    def _attach(self):
+        """
+        Points the quantity, price and tax code columns at the shared block.
+        """
+        rows = len(self._names)
+        buffer = self._shared.buf
+        for number, name in enumerate(SHARED_COLUMNS):
+            setattr(self, name, buffer[number * rows * 8:(number + 1) * rows * 8].cast("q"))
+        self._tax_codes = buffer[24 * rows:25 * rows]
+
+    def _stripe_index(self, item):
+        """
+        Returns the index of the lock guarding the stock of the given item.
+
+        The row is used instead of the item's hash, which differs between processes.
+
+        Args:
+            item (str): The item to lock.
+
+        Returns:
+            int: The index of the item's stripe lock.
+        """
+        return self._index.get(item, 0) % LOCK_STRIPES
+
+    def __getstate__(self):
+        """
+        Returns the state sent to a worker process: everything but the views
+        of the block, the local caches and the sales not saved yet.
+        """
+        state = self.__dict__.copy()
+        for name in SHARED_COLUMNS + ("_tax_codes", "_snapshot_cache", "_lookup", "_stock_index"):
+            del state[name]
+        state["_pending"] = {}
+        return state
+
+    def __setstate__(self, state):
+        """
+        Attaches a worker process to the shared block.
+        """
+        self.__dict__.update(state)
+        self._snapshot_cache = None
+        self._lookup = None
+        self._stock_index = None
+        self._attach()
+
+    def reload_inventory(self):
+        """
+        Not supported: the shared block cannot grow, and the workers hold
+        their own copy of the item index.
+
+        Raises:
+            ReloadError: Always.
+        """
+        raise ReloadError("A shared memory store cannot reload its inventory file.")
+
+    def save_inventory(self):
+        """
+        Journals the sales this process made since its last save.
+
+        The journal is never compacted here, since the stock held and the
+        sales not yet saved by other processes are not known to this one.
+        """
+        with self._save_lock:
+            if self._pending:
+                self._journal.append(self._pending)
+                self._pending = {}
+
+    def compact_inventory(self):
+        """
+        Rewrites the inventory file with the shared quantities and empties
+        the journal, in the owner only.
+
+        Must only be called while no other process holds stock or has
+        unsaved sales, as between the runs of a RegisterPool.
+        """
+        if self.owner:
+            super().compact_inventory()
+
+    def close(self):
+        """
+        Journals the unsaved sales and detaches from the shared block. The
+        owner also writes the inventory file and then frees the block.
+        """
+        if self._shared is None:
+            return
+        self.save_inventory()
+        if self.owner:
+            self.compact_inventory()
+        for name in SHARED_COLUMNS + ("_tax_codes",):
+            getattr(self, name).release()
+        self._shared.close()
+        if self.owner:
+            self._shared.unlink()
+        self._shared = None
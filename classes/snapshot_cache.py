@@ -0,0 +1,140 @@
+import os
+import struct
+import sys
+from array import array
+
+from classes.journal import content_digest, fsync_directory
+
+MAGIC = b"JQMSNAP\0"
+VERSION = 1
+# magic, version, byte order, text mtime (ns), text size, text digest,
+# item count, names blob length, tax statuses blob length
+HEADER = struct.Struct("=8sHBxqq16sqqq")
+BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+
+class SnapshotCache:
+    """
+    Binary, versioned snapshot of a parsed inventory file.
+
+    The snapshot stores the parsed columns next to the text file, together with
+    the text file's modification time, size and digest. A snapshot is used only
+    when it still describes the text file; otherwise the caller parses the text
+    file and writes a fresh snapshot.
+
+    The snapshot is read into memory in one call and its numeric columns are
+    copied into arrays with a single memcpy each, since the store updates
+    them in place. It is a binary cache, not a memory-mapped store.
+
+    Attributes:
+        file (str): The path to the snapshot file.
+    """
+    def __init__(self, snapshot_file):
+        """
+        Initializes a SnapshotCache object.
+
+        Args:
+            snapshot_file (str): The path to the snapshot file.
+        """
+        self.file = snapshot_file
+
+    def load(self, inventory_file):
+        """
+        Loads the snapshot of the given inventory file if it is still current.
+
+        The modification time and size are checked first. If only the
+        modification time differs the text file is hashed, so that touching
+        the file does not invalidate the snapshot.
+
+        Args:
+            inventory_file (str): The path to the inventory text file.
+
+        Returns:
+            tuple: The digest of the text file and the parsed columns, or None
+                if there is no usable snapshot.
+        """
+        try:
+            with open(self.file, "rb") as file:
+                snapshot = file.read()
+        except FileNotFoundError:
+            return None
+        if len(snapshot) < HEADER.size:
+            return None
+        (magic, version, byte_order, mtime_ns, size, digest,
+         count, names_length, statuses_length) = HEADER.unpack_from(snapshot)
+        if magic != MAGIC or version != VERSION or byte_order != BYTE_ORDER:
+            return None
+        if len(snapshot) != HEADER.size + 25 * count + names_length + statuses_length:
+            return None
+        stat = os.stat(inventory_file)
+        if stat.st_size != size:
+            return None
+        if stat.st_mtime_ns != mtime_ns:
+            with open(inventory_file, "rb") as text_file:
+                if content_digest(text_file.read()) != digest.hex():
+                    return None
+        return digest.hex(), self._read_columns(memoryview(snapshot), count, names_length)
+
+    def _read_columns(self, snapshot, count, names_length):
+        """
+        Reads the inventory columns out of a snapshot.
+
+        Args:
+            snapshot (memoryview): The contents of the snapshot file.
+            count (int): The number of items.
+            names_length (int): The length of the item names blob.
+
+        Returns:
+            tuple: Item names, quantities, regular prices in cents, member
+                prices in cents and tax statuses.
+        """
+        offset = HEADER.size
+        numbers = []
+        for _ in range(3):
+            column = array("q")
+            column.frombytes(snapshot[offset:offset + 8 * count])
+            numbers.append(column)
+            offset += 8 * count
+        codes = snapshot[offset:offset + count]
+        offset += count
+        names = str(snapshot[offset:offset + names_length], "utf-8").split("\n") if count else []
+        offset += names_length
+        statuses = str(snapshot[offset:], "utf-8").split("\n")
+        tax_statuses = list(map(statuses.__getitem__, codes))
+        quantities, regular_cents, member_cents = numbers
+        return names, quantities, regular_cents, member_cents, tax_statuses
+
+    def write(self, inventory_stat, digest, columns):
+        """
+        Writes a snapshot of the given columns.
+
+        Args:
+            inventory_stat (os.stat_result): The stat of the text file the columns were parsed from.
+            digest (str): The digest of the text file.
+            columns (tuple): Item names, quantities, regular prices in cents,
+                member prices in cents and tax statuses.
+        """
+        names, quantities, regular_cents, member_cents, tax_statuses = columns
+        statuses = sorted(set(tax_statuses))
+        if len(statuses) > 256:
+            return
+        codes = {status: code for code, status in enumerate(statuses)}
+        names_blob = "\n".join(names).encode()
+        statuses_blob = "\n".join(statuses).encode()
+        header = HEADER.pack(
+            MAGIC, VERSION, BYTE_ORDER, inventory_stat.st_mtime_ns,
+            inventory_stat.st_size, bytes.fromhex(digest), len(names),
+            len(names_blob), len(statuses_blob),
+        )
+        temp_file = self.file + ".tmp"
+        with open(temp_file, "wb") as file:
+            file.write(header)
+            for column in (quantities, regular_cents, member_cents):
+                file.write(array("q", column).tobytes())
+            file.write(bytes(map(codes.__getitem__, tax_statuses)))
+            file.write(names_blob)
+            file.write(statuses_blob)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_file, self.file)
+        fsync_directory(self.file)
@@ -0,0 +1,431 @@
+import os
+
+from classes.connection_pool import ConnectionPool
+from classes.errors import InsufficientQuantityError, ItemNotFoundError, ReloadError
+from classes.store import Store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventory (
+    item TEXT NOT NULL UNIQUE,
+    quantity INTEGER NOT NULL,
+    regular_cents INTEGER NOT NULL,
+    member_cents INTEGER NOT NULL,
+    tax_status TEXT NOT NULL
+)
+"""
+UPSERT = (
+    "INSERT INTO inventory (item, quantity, regular_cents, member_cents, tax_status) "
+    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (item) DO UPDATE SET quantity = excluded.quantity, "
+    "regular_cents = excluded.regular_cents, member_cents = excluded.member_cents, "
+    "tax_status = excluded.tax_status"
+)
+# Stock held by the reservations of each process, by item.
+HOLDS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS holds (
+    item TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    UNIQUE (item, pid)
+)
+"""
+AVAILABLE = "quantity - (SELECT COALESCE(SUM(holds.quantity), 0) FROM holds WHERE holds.item = inventory.item)"
+HOLD = (
+    f"INSERT INTO holds (item, pid, quantity) SELECT item, ?, ? FROM inventory WHERE item = ? AND {AVAILABLE} >= ? "
+    "ON CONFLICT (item, pid) DO UPDATE SET quantity = quantity + excluded.quantity"
+)
+UNHOLD = "UPDATE holds SET quantity = quantity - ? WHERE item = ? AND pid = ?"
+TAKE = f"UPDATE inventory SET quantity = quantity - ? WHERE item = ? AND {AVAILABLE} >= ?"
+ADJUST = "UPDATE inventory SET quantity = quantity + ? WHERE item = ?"
+SELECT_ROW = f"SELECT {AVAILABLE}, regular_cents, member_cents, tax_status FROM inventory WHERE item = ?"
+SELECT_ALL = f"SELECT item, {AVAILABLE}, regular_cents, member_cents, tax_status FROM inventory ORDER BY rowid"
+
+
+def _process_is_running(pid):
+    """
+    Checks whether a process is running, on POSIX systems.
+
+    Args:
+        pid (int): The process id.
+
+    Returns:
+        bool: False if the process is known to be gone, True otherwise.
+    """
+    if os.name != "posix":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SQLiteStore(Store):
+    """
+    Store backend on a local SQLite database in WAL mode.
+
+    The database is the inventory: nothing is loaded into memory, several
+    processes can share it, and every sale is committed as it happens.
+    Reservations only hold stock in a holds table, by process; the stock is
+    taken from the inventory when the sale is committed, together with the
+    hold. Holding and taking are single conditional statements against the
+    stock not held, so the availability check is atomic even across
+    processes. The holds of processes that are no longer running are
+    dropped when a store is opened, so a crash never loses stock. Commits
+    use synchronous=NORMAL, which survives a crash of the process but may
+    lose the last transactions on power loss.
+
+    Attributes:
+        file (str): The path to the SQLite database.
+        reservation_timeout (float): Seconds after which an uncommitted
+            reservation returns its stock, or None to hold it until released.
+    """
+    def __init__(self, database_file, inventory_file=None, pool_size=4, reservation_timeout=None):
+        """
+        Initializes a SQLiteStore object, creating the database if needed.
+
+        Args:
+            database_file (str): The path to the SQLite database.
+            inventory_file (str): An inventory text file imported when the
+                database is empty.
+            pool_size (int): The maximum number of open connections.
+            reservation_timeout (float): Seconds after which an uncommitted
+                reservation returns its stock, or None to hold it until released.
+        """
+        self._init_reservations(reservation_timeout)
+        self.file = database_file
+        self.load_errors = []
+        self.version = 0
+        self._lookup = None
+        self._categories = None
+        self._stock_index = None
+        self._pool = ConnectionPool(database_file, pool_size)
+        with self._pool.connection() as connection:
+            connection.execute(SCHEMA)
+            connection.execute(HOLDS_SCHEMA)
+            empty = connection.execute("SELECT 1 FROM inventory LIMIT 1").fetchone() is None
+            pids = [pid for pid, in connection.execute("SELECT DISTINCT pid FROM holds")]
+            connection.executemany(
+                "DELETE FROM holds WHERE pid = ?",
+                [(pid,) for pid in pids if not _process_is_running(pid)],
+            )
+        if inventory_file is not None and empty:
+            self.import_inventory(inventory_file)
+
+    def import_inventory(self, inventory_file, skip_invalid_lines=False):
+        """
+        Imports an inventory text file, including its journal, in one transaction.
+
+        Items already in the database are overwritten.
+
+        Args:
+            inventory_file (str): The path to the inventory file.
+            skip_invalid_lines (bool): Whether malformed lines are skipped and
+                recorded in load_errors instead of raising.
+
+        Raises:
+            InventoryFormatError: If a line is malformed and skip_invalid_lines is False.
+        """
+        source = Store(inventory_file, skip_invalid_lines=skip_invalid_lines)
+        with self._pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.executemany(UPSERT, source._iter_rows())
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        self.load_errors = source.load_errors
+        self._lookup = None
+        self._categories = None
+
+    def close(self):
+        """
+        Drops the emptied holds of this process and closes the database connections.
+        """
+        with self._pool.connection() as connection:
+            connection.execute("DELETE FROM holds WHERE pid = ? AND quantity <= 0", (os.getpid(),))
+        self._pool.close()
+
+    def _row(self, item):
+        """
+        Reads the row of an item.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            tuple: The quantity not held, regular price in cents, member price in
+                cents and tax status.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        with self._pool.connection() as connection:
+            row = connection.execute(SELECT_ROW, (item,)).fetchone()
+        if row is None:
+            raise ItemNotFoundError(f"{item} not found in the inventory.")
+        return row
+
+    def _iter_rows(self):
+        """
+        Iterates over the inventory rows.
+
+        Yields:
+            tuple: An (item, quantity, regular_cents, member_cents, tax_status)
+                tuple, where the quantity is the stock not held.
+        """
+        with self._pool.connection() as connection:
+            rows = connection.execute(SELECT_ALL).fetchall()
+        return iter(rows)
+
+    def _has_item(self, item):
+        """
+        Checks whether the given item is in the inventory.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            bool: True if the item is in the inventory, False otherwise.
+        """
+        with self._pool.connection() as connection:
+            return connection.execute("SELECT 1 FROM inventory WHERE item = ?", (item,)).fetchone() is not None
+
+    def _adjust_quantity(self, item, delta):
+        """
+        Adds a delta to the quantity of the given item.
+
+        Args:
+            item (str): The item to adjust.
+            delta (int): The quantity to add (negative to subtract).
+        """
+        with self._pool.connection() as connection:
+            connection.execute(ADJUST, (delta, item))
+
+    def _stock(self, item):
+        """
+        Reads the quantity of the given item.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            int: The quantity in stock, without the stock held by reservations.
+        """
+        return self._row(item)[0]
+
+    def _take(self, item, quantity):
+        """
+        Holds a quantity of an item for a reservation if it is in stock, in
+        one statement.
+
+        Args:
+            item (str): The item to hold.
+            quantity (int): The quantity to hold.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the available stock.
+        """
+        with self._pool.connection() as connection:
+            held = connection.execute(HOLD, (os.getpid(), quantity, item, quantity)).rowcount
+        if held:
+            self._stock_changed(item)
+            return
+        self._row(item)
+        raise InsufficientQuantityError("Insufficient quantity available for the item.")
+
+    def _take_many(self, quantities):
+        """
+        Holds the quantities of several items in one transaction, which is
+        rolled back if any item is unknown or short of stock.
+
+        Args:
+            quantities (dict): A dictionary mapping items to the quantities to hold.
+
+        Returns:
+            list: (item, reason) tuples for the items that could not be held.
+                Nothing was held if the list is not empty.
+        """
+        failures = []
+        pid = os.getpid()
+        with self._pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for item, quantity in quantities.items():
+                    if connection.execute(HOLD, (pid, quantity, item, quantity)).rowcount:
+                        continue
+                    if connection.execute(SELECT_ROW, (item,)).fetchone() is None:
+                        failures.append((item, f"{item} not found in the inventory."))
+                    else:
+                        failures.append((item, "Insufficient quantity available for the item."))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("ROLLBACK" if failures else "COMMIT")
+        if not failures:
+            for item in quantities:
+                self._stock_changed(item)
+        return failures
+
+    def _return(self, item, quantity):
+        """
+        Drops part of this process's hold on an item.
+
+        Args:
+            item (str): The item whose stock is returned.
+            quantity (int): The quantity to return.
+        """
+        with self._pool.connection() as connection:
+            connection.execute(UNHOLD, (quantity, item, os.getpid()))
+
+    def _record_sale(self, item, quantity):
+        """
+        Takes the stock of a committed reservation from the inventory and
+        drops its hold, in one transaction.
+
+        Args:
+            item (str): The item sold.
+            quantity (int): The quantity sold.
+        """
+        with self._pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(ADJUST, (-quantity, item))
+                connection.execute(UNHOLD, (quantity, item, os.getpid()))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def update_inventory(self, item, quantity):
+        """
+        Atomically checks and reduces the quantity of the given item.
+
+        Args:
+            item (str): The item to update.
+            quantity (int): The quantity to subtract from the current inventory.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the available stock.
+        """
+        self._check_quantity(quantity)
+        with self._pool.connection() as connection:
+            taken = connection.execute(TAKE, (quantity, item, quantity)).rowcount
+        if taken:
+            self._stock_changed(item)
+            return
+        self._row(item)
+        raise InsufficientQuantityError("Insufficient quantity available for the item.")
+
+    def save_inventory(self):
+        """
+        Does nothing: every change is committed to the database as it happens.
+        """
+
+    def reload_inventory(self):
+        """
+        Not supported: the database is the inventory, so there is no file to
+        reload and changes made to the database are seen as soon as they are
+        committed. Use import_inventory to apply an inventory file.
+
+        Raises:
+            ReloadError: Always.
+        """
+        raise ReloadError("A SQLite store has no inventory file to reload; use import_inventory.")
+
+    def compact_inventory(self):
+        """
+        Folds the write-ahead log back into the database file.
+        """
+        with self._pool.connection() as connection:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def get_item_price(self, item, rewards_member):
+        """
+        Retrieves the price of the given item.
+
+        Args:
+            item (str): The item to retrieve the price for.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            float: The price of the item.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        _, regular, member, _ = self._row(item)
+        return (member if rewards_member else regular) / 100
+
+    def get_item_pricing(self, item, rewards_member):
+        """
+        Retrieves the price and tax status of the given item in a single lookup.
+
+        Args:
+            item (str): The item to look up.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            tuple: The price in cents and whether the item is taxable.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        _, regular, member, tax_status = self._row(item)
+        return (member if rewards_member else regular), tax_status == "Taxable"
+
+    def get_item_prices(self, item):
+        """
+        Retrieves both prices and the tax status of the given item in a single lookup.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            tuple: The regular price in cents, the member price in cents and
+                whether the item is taxable.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        _, regular, member, tax_status = self._row(item)
+        return regular, member, tax_status == "Taxable"
+
+    def get_item_tax_status(self, item):
+        """
+        Retrieves the tax status of the given item.
+
+        Args:
+            item (str): The item to retrieve the tax status for.
+
+        Returns:
+            str: The tax status of the item.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        return self._row(item)[3]
+
+    def is_item_available(self, item, quantity):
+        """
+        Checks whether the given quantity of an item is in stock.
+
+        Args:
+            item (str): The item to check.
+            quantity (int): The quantity requested.
+
+        Returns:
+            bool: True if the quantity is available.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the stock.
+        """
+        if self._row(item)[0] >= quantity:
+            return True
+        raise InsufficientQuantityError("Insufficient quantity available for the item.")
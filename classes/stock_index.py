@@ -0,0 +1,197 @@
+import heapq
+import itertools
+import threading
+
+
+class StockIndex:
+    """
+    Index of stock levels for finding low-stock items without scanning the inventory.
+
+    Stock levels are kept in a min-heap of (quantity, sequence, item) entries.
+    A change pushes a new entry in O(log n) and leaves the old one in place;
+    an entry is stale when its sequence is no longer the item's latest, and
+    stale entries are skipped by queries and dropped when the heap is rebuilt
+    at twice the number of items. The items below their reorder threshold are
+    kept in a set as levels change, so reporting them never looks at the
+    others.
+
+    Attributes:
+        default_threshold (int): The reorder threshold of items without their own.
+        on_low_stock (callable): Called with the item, its quantity and its
+            threshold when an item falls below its threshold, or None.
+    """
+    def __init__(self, levels=(), thresholds=None, default_threshold=0, on_low_stock=None):
+        """
+        Initializes a StockIndex object.
+
+        Args:
+            levels (iterable): The initial (item, quantity) pairs.
+            thresholds (dict): A dictionary mapping items to their reorder threshold.
+            default_threshold (int): The reorder threshold of items without their own.
+            on_low_stock (callable): Called with the item, its quantity and its
+                threshold when an item falls below its threshold, or None.
+        """
+        self.default_threshold = default_threshold
+        self.on_low_stock = on_low_stock
+        self._thresholds = dict(thresholds or {})
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._levels = {}
+        self._latest = {}
+        self._low = set()
+        for item, quantity in levels:
+            self._levels[item] = quantity
+            if quantity < self._thresholds.get(item, default_threshold):
+                self._low.add(item)
+        self._rebuild()
+
+    def __len__(self):
+        """
+        Returns the number of items in the index.
+        """
+        return len(self._levels)
+
+    def threshold(self, item):
+        """
+        Returns the reorder threshold of an item.
+
+        Args:
+            item (str): The item.
+
+        Returns:
+            int: The threshold; the item is low on stock below it.
+        """
+        return self._thresholds.get(item, self.default_threshold)
+
+    def set_threshold(self, item, threshold):
+        """
+        Sets the reorder threshold of an item.
+
+        Args:
+            item (str): The item.
+            threshold (int): The new threshold, or None for the default threshold.
+        """
+        with self._lock:
+            if threshold is None:
+                self._thresholds.pop(item, None)
+            else:
+                self._thresholds[item] = threshold
+            quantity = self._levels.get(item)
+            crossed = quantity is not None and self._classify(item, quantity)
+        if crossed:
+            self.on_low_stock(item, quantity, self.threshold(item))
+
+    def update(self, item, quantity):
+        """
+        Records the stock level of an item, reporting it if it fell below its threshold.
+
+        Args:
+            item (str): The item.
+            quantity (int): Its quantity in stock.
+        """
+        with self._lock:
+            if self._levels.get(item) == quantity:
+                return
+            self._levels[item] = quantity
+            sequence = next(self._sequence)
+            self._latest[item] = sequence
+            heapq.heappush(self._heap, (quantity, sequence, item))
+            if len(self._heap) > 2 * len(self._levels) + 64:
+                self._rebuild()
+            crossed = self._classify(item, quantity)
+        if crossed:
+            self.on_low_stock(item, quantity, self.threshold(item))
+
+    def discard(self, item):
+        """
+        Removes an item from the index.
+
+        Args:
+            item (str): The item.
+        """
+        with self._lock:
+            if self._levels.pop(item, None) is not None:
+                del self._latest[item]
+                self._low.discard(item)
+
+    def quantity(self, item):
+        """
+        Returns the indexed stock level of an item.
+
+        Args:
+            item (str): The item.
+
+        Returns:
+            int: The quantity in stock, or None if the item is not indexed.
+        """
+        return self._levels.get(item)
+
+    def lowest(self, k):
+        """
+        Returns the k items with the least stock.
+
+        The heap is walked best-first from its root, so only the k smallest
+        entries, their children and the stale entries among them are looked at.
+
+        Args:
+            k (int): The number of items.
+
+        Returns:
+            list: (item, quantity) tuples, lowest stock first.
+        """
+        result = []
+        with self._lock:
+            heap = self._heap
+            latest = self._latest
+            frontier = [(heap[0], 0)] if heap else []
+            while frontier and len(result) < k:
+                (quantity, sequence, item), position = heapq.heappop(frontier)
+                if latest.get(item) == sequence:
+                    result.append((item, quantity))
+                for child in (2 * position + 1, 2 * position + 2):
+                    if child < len(heap):
+                        heapq.heappush(frontier, (heap[child], child))
+        return result
+
+    def below_threshold(self):
+        """
+        Returns the items below their reorder threshold.
+
+        Returns:
+            list: (item, quantity, threshold) tuples, lowest stock first.
+        """
+        with self._lock:
+            rows = [(item, self._levels[item], self.threshold(item)) for item in self._low]
+        rows.sort(key=lambda row: (row[1], row[0]))
+        return rows
+
+    def _classify(self, item, quantity):
+        """
+        Updates whether an item is below its threshold.
+
+        Must be called with the index lock held.
+
+        Returns:
+            bool: True if the item just fell below its threshold and there is
+                a callback to report it to.
+        """
+        if quantity < self._thresholds.get(item, self.default_threshold):
+            if item in self._low:
+                return False
+            self._low.add(item)
+            return self.on_low_stock is not None
+        self._low.discard(item)
+        return False
+
+    def _rebuild(self):
+        """
+        Rebuilds the heap from the current levels, dropping stale entries.
+        """
+        self._latest = {}
+        heap = []
+        for item, quantity in self._levels.items():
+            sequence = next(self._sequence)
+            self._latest[item] = sequence
+            heap.append((quantity, sequence, item))
+        heapq.heapify(heap)
+        self._heap = heap
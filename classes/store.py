@@ -1,66 +1,614 @@
-from classes.errors import InsufficientQuantityError, ItemNotFoundError
+import itertools
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from classes.errors import BatchError, InsufficientQuantityError, ItemNotFoundError, ReservationError
+from classes.inventory_diff import InventoryReload, diff_inventory
+from classes.inventory_parser import InventoryParser, format_inventory_line, paused_gc
+from classes.item_index import ItemIndex
+from classes.journal import InventoryJournal, content_digest, fsync_directory
+from classes.reservation import COMMITTED, EXPIRED, RELEASED, Reservation
+from classes.snapshot_cache import SnapshotCache
+from classes.stock_index import StockIndex
+
+LOCK_STRIPES = 64
 
 
 class Store:
     """
     Represents a store with inventory and pricing information.
 
+    Several registers can share one store from different threads. Stock for a
+    cart is held with reserve() and either committed at checkout or released.
+    Each item is guarded by one of a fixed set of striped locks, so registers
+    working on different items rarely contend.
+
     Attributes:
         inventory_file (str): The path to the inventory file.
         inventory (dict): A dictionary containing the inventory information.
+        reservation_timeout (float): Seconds after which an uncommitted
+            reservation returns its stock, or None to hold it until released.
+        version (int): Incremented whenever reload_inventory changes items or
+            prices, so that priced carts know to reprice.
     """
-    def __init__(self, inventory_file):
+    def __init__(self, inventory_file, compact_every=100, skip_invalid_lines=False,
+                 use_snapshot=False, reservation_timeout=None):
         """
         Initializes a Store object with the given inventory file.
 
         Args:
             inventory_file (str): The path to the inventory file.
+            compact_every (int): Number of journaled checkouts after which the
+                inventory file is rewritten and the journal emptied.
+            skip_invalid_lines (bool): Whether malformed inventory lines are
+                skipped and recorded in load_errors instead of raising.
+            use_snapshot (bool): Whether a binary snapshot of the parsed
+                inventory is kept next to the inventory file and loaded
+                instead of parsing when it is current.
+            reservation_timeout (float): Seconds after which an uncommitted
+                reservation returns its stock, or None to hold it until released.
         """
         
         self._inventory = {}
+        self._init_reservations(reservation_timeout)
+        self._lookup = None
+        self._categories = None
+        self._stock_index = None
+        self._skip_invalid_lines = skip_invalid_lines
+        self.load_errors = []
+        self._pending = {}
+        self.version = 0
+        self._file_data = None
+        self._track_file = False
         self.file = inventory_file
+        self._journal = InventoryJournal(inventory_file + ".journal", compact_every)
+        self._snapshot_cache = (
+            SnapshotCache(inventory_file + ".snapshot") if use_snapshot else None
+        )
         self._load_inventory(inventory_file)
 
+    def _init_reservations(self, reservation_timeout):
+        """
+        Sets up the locks and bookkeeping of reservations.
+
+        Args:
+            reservation_timeout (float): Seconds after which an uncommitted
+                reservation returns its stock, or None to hold it until released.
+        """
+        self.reservation_timeout = reservation_timeout
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._save_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._held = {}
+        self._reservations = {}
+        self._reservation_ids = itertools.count(1)
+
     def _load_inventory(self, inventory_file):
         """
-        Loads the inventory from the inventory file.
+        Loads the inventory from the snapshot or the inventory file and replays
+        the journal on top of it.
 
         Returns:
             dict: A dictionary containing the inventory information.
         """
-        with open(inventory_file, "r") as file:
-            for line in file:
-                (
-                    item_and_quantity,
-                    reg_price,
-                    mem_price,
-                    tax_status,
-                ) = line.strip().split(", ")
-                item, quantity = item_and_quantity.strip().split(": ")
-                self._inventory[item] = {
-                    "quantity": int(quantity),
-                    "regular_price": float(reg_price[1:]),  # Removing '$' sign
-                    "member_price": float(mem_price[1:]),  # Removing '$' sign
-                    "tax_status": tax_status,
-                }
+        snapshot = None
+        if self._snapshot_cache is not None:
+            snapshot = self._snapshot_cache.load(inventory_file)
+        with paused_gc():
+            if snapshot is not None:
+                self._snapshot_digest, columns = snapshot
+            else:
+                inventory_stat = os.stat(inventory_file)
+                with open(inventory_file, "rb") as file:
+                    data = file.read()
+                self._snapshot_digest = content_digest(data)
+                columns = self._parse_columns(data)
+                if self._snapshot_cache is not None and not self.load_errors:
+                    self._snapshot_cache.write(inventory_stat, self._snapshot_digest, columns)
+            self._build_inventory(columns)
+            self._lookup = None
+            self._categories = None
+        for deltas in self._journal.replay(self._snapshot_digest):
+            for item, delta in deltas.items():
+                if self._has_item(item):
+                    self._adjust_quantity(item, delta)
+
+    def _parse_columns(self, data):
+        """
+        Parses the raw contents of an inventory file.
+
+        Args:
+            data (bytes): The raw contents of the inventory file.
+
+        Returns:
+            tuple: Lists of item names, quantities, regular prices in cents,
+                member prices in cents and tax statuses.
+
+        Raises:
+            InventoryFormatError: If a line is malformed and skip_invalid_lines is False.
+        """
+        parser = InventoryParser(skip_errors=self._skip_invalid_lines)
+        columns = parser.parse_columns(data)
+        self.load_errors = parser.errors
+        return columns
+
+    def _build_inventory(self, columns):
+        """
+        Builds the in-memory inventory from parsed columns.
+
+        Args:
+            columns (tuple): Lists of item names, quantities, regular prices in
+                cents, member prices in cents and tax statuses.
+        """
+        for item, quantity, regular_cents, member_cents, tax_status in zip(*columns):
+            self._inventory[item] = {
+                "quantity": quantity,
+                "regular_price": regular_cents / 100,
+                "member_price": member_cents / 100,
+                "tax_status": tax_status,
+            }
+
+    def _iter_rows(self):
+        """
+        Iterates over the in-memory inventory.
+
+        Yields:
+            tuple: An (item, quantity, regular_cents, member_cents, tax_status) tuple.
+        """
+        for item, details in self._inventory.items():
+            yield (
+                item,
+                details["quantity"],
+                round(details["regular_price"] * 100),
+                round(details["member_price"] * 100),
+                details["tax_status"],
+            )
+
+    def _has_item(self, item):
+        """
+        Checks whether the given item is in the inventory.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            bool: True if the item is in the inventory, False otherwise.
+        """
+        return item in self._inventory
+
+    def _adjust_quantity(self, item, delta):
+        """
+        Adds a delta to the in-memory quantity of the given item.
+
+        Args:
+            item (str): The item to adjust.
+            delta (int): The quantity to add (negative to subtract).
+        """
+        self._inventory[item]["quantity"] += delta
+
+    def _stock(self, item):
+        """
+        Returns the in-memory quantity of the given item.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            int: The quantity in stock, without the stock held by reservations.
+        """
+        return self._inventory[item]["quantity"]
+
+    def _remove_item(self, item):
+        """
+        Removes the given item from the in-memory inventory.
+
+        Args:
+            item (str): The item to remove.
+        """
+        del self._inventory[item]
 
     def save_inventory(self):
         """
-        Saves the inventory to the inventory file.
+        Commits the inventory changes made since the last save.
+
+        The changes are appended to the journal as a single record, so the cost
+        depends on the number of items changed rather than the catalog size.
+        Once enough records accumulate the journal is compacted.
+        """
+        with self._save_lock:
+            if self._pending:
+                self._journal.append(self._pending)
+                self._pending = {}
+            needs_compaction = self._journal.needs_compaction()
+        if needs_compaction:
+            self.compact_inventory()
+
+    def compact_inventory(self):
+        """
+        Rewrites the inventory file with the current quantities and empties the journal.
+
+        The new file is written next to the old one and renamed over it, so a
+        crash leaves either the old file with its journal or the new file.
+        Stock held by open reservations and sales not yet saved are not part
+        of the committed state, so they are added back.
+
+        Only copying the committed rows holds the stripe locks and the save
+        lock; the file is written and synced after they are released, and the
+        records journaled meanwhile are kept on top of the new file. Before
+        the rename the journal names both files, so a crash at any point
+        replays every saved sale the file in place does not include.
+        """
+        with self._compact_lock:
+            with ExitStack() as stack:
+                for stripe in self._stripes:
+                    stack.enter_context(stripe)
+                stack.enter_context(self._save_lock)
+                rows = self._committed_rows()
+                journal_offset = self._journal.size()
+            data = self._write_rows(rows)
+            with self._save_lock:
+                self._install_snapshot(rows, data, journal_offset)
+
+    def _write_compacted(self):
+        """
+        Writes the committed quantities to the inventory file and resets the journal.
+
+        Must be called with the compaction lock, every stripe lock and the save lock held.
+        """
+        rows = self._committed_rows()
+        self._install_snapshot(rows, self._write_rows(rows), self._journal.size())
+
+    def _write_rows(self, rows):
+        """
+        Writes inventory rows to a synced temporary file next to the inventory file.
+
+        Must be called with the compaction lock held.
+
+        Args:
+            rows (list): (item, quantity, regular_cents, member_cents, tax_status) tuples.
 
         Returns:
-            file: A modified inventory file.
+            bytes: The contents written.
         """
+        data = "".join(format_inventory_line(*row) for row in rows).encode()
+        with open(self.file + ".tmp", "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        return data
 
-        with open(self.file, "w") as file:
-            for item, details in self._inventory.items():
-                quantity = details["quantity"]
-                regular_price = details["regular_price"]
-                member_price = details["member_price"]
-                tax_status = details["tax_status"]                
-                file.write(
-                    f"{item}: {quantity}, ${regular_price:.2f}, ${member_price:.2f}, {tax_status}\n"
-                )
+    def _install_snapshot(self, rows, data, journal_offset):
+        """
+        Renames the file written by _write_rows over the inventory file and
+        makes it the snapshot the journal applies to.
+
+        Must be called with the compaction lock and the save lock held.
+
+        Args:
+            rows (list): The rows written to the file.
+            data (bytes): The contents of the file.
+            journal_offset (int): The size of the journal when the rows were
+                copied; the records after it are kept.
+        """
+        digest = content_digest(data)
+        self._journal.begin_fold(digest, journal_offset)
+        os.replace(self.file + ".tmp", self.file)
+        fsync_directory(self.file)
+        self._journal.finish_fold()
+        self._snapshot_digest = digest
+        if self._track_file:
+            self._file_data = data
+        if self._snapshot_cache is not None:
+            columns = tuple(map(list, zip(*rows))) or ([], [], [], [], [])
+            self._snapshot_cache.write(os.stat(self.file), self._snapshot_digest, columns)
+
+    def _committed_rows(self):
+        """
+        Returns the inventory rows with the committed quantities: stock held by
+        open reservations added back, and sales not yet saved left out.
+
+        Must be called with every stripe lock and the save lock held.
+
+        Returns:
+            list: (item, quantity, regular_cents, member_cents, tax_status) tuples.
+        """
+        held = self._held
+        pending = self._pending
+        return [
+            (item, quantity + held.get(item, 0) - pending.get(item, 0), regular, member, tax_status)
+            for item, quantity, regular, member, tax_status in self._iter_rows()
+        ]
+
+    def reload_inventory(self):
+        """
+        Applies the changes made to the inventory file while the store is running.
+
+        The file is compared line by line with the version the store last
+        loaded, compacted or reloaded, and only the lines that differ are
+        parsed, before any lock is taken. A changed quantity is applied as a
+        stock adjustment on top of the sales made since, new lines add items
+        and removed lines remove them. The whole delta is then applied at once
+        under every stripe lock, so a checkout sees either the old or the new
+        inventory and waits only for the update itself.
+
+        Reservations are reconciled against the new quantities: when an item
+        has less stock left than is held, its newest reservations expire until
+        the stock covers the rest, and the reservations of removed items are
+        released. The journal is carried over to the changed file, whose
+        quantities its deltas still apply to.
+
+        The first call records the file as the version to compare with. If
+        the file already changed since it was loaded, it is compared with the
+        committed quantities instead and the store is compacted.
+
+        Returns:
+            InventoryReload: The items changed, added and removed and the
+                reservations reconciled, or None if the file is unchanged.
+
+        Raises:
+            InventoryFormatError: If a changed line is malformed and
+                skip_invalid_lines is False. Nothing is applied then.
+        """
+        while True:
+            with open(self.file, "rb") as file:
+                data = file.read()
+            digest = content_digest(data)
+            with self._save_lock:
+                self._track_file = True
+                base_digest = self._snapshot_digest
+                base = self._file_data
+                if digest == base_digest:
+                    self._file_data = data
+                    return None
+            delta = None
+            if base is not None:
+                delta = diff_inventory(base, data, self._skip_invalid_lines)
+            with ExitStack() as stack:
+                stack.enter_context(self._compact_lock)
+                for stripe in self._stripes:
+                    stack.enter_context(stripe)
+                stack.enter_context(self._save_lock)
+                if self._snapshot_digest != base_digest:
+                    # Compacted meanwhile: compare with the file it wrote.
+                    continue
+                if delta is None:
+                    committed = "".join(format_inventory_line(*row) for row in self._committed_rows())
+                    delta = diff_inventory(committed.encode(), data, self._skip_invalid_lines)
+                reload = self._apply_delta(delta)
+                if base is None:
+                    self._write_compacted()
+                else:
+                    self._snapshot_digest = digest
+                    self._file_data = data
+                    self._journal.rebase(digest)
+                return reload
+
+    def _apply_delta(self, delta):
+        """
+        Applies the changed lines of the inventory file to the in-memory inventory.
+
+        Must be called with every stripe lock and the save lock held.
+
+        Args:
+            delta (InventoryDelta): The changed lines and the removed items.
+
+        Returns:
+            InventoryReload: The items changed, added and removed and the
+                reservations reconciled.
+        """
+        names, changes, regular_cents, member_cents, tax_statuses = delta.columns
+        changed = []
+        added = []
+        quantities = []
+        for item, change in zip(names, changes):
+            if self._has_item(item):
+                changed.append(item)
+                quantities.append(self._stock(item) + change)
+            else:
+                added.append(item)
+                quantities.append(change)
+        self._build_inventory((names, quantities, regular_cents, member_cents, tax_statuses))
+        reservations = []
+        for item in changed:
+            if self._stock(item) < 0:
+                reservations.extend(self._reconcile_item(item))
+        removed = [item for item in delta.removed if self._has_item(item)]
+        for item in removed:
+            for reservation in self._reservations.pop(item, {}).values():
+                reservation.state = RELEASED
+                reservations.append(reservation)
+            self._held.pop(item, None)
+            self._remove_item(item)
+        if self._stock_index is not None:
+            for item in removed:
+                self._stock_index.discard(item)
+            for item in names:
+                self._stock_changed(item)
+        if self._lookup is not None:
+            for item in removed:
+                self._lookup.remove(item)
+            for item in added:
+                self._lookup.add(item)
+        self._categories = None
+        self.version += 1
+        return InventoryReload(changed, added, removed, reservations)
+
+    def _reconcile_item(self, item):
+        """
+        Expires the newest reservations of an item until its stock is no
+        longer negative.
+
+        Must be called with the stripe lock of the item held.
+
+        Args:
+            item (str): The item whose stock was reduced.
+
+        Returns:
+            list: The reservations that expired.
+        """
+        active = self._reservations.get(item, {})
+        expired = []
+        for reservation in reversed(list(active.values())):
+            if self._stock(item) >= 0:
+                break
+            del active[reservation.id]
+            self._adjust_quantity(item, reservation.quantity)
+            self._held[item] -= reservation.quantity
+            reservation.state = EXPIRED
+            expired.append(reservation)
+        if not active:
+            self._reservations.pop(item, None)
+        return expired
+
+    def track_stock(self, default_threshold=0, on_low_stock=None):
+        """
+        Starts keeping an index of stock levels, so that low-stock items are
+        found without scanning the inventory, and returns it.
+
+        Reorder thresholds are read from the reorder file next to the
+        inventory, one "<item>: <threshold>" pair per line, if it exists.
+        The index is built once and then updated whenever stock is taken,
+        sold, released or reloaded.
+
+        Args:
+            default_threshold (int): The reorder threshold of items without their own.
+            on_low_stock (callable): Called with the item, its quantity and its
+                threshold when an item falls below its threshold. It runs with
+                the item's stock lock held, so it should only record or queue
+                the event.
+
+        Returns:
+            StockIndex: The index, shared by later calls.
+        """
+        with ExitStack() as stack:
+            for stripe in self._stripes:
+                stack.enter_context(stripe)
+            if self._stock_index is None:
+                thresholds = {}
+                try:
+                    with open(self.file + ".reorder") as file:
+                        for line in file:
+                            item, separator, threshold = line.rstrip("\n").rpartition(": ")
+                            if separator and threshold.strip().isdecimal() and self._has_item(item):
+                                thresholds[item] = int(threshold)
+                except FileNotFoundError:
+                    pass
+                levels = ((row[0], row[1]) for row in self._iter_rows())
+                self._stock_index = StockIndex(levels, thresholds, default_threshold, on_low_stock)
+        return self._stock_index
+
+    def _stock_changed(self, item):
+        """
+        Updates the stock index, if there is one, after the quantity of an item changed.
+
+        Must be called with the stripe lock of the item held.
+
+        Args:
+            item (str): The item whose quantity changed.
+        """
+        if self._stock_index is not None:
+            self._stock_index.update(item, self._stock(item))
+
+    def _item_index(self):
+        """
+        Returns the lookup index of item names, building it on first use.
+
+        Aliases are read from the aliases file next to the inventory, one
+        "<alias>: <item>" pair per line, if it exists.
+
+        Returns:
+            ItemIndex: The lookup index.
+        """
+        lookup = self._lookup
+        if lookup is None:
+            lookup = ItemIndex(row[0] for row in self._iter_rows())
+            try:
+                with open(self.file + ".aliases") as file:
+                    for line in file:
+                        alias, separator, item = line.rstrip("\n").rpartition(": ")
+                        if separator and lookup.resolve(item) == item:
+                            lookup.add_alias(alias, item)
+            except FileNotFoundError:
+                pass
+            self._lookup = lookup
+        return lookup
+
+    def resolve_item(self, name):
+        """
+        Finds the item a typed name refers to, ignoring case and extra
+        whitespace, or by one of its aliases.
+
+        Args:
+            name (str): The name as typed, or an alias such as a barcode.
+
+        Returns:
+            str: The item name as it appears in the inventory.
+
+        Raises:
+            ItemNotFoundError: If no item matches.
+        """
+        if self._has_item(name):
+            return name
+        item = self._item_index().resolve(name)
+        if item is None:
+            raise ItemNotFoundError(f"{name} not found in the inventory.")
+        return item
+
+    def complete_items(self, prefix, limit=10):
+        """
+        Lists the items whose names start with a prefix, ignoring case.
+
+        Args:
+            prefix (str): The typed prefix.
+            limit (int): The maximum number of items returned.
+
+        Returns:
+            list: The matching item names, in name order.
+        """
+        return self._item_index().complete(prefix, limit)
+
+    def add_item_alias(self, alias, item):
+        """
+        Registers an alternative name, such as a barcode or SKU code, for an
+        item until the store is closed. The alias is kept when the inventory
+        is reloaded, unless its item is removed. Permanent aliases belong in
+        the aliases file.
+
+        Args:
+            alias (str): The alternative name.
+            item (str): The item name.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        if not self._has_item(item):
+            raise ItemNotFoundError(f"{item} not found in the inventory.")
+        self._item_index().add_alias(alias, item)
+
+    def item_categories(self):
+        """
+        Returns the category of every categorized item, read on first use
+        from the categories file next to the inventory, one
+        "<item>: <category>" pair per line, if it exists.
+
+        Returns:
+            dict: A dictionary mapping items to their category.
+        """
+        categories = self._categories
+        if categories is None:
+            categories = {}
+            try:
+                with open(self.file + ".categories") as file:
+                    for line in file:
+                        item, separator, category = line.rstrip("\n").rpartition(": ")
+                        if separator and self._has_item(item):
+                            categories[item] = category.strip()
+            except FileNotFoundError:
+                pass
+            self._categories = categories
+        return categories
 
     def get_item_price(self, item, rewards_member):
         """
@@ -84,6 +632,68 @@ class Store:
             )
         raise ItemNotFoundError("Item not found in the inventory.")
 
+    def get_item_pricing(self, item, rewards_member):
+        """
+        Retrieves the price and tax status of the given item in a single lookup.
+
+        Args:
+            item (str): The item to look up.
+            rewards_member (bool): Indicates whether the customer is a rewards member.
+
+        Returns:
+            tuple: The price in cents and whether the item is taxable.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        details = self._inventory.get(item)
+        if details is None:
+            raise ItemNotFoundError(f"{item} not found in the inventory.")
+        price = details["member_price"] if rewards_member else details["regular_price"]
+        return round(price * 100), details["tax_status"] == "Taxable"
+
+    def get_item_prices(self, item):
+        """
+        Retrieves both prices and the tax status of the given item in a single lookup.
+
+        Args:
+            item (str): The item to look up.
+
+        Returns:
+            tuple: The regular price in cents, the member price in cents and
+                whether the item is taxable.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+        """
+        details = self._inventory.get(item)
+        if details is None:
+            raise ItemNotFoundError(f"{item} not found in the inventory.")
+        return (
+            round(details["regular_price"] * 100),
+            round(details["member_price"] * 100),
+            details["tax_status"] == "Taxable",
+        )
+
+    def price_columns(self):
+        """
+        Exports the current prices as columns indexed by row.
+
+        Returns:
+            tuple: A dict mapping items to rows, the regular prices in cents,
+                the member prices in cents and a 0/1 taxable flag per row.
+        """
+        index = {}
+        regular_cents = []
+        member_cents = []
+        taxable = []
+        for item, _, regular, member, tax_status in self._iter_rows():
+            index[item] = len(regular_cents)
+            regular_cents.append(regular)
+            member_cents.append(member)
+            taxable.append(1 if tax_status == "Taxable" else 0)
+        return index, regular_cents, member_cents, taxable
+
     def get_item_tax_status(self, item):
         """
         Retrieves the tax status of the given item.
@@ -110,10 +720,345 @@ class Store:
         Args:
             item (str): The item to update.
             quantity (int): The quantity to subtract from the current inventory.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+        """
+        self._check_quantity(quantity)
+        with self._stripe(item):
+            self._adjust_quantity(item, -quantity)
+            self._stock_changed(item)
+            self._record_sale(item, quantity)
+
+    def _check_quantity(self, quantity):
+        """
+        Checks that a quantity to take, sell or reserve is positive, so that
+        stock is never added through them.
+
+        Args:
+            quantity (int): The quantity.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+        """
+        if quantity <= 0:
+            raise ValueError(f"The quantity must be positive, not {quantity}.")
+
+    def _take(self, item, quantity):
+        """
+        Checks that a quantity of an item is in stock and subtracts it.
+
+        Must be called with the stripe lock of the item held.
+
+        Args:
+            item (str): The item to take.
+            quantity (int): The quantity to take.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the available stock.
+        """
+        self.is_item_available(item, quantity)
+        self._adjust_quantity(item, -quantity)
+        self._stock_changed(item)
+
+    def _take_many(self, quantities):
+        """
+        Subtracts the quantities of several items if all of them are in stock.
+
+        Must be called with the stripe locks of all the items held.
+
+        Args:
+            quantities (dict): A dictionary mapping items to the quantities to take.
+
+        Returns:
+            list: (item, reason) tuples for the items that could not be taken.
+                Nothing was taken if the list is not empty.
+        """
+        failures = []
+        for item, quantity in quantities.items():
+            try:
+                self.is_item_available(item, quantity)
+            except (ItemNotFoundError, InsufficientQuantityError) as error:
+                failures.append((item, str(error)))
+        if not failures:
+            for item, quantity in quantities.items():
+                self._adjust_quantity(item, -quantity)
+                self._stock_changed(item)
+        return failures
+
+    def _stripe_index(self, item):
+        """
+        Returns the index of the lock guarding the stock of the given item.
+
+        Args:
+            item (str): The item to lock.
+
+        Returns:
+            int: The index of the item's stripe lock.
+        """
+        return hash(item) % LOCK_STRIPES
+
+    def _stripe(self, item):
+        """
+        Returns the lock guarding the stock of the given item.
+
+        Args:
+            item (str): The item to lock.
+
+        Returns:
+            threading.Lock: The stripe lock of the item.
+        """
+        return self._stripes[self._stripe_index(item)]
+
+    def _return(self, item, quantity):
+        """
+        Returns the stock held by a released or expired reservation.
+
+        Must be called with the stripe lock of the item held.
+
+        Args:
+            item (str): The item whose stock is returned.
+            quantity (int): The quantity to return.
+        """
+        self._adjust_quantity(item, quantity)
+
+    def _record_sale(self, item, quantity):
+        """
+        Records a committed sale to be journaled by the next save_inventory call.
+
+        Must be called with the stripe lock of the item held.
+
+        Args:
+            item (str): The item sold.
+            quantity (int): The quantity sold.
+        """
+        with self._save_lock:
+            self._pending[item] = self._pending.get(item, 0) - quantity
+
+    def reserve(self, item, quantity, timeout=None):
+        """
+        Atomically checks and holds stock of an item for a cart.
+
+        Args:
+            item (str): The item to reserve.
+            quantity (int): The quantity to reserve.
+            timeout (float): Seconds until the reservation expires. Defaults to
+                the store's reservation_timeout.
+
+        Returns:
+            Reservation: The reservation holding the stock.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the available stock.
+        """
+        self._check_quantity(quantity)
+        if timeout is None:
+            timeout = self.reservation_timeout
+        now = time.monotonic()
+        with self._stripe(item):
+            self._expire_item(item, now)
+            self._take(item, quantity)
+            self._held[item] = self._held.get(item, 0) + quantity
+            reservation = Reservation(
+                next(self._reservation_ids), item, quantity,
+                None if timeout is None else now + timeout,
+            )
+            self._reservations.setdefault(item, {})[reservation.id] = reservation
+        return reservation
+
+    def reserve_many(self, quantities, timeout=None):
+        """
+        Atomically holds stock of several items: either every item is
+        reserved or none is.
+
+        The stripe locks of all the items are taken in a fixed order, so
+        concurrent batches cannot deadlock.
+
+        Args:
+            quantities (dict): A dictionary mapping items to the quantities to reserve.
+            timeout (float): Seconds until the reservations expire. Defaults to
+                the store's reservation_timeout.
+
+        Returns:
+            dict: A dictionary mapping items to their Reservation.
+
+        Raises:
+            ValueError: If a quantity is not positive.
+            BatchError: If any item is unknown or short of stock, listing every such item.
+        """
+        for quantity in quantities.values():
+            self._check_quantity(quantity)
+        if timeout is None:
+            timeout = self.reservation_timeout
+        now = time.monotonic()
+        expires_at = None if timeout is None else now + timeout
+        stripes = sorted({self._stripe_index(item) for item in quantities})
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._stripes[stripe])
+            for item in quantities:
+                self._expire_item(item, now)
+            failures = self._take_many(quantities)
+            if failures:
+                raise BatchError(failures)
+            reservations = {}
+            for item, quantity in quantities.items():
+                self._held[item] = self._held.get(item, 0) + quantity
+                reservation = Reservation(next(self._reservation_ids), item, quantity, expires_at)
+                self._reservations.setdefault(item, {})[reservation.id] = reservation
+                reservations[item] = reservation
+        return reservations
+
+    def commit(self, reservation):
+        """
+        Turns a reservation into a sale that the next save_inventory call journals.
+
+        An expired reservation already returned its stock, so the stock is
+        taken again if it is still available.
+
+        Args:
+            reservation (Reservation): The reservation to commit.
+
+        Raises:
+            ReservationError: If the reservation was already committed or released.
+            InsufficientQuantityError: If the reservation expired and the stock is gone.
         """
-        self._inventory[item]["quantity"] -= quantity
+        item = reservation.item
+        with self._stripe(item):
+            if reservation.state in (COMMITTED, RELEASED):
+                raise ReservationError(f"Reservation {reservation.id} is already {reservation.state}.")
+            if self._reservations.get(item, {}).pop(reservation.id, None) is not None:
+                self._held[item] -= reservation.quantity
+            else:
+                self._take(item, reservation.quantity)
+            reservation.state = COMMITTED
+            self._record_sale(item, reservation.quantity)
+
+    def commit_many(self, reservations):
+        """
+        Commits several reservations atomically: either every one of them is
+        sold or none is.
+
+        The stripe locks of all the items are taken in a fixed order, and the
+        stock of expired reservations is taken again for all of them at once
+        before anything is committed.
+
+        Args:
+            reservations (list): The reservations to commit.
+
+        Raises:
+            ReservationError: If a reservation was already committed or released.
+            InsufficientQuantityError: If a reservation expired and its stock
+                is gone. Nothing is committed then.
+        """
+        stripes = sorted({self._stripe_index(reservation.item) for reservation in reservations})
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._stripes[stripe])
+            expired = {}
+            for reservation in reservations:
+                if reservation.state in (COMMITTED, RELEASED):
+                    raise ReservationError(f"Reservation {reservation.id} is already {reservation.state}.")
+                if reservation.id not in self._reservations.get(reservation.item, {}):
+                    expired[reservation.item] = expired.get(reservation.item, 0) + reservation.quantity
+            failures = self._take_many(expired) if expired else []
+            if failures:
+                raise InsufficientQuantityError(failures[0][1])
+            for reservation in reservations:
+                item = reservation.item
+                if self._reservations.get(item, {}).pop(reservation.id, None) is not None:
+                    self._held[item] -= reservation.quantity
+                reservation.state = COMMITTED
+                self._record_sale(item, reservation.quantity)
+
+    def release(self, reservation, quantity=None):
+        """
+        Returns reserved stock to the inventory.
+
+        Args:
+            reservation (Reservation): The reservation to release.
+            quantity (int): The quantity to release. The whole reservation is
+                released when it is omitted or not less than the reserved quantity.
+
+        Raises:
+            ReservationError: If the reservation was already committed or released.
+        """
+        item = reservation.item
+        with self._stripe(item):
+            if reservation.state in (COMMITTED, RELEASED):
+                raise ReservationError(f"Reservation {reservation.id} is already {reservation.state}.")
+            if quantity is None or quantity >= reservation.quantity:
+                quantity = reservation.quantity
+            active = self._reservations.get(item, {})
+            if reservation.id in active:
+                self._return(item, quantity)
+                self._held[item] -= quantity
+                self._stock_changed(item)
+            reservation.quantity -= quantity
+            if reservation.quantity == 0:
+                active.pop(reservation.id, None)
+                reservation.state = RELEASED
+
+    def expire_reservations(self):
+        """
+        Returns the stock of every reservation past its deadline.
+
+        Returns:
+            int: The number of reservations that expired.
+        """
+        now = time.monotonic()
+        expired = 0
+        for item in list(self._reservations):
+            with self._stripe(item):
+                expired += self._expire_item(item, now)
+        return expired
+
+    def _expire_item(self, item, now):
+        """
+        Returns the stock of the expired reservations of one item.
+
+        Must be called with the stripe lock of the item held.
+
+        Args:
+            item (str): The item whose reservations are checked.
+            now (float): The current time.monotonic() value.
+
+        Returns:
+            int: The number of reservations that expired.
+        """
+        active = self._reservations.get(item)
+        if not active:
+            return 0
+        expired = [reservation for reservation in active.values() if reservation.is_expired(now)]
+        for reservation in expired:
+            del active[reservation.id]
+            self._return(item, reservation.quantity)
+            self._held[item] -= reservation.quantity
+            reservation.state = EXPIRED
+        if expired:
+            self._stock_changed(item)
+        if not active:
+            del self._reservations[item]
+        return len(expired)
 
     def is_item_available(self, item, quantity):
+        """
+        Checks whether the given quantity of an item is in stock.
+
+        Args:
+            item (str): The item to check.
+            quantity (int): The quantity requested.
+
+        Returns:
+            bool: True if the quantity is available.
+
+        Raises:
+            ItemNotFoundError: If the item is not found in the inventory.
+            InsufficientQuantityError: If the requested quantity exceeds the stock.
+        """
         if item in self._inventory:
             if self._inventory[item]["quantity"] >= quantity:
                 return True
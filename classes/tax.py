@@ -0,0 +1,318 @@
+import json
+import time
+from array import array
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from classes.errors import TaxTableError
+
+TAX_RATE_BASIS_POINTS = 650  # 6.5%
+DEFAULT_JURISDICTION = "default"
+
+# Rate codes shared by every jurisdiction. Categories with their own rate or a
+# tax holiday get codes 2 and up, so a taxable flag is also a valid rate code.
+EXEMPT = 0
+STANDARD = 1
+
+Jurisdiction = namedtuple("Jurisdiction", ["rate", "category_rates", "holidays"])
+Holiday = namedtuple("Holiday", ["name", "start", "end", "categories"])
+
+
+def _rate(value, field):
+    """
+    Converts a tax rate in percent to hundredths of a percent.
+
+    Raises:
+        TaxTableError: If the rate is not a percentage between 0 and 100.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 100:
+        raise TaxTableError(f"invalid {field} {value!r}")
+    return round(value * 100)
+
+
+def _parse_holiday(entry, jurisdiction):
+    """
+    Validates a tax holiday.
+
+    Raises:
+        TaxTableError: If the holiday is malformed.
+    """
+    try:
+        start = date.fromisoformat(entry["start"])
+        end = date.fromisoformat(entry["end"])
+    except (KeyError, TypeError, ValueError) as error:
+        raise TaxTableError(f"invalid holiday in {jurisdiction}: {error}") from None
+    categories = entry.get("categories")
+    if categories is not None:
+        if not isinstance(categories, list) or not all(isinstance(category, str) for category in categories):
+            raise TaxTableError(f"categories of holiday in {jurisdiction} must be a list of names")
+        categories = frozenset(categories)
+    return Holiday(entry.get("name", ""), start, end, categories)
+
+
+def parse_tax_table(data):
+    """
+    Validates a tax rate table and converts its rates to hundredths of a percent.
+
+    Args:
+        data (dict): The table as read from the tax rate file, see read_tax_table.
+
+    Returns:
+        TaxTable: The parsed table.
+
+    Raises:
+        TaxTableError: If the table is malformed.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("jurisdictions"), dict):
+        raise TaxTableError("a tax table needs a jurisdictions object")
+    jurisdictions = {}
+    for name, entry in data["jurisdictions"].items():
+        if not isinstance(entry, dict) or "rate" not in entry:
+            raise TaxTableError(f"jurisdiction {name} needs a rate")
+        if not isinstance(entry.get("categories", {}), dict):
+            raise TaxTableError(f"categories of {name} must be an object of rates")
+        if not isinstance(entry.get("holidays", []), list):
+            raise TaxTableError(f"holidays of {name} must be a list")
+        category_rates = {
+            category: _rate(rate, f"rate of {category} in {name}")
+            for category, rate in entry.get("categories", {}).items()
+        }
+        holidays = tuple(_parse_holiday(holiday, name) for holiday in entry.get("holidays", ()))
+        jurisdictions[name] = Jurisdiction(_rate(entry["rate"], f"rate of {name}"), category_rates, holidays)
+    return TaxTable(jurisdictions, data.get("default_jurisdiction", DEFAULT_JURISDICTION))
+
+
+def read_tax_table(path, default_rate_basis_points=TAX_RATE_BASIS_POINTS):
+    """
+    Reads a tax rate table from a JSON file, for example:
+
+        {
+          "default_jurisdiction": "county",
+          "jurisdictions": {
+            "county": {
+              "rate": 6.5,
+              "categories": {"Groceries": 2.5, "Prepared Food": 8.0},
+              "holidays": [{"name": "Back to school", "start": "2026-08-07",
+                            "end": "2026-08-09", "categories": ["Clothing"]}]
+            }
+          }
+        }
+
+    Rates are in percent and apply to taxable items; tax-exempt items are
+    never taxed. A holiday exempts its categories from the start to the end
+    date, both included, or every item if it lists no categories.
+
+    Args:
+        path (str): The path to the tax rate file.
+        default_rate_basis_points (int): The rate of a flat table used when
+            the file does not exist, in hundredths of a percent.
+
+    Returns:
+        TaxTable: The parsed table.
+
+    Raises:
+        TaxTableError: If the file is malformed.
+    """
+    try:
+        with open(path) as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return TaxTable.flat(default_rate_basis_points)
+    except ValueError as error:
+        raise TaxTableError(f"{path}: {error}") from None
+    return parse_tax_table(data)
+
+
+class TaxTable:
+    """
+    The tax rates of one or more jurisdictions.
+
+    Attributes:
+        jurisdictions (dict): A dictionary mapping jurisdiction names to their Jurisdiction.
+        default_jurisdiction (str): The jurisdiction used when none is named.
+    """
+    def __init__(self, jurisdictions, default_jurisdiction=DEFAULT_JURISDICTION):
+        """
+        Initializes a TaxTable object.
+
+        Args:
+            jurisdictions (dict): A dictionary mapping jurisdiction names to their Jurisdiction.
+            default_jurisdiction (str): The jurisdiction used when none is named.
+        """
+        self.jurisdictions = jurisdictions
+        self.default_jurisdiction = default_jurisdiction
+
+    @classmethod
+    def flat(cls, rate_basis_points=TAX_RATE_BASIS_POINTS):
+        """
+        Returns a table taxing every taxable item at one rate.
+
+        Args:
+            rate_basis_points (int): The rate in hundredths of a percent.
+
+        Returns:
+            TaxTable: The table.
+        """
+        return cls({DEFAULT_JURISDICTION: Jurisdiction(rate_basis_points, {}, ())})
+
+    def jurisdiction(self, name=None):
+        """
+        Returns the rates of a jurisdiction.
+
+        Args:
+            name (str): The jurisdiction. Defaults to the default jurisdiction.
+
+        Returns:
+            Jurisdiction: The rates of the jurisdiction.
+
+        Raises:
+            TaxTableError: If the table has no such jurisdiction.
+        """
+        name = name or self.default_jurisdiction
+        try:
+            return self.jurisdictions[name]
+        except KeyError:
+            raise TaxTableError(f"unknown jurisdiction {name}") from None
+
+
+class TaxEngine:
+    """
+    Resolves items to rate codes, and rate codes to the rates of the day.
+
+    Every item is resolved once per store load to a small integer rate code:
+    EXEMPT or STANDARD after its tax status, or the code of its category when
+    the jurisdiction gives that category its own rate or a holiday. Only items
+    whose code differs from their taxable flag are kept, so the code of a line
+    is codes.get(item, taxable) and its rate is an index into the day's rates.
+    The codes are cached until the store reloads its inventory or the table
+    is replaced, and the rates until midnight.
+
+    Attributes:
+        table (TaxTable): The tax rate table.
+        jurisdiction (str): The jurisdiction whose rates apply, or None for
+            the table's default jurisdiction.
+    """
+    def __init__(self, table=None, jurisdiction=None):
+        """
+        Initializes a TaxEngine object.
+
+        Args:
+            table (TaxTable): The tax rate table. Defaults to a flat 6.5% table.
+            jurisdiction (str): The jurisdiction whose rates apply, or None for
+                the table's default jurisdiction.
+
+        Raises:
+            TaxTableError: If the table has no such jurisdiction.
+        """
+        self.jurisdiction = jurisdiction
+        self.use_table(table if table is not None else TaxTable.flat())
+
+    def use_table(self, table):
+        """
+        Replaces the tax rate table, dropping the cached codes and rates.
+
+        Args:
+            table (TaxTable): The new tax rate table.
+
+        Raises:
+            TaxTableError: If the table has no such jurisdiction.
+        """
+        rates = table.jurisdiction(self.jurisdiction)
+        categories = list(rates.category_rates)
+        for holiday in rates.holidays:
+            categories.extend(holiday.categories or ())
+        self.table = table
+        self._rates = rates
+        self._category_codes = {
+            category: code for code, category in enumerate(dict.fromkeys(categories), STANDARD + 1)
+        }
+        self._codes_categories = None
+        self._codes = {}
+        self._day_rates = None
+        self._day_ends = 0.0
+
+    def rates(self, day=None):
+        """
+        Returns the rate of every rate code on a day.
+
+        Args:
+            day (date): The day. Defaults to today.
+
+        Returns:
+            array: The rates in hundredths of a percent, indexed by rate code.
+        """
+        if day is not None:
+            return self._rates_on(day)
+        if time.time() >= self._day_ends:
+            today = date.today()
+            self._day_rates = self._rates_on(today)
+            self._day_ends = datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+        return self._day_rates
+
+    def item_codes(self, store):
+        """
+        Returns the rate codes of the items whose code is not their taxable flag.
+
+        Args:
+            store (Store): The store whose items and categories are resolved.
+
+        Returns:
+            dict: A dictionary mapping items to their rate code.
+        """
+        categories = store.item_categories()
+        if categories is not self._codes_categories:
+            codes = {}
+            category_codes = self._category_codes
+            if category_codes:
+                for item, category in categories.items():
+                    code = category_codes.get(category)
+                    if code is not None and store.get_item_prices(item)[2]:
+                        codes[item] = code
+            self._codes = codes
+            self._codes_categories = categories
+        return self._codes
+
+    def resolve(self, store, day=None):
+        """
+        Returns the rates of the day and the item codes of a store.
+
+        Args:
+            store (Store): The store whose items are resolved.
+            day (date): The day. Defaults to today.
+
+        Returns:
+            tuple: The rates by rate code and the item codes, see rates and item_codes.
+        """
+        return self.rates(day), self.item_codes(store)
+
+    def rate_of(self, store, item, taxable, day=None):
+        """
+        Returns the tax rate of an item.
+
+        Args:
+            store (Store): The store carrying the item.
+            item (str): The item.
+            taxable (bool): Whether the item is taxable.
+            day (date): The day. Defaults to today.
+
+        Returns:
+            int: The rate in hundredths of a percent.
+        """
+        rates, codes = self.resolve(store, day)
+        return rates[codes.get(item, taxable)]
+
+    def _rates_on(self, day):
+        """
+        Computes the rate of every rate code on a day, holidays included.
+        """
+        jurisdiction = self._rates
+        rates = array("q", [0, jurisdiction.rate])
+        rates.extend(jurisdiction.category_rates.get(category, jurisdiction.rate)
+                     for category in self._category_codes)
+        for holiday in jurisdiction.holidays:
+            if holiday.start <= day <= holiday.end:
+                if holiday.categories is None:
+                    return array("q", bytes(8 * len(rates)))
+                for category in holiday.categories:
+                    rates[self._category_codes[category]] = 0
+        return rates
@@ -0,0 +1,90 @@
+import os
+import threading
+
+from classes.journal import fsync_directory
+
+
+class TransactionCounter:
+    """
+    Durable source of transaction numbers.
+
+    Numbers are leased from the counter file in blocks, so only one write and
+    fsync is needed per block instead of per transaction. The file holds the
+    highest number leased so far, which means a crash can skip the unused
+    rest of a block but never hands out a number twice. A clean close writes
+    back the last number actually used.
+
+    Attributes:
+        file (str): The path to the counter file.
+        block_size (int): The number of transaction numbers leased per write.
+    """
+    def __init__(self, counter_file, block_size=100):
+        """
+        Initializes a TransactionCounter object. The counter file is read on
+        first use.
+
+        Args:
+            counter_file (str): The path to the counter file.
+            block_size (int): The number of transaction numbers leased per write.
+        """
+        self.file = counter_file
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._last = None
+        self._leased = None
+
+    def next(self):
+        """
+        Returns the next transaction number.
+
+        Returns:
+            int: The transaction number, starting at 1.
+        """
+        with self._lock:
+            if self._last is None:
+                self._last = self._leased = self._read()
+            if self._last == self._leased:
+                self._write(self._leased + self.block_size)
+                self._leased += self.block_size
+            self._last += 1
+            return self._last
+
+    def close(self):
+        """
+        Writes back the last number used, so the next run continues right after it.
+        """
+        with self._lock:
+            if self._last is not None and self._last != self._leased:
+                self._write(self._last)
+                self._leased = self._last
+
+    def _read(self):
+        """
+        Reads the highest leased number from the counter file.
+
+        Returns:
+            int: The number, 0 if the file does not exist yet.
+        """
+        try:
+            with open(self.file) as file:
+                return int(file.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _write(self, value):
+        """
+        Durably replaces the counter file with the given number.
+
+        Args:
+            value (int): The number to store.
+        """
+        directory = os.path.dirname(self.file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = self.file + ".tmp"
+        with open(temp_file, "w") as file:
+            file.write(f"{value}\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_file, self.file)
+        fsync_directory(self.file)
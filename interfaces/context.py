@@ -0,0 +1,214 @@
+from contextlib import ExitStack
+from functools import cached_property
+
+from classes.cart import Cart
+from classes.customer import Customer
+from classes.inventory_watcher import InventoryWatcher
+from classes.pricing import PricingEngine
+from classes.promotions import PromotionTable, read_promotions
+from classes.receipt import Receipt
+from classes.receipt_renderers import RENDERERS
+from classes.receipt_writer import ReceiptWriter
+from classes.register import Register
+from classes.sales_ledger import SalesLedger
+from classes.sqlite_store import SQLiteStore
+from classes.store import Store
+from classes.tax import TaxEngine, read_tax_table
+
+
+class AppContext:
+    """
+    Owns the objects a register session works with and creates them on first use.
+
+    Nothing is loaded or opened when the context is constructed, so importing
+    the application or building a context for tooling does no file I/O.
+
+    Attributes:
+        inventory_file (str): The path to the inventory file.
+        receipt_directory (str): The directory receipt files are written to.
+        ledger_directory (str): The directory of the sales ledger.
+        database_file (str): The SQLite database backing the store, or None
+            to use the inventory text file directly.
+        promotions_file (str): The file of promotions applied to the cart.
+        tax_table_file (str): The file of tax rates applied to the cart.
+        low_stock_threshold (int): The reorder threshold of items without their own.
+        receipt_format (str): The format of receipt files, a key of RENDERERS.
+        on_receipt_error (callable): Called with the path and the exception of
+            a receipt that could not be written.
+    """
+    def __init__(self, inventory_file="databases/inventory.txt", receipt_directory="assets/receipts",
+                 ledger_directory="databases/ledger", database_file=None,
+                 promotions_file="databases/promotions.jsonl", tax_table_file="databases/tax_rates.json",
+                 low_stock_threshold=5, receipt_format="text", on_receipt_error=None):
+        """
+        Initializes an AppContext object.
+
+        Args:
+            inventory_file (str): The path to the inventory file.
+            receipt_directory (str): The directory receipt files are written to.
+            ledger_directory (str): The directory of the sales ledger.
+            database_file (str): The SQLite database backing the store, or None
+                to use the inventory text file directly. An empty database is
+                filled from the inventory file.
+            promotions_file (str): The file of promotions applied to the cart,
+                see read_promotions. No promotions apply if it does not exist.
+            tax_table_file (str): The file of tax rates applied to the cart,
+                see read_tax_table. A flat 6.5% applies if it does not exist.
+            low_stock_threshold (int): The reorder threshold of items without
+                their own in the reorder file next to the inventory.
+            receipt_format (str): The format of receipt files: "text", "jsonl" or "csv".
+            on_receipt_error (callable): Called with the path and the exception
+                of a receipt that could not be written, from the writer thread.
+                None raises the first such error when the context is closed.
+
+        Raises:
+            ValueError: If the receipt format is unknown.
+        """
+        self.inventory_file = inventory_file
+        self.receipt_directory = receipt_directory
+        self.ledger_directory = ledger_directory
+        self.database_file = database_file
+        self.promotions_file = promotions_file
+        self.tax_table_file = tax_table_file
+        self.low_stock_threshold = low_stock_threshold
+        if receipt_format not in RENDERERS:
+            raise ValueError(f"unknown receipt format {receipt_format!r}")
+        self.receipt_format = receipt_format
+        self.on_receipt_error = on_receipt_error
+        self._watcher = None
+
+    @cached_property
+    def store(self):
+        """
+        The store, loaded from the inventory file or opened on the database on first access.
+        """
+        if self.database_file is not None:
+            return SQLiteStore(self.database_file, self.inventory_file)
+        return Store(self.inventory_file, use_snapshot=True)
+
+    @cached_property
+    def pricing_engine(self):
+        """
+        The pricing engine, with today's promotions compiled against the store's
+        prices and the rates of the tax table.
+        """
+        promotions = read_promotions(self.promotions_file)
+        return PricingEngine(
+            promotions=PromotionTable.compile(promotions, self.store),
+            tax=TaxEngine(read_tax_table(self.tax_table_file)),
+        )
+
+    @cached_property
+    def stock_index(self):
+        """
+        The index of stock levels, kept up to date by the store from first use on.
+        """
+        return self.store.track_stock(self.low_stock_threshold)
+
+    @cached_property
+    def cart(self):
+        """
+        The cart of the current transaction, keeping running totals against the store.
+        """
+        return Cart(self.pricing_engine, store=self.store)
+
+    @cached_property
+    def customer(self):
+        """
+        The current customer, a regular customer by default.
+        """
+        return Customer(False)
+
+    @cached_property
+    def receipt(self):
+        """
+        The receipt writer, writing per-transaction files in the background.
+        """
+        return Receipt(
+            self.receipt_directory,
+            writer=ReceiptWriter(on_error=self.on_receipt_error),
+            renderer=RENDERERS[self.receipt_format](),
+        )
+
+    @cached_property
+    def register(self):
+        """
+        The register reserving stock for the cart and committing it at checkout.
+        """
+        return Register(self.store, self.cart, self.customer, self.ledger)
+
+    @cached_property
+    def ledger(self):
+        """
+        The sales ledger, opened on first use.
+        """
+        return SalesLedger(self.ledger_directory)
+
+    def transaction_context(self):
+        """
+        Describes the current transaction for log records, without creating
+        anything that is not in use yet.
+
+        Returns:
+            dict: The customer type and the number of distinct items in the cart.
+        """
+        context = {}
+        if "customer" in self.__dict__:
+            context["rewards_member"] = self.customer.rewards_member
+        if "cart" in self.__dict__:
+            context["cart_items"] = len(self.cart)
+        return context
+
+    def watch_inventory(self, interval=1.0, on_error=None):
+        """
+        Applies changes of the inventory file to the running store as they are
+        made, recompiling the promotions against the new prices. The cart is
+        repriced on its next use.
+
+        Args:
+            interval (float): Seconds between polls where inotify is unavailable.
+            on_error (callable): Called with the exception when a change cannot be applied.
+
+        Returns:
+            InventoryWatcher: The started watcher.
+
+        Raises:
+            ReloadError: If the store cannot reload its inventory file, as a
+                store on a database cannot.
+        """
+        if self._watcher is None:
+            watcher = InventoryWatcher(
+                self.store, interval, on_reload=self._inventory_reloaded, on_error=on_error
+            )
+            watcher.start()
+            self._watcher = watcher
+        return self._watcher
+
+    def _inventory_reloaded(self, reload):
+        """
+        Recompiles the promotions after the inventory changed, if they are in use.
+
+        Args:
+            reload (InventoryReload): The applied changes.
+        """
+        if "pricing_engine" in self.__dict__:
+            promotions = read_promotions(self.promotions_file)
+            self.pricing_engine.promotions = PromotionTable.compile(promotions, self.store)
+
+    def close(self):
+        """
+        Stops watching the inventory file, compacts the store's journal into
+        its inventory, flushes pending receipts and checkpoints the ledger, if
+        they were used. Each step runs even if an earlier one raises.
+        """
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        with ExitStack() as stack:
+            # Callbacks run last registered first.
+            if "ledger" in self.__dict__:
+                stack.callback(self.ledger.close)
+            if "receipt" in self.__dict__:
+                stack.callback(self.receipt.close)
+            if "store" in self.__dict__:
+                stack.callback(self.store.compact_inventory)
@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class InventoryWriter:
+    """
+    Serializes inventory saves for many sessions sharing one store.
+
+    Saves run one at a time on a dedicated thread, so the journal fsync never
+    blocks the event loop. Sessions that ask for a save while one is running
+    are grouped and served by the next save, which journals all of their
+    committed sales with a single fsync.
+
+    Attributes:
+        store (Store): The store whose inventory is saved.
+        saves (int): The number of saves performed.
+    """
+    def __init__(self, store):
+        """
+        Initializes an InventoryWriter object.
+
+        Args:
+            store (Store): The store whose inventory is saved.
+        """
+        self.store = store
+        self.saves = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inventory-writer")
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        """
+        Starts the writer task on the running event loop.
+        """
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def save(self):
+        """
+        Waits until every sale committed before the call is journaled.
+
+        Raises:
+            OSError: If the inventory could not be saved.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(waiter)
+        await waiter
+
+    async def close(self):
+        """
+        Saves outstanding sales and stops the writer.
+        """
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+        self._executor.shutdown()
+
+    async def _run(self):
+        """
+        Performs saves for queued waiters, one group at a time, until a None
+        waiter asks the writer to stop after a final save.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            waiters = [await self._queue.get()]
+            while not self._queue.empty():
+                waiters.append(self._queue.get_nowait())
+            if None in waiters:
+                stopping = True
+                waiters = [waiter for waiter in waiters if waiter is not None]
+            try:
+                await loop.run_in_executor(self._executor, self.store.save_inventory)
+            except OSError as error:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(error)
+                if stopping:
+                    raise
+                continue
+            self.saves += 1
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
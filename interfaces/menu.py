@@ -1,14 +1,10 @@
-from classes.cart import Cart
-from classes.customer import Customer
-from classes.receipt import Receipt
-from classes.store import Store
+import sys
 
-from classes.errors import InvalidInputError
-
-store = Store("databases/inventory.txt")
-cart = Cart()
-customer = Customer(False)  # Regular customer by default
-receipt = Receipt("assets/receipt.txt")
+from classes.errors import (BatchError, InsufficientQuantityError, InvalidInputError,
+                    ItemNotFoundError)
+from classes.metrics import METRICS, metrics_enabled
+from classes.pricing import format_cents
+from interfaces.context import AppContext
 
 
 class StoreMenu:
@@ -17,12 +13,26 @@ class StoreMenu:
 
     Attributes:
         menu_options (dict): A dictionary mapping menu options to their descriptions.
+        context (AppContext): The session context owning the store, cart, customer and receipt.
+        input (callable): Reads an answer, given the prompt to show.
+        output (callable): Shows a line of text to the user.
     """
 
-    def __init__(self):
+    def __init__(self, context=None, input=input, output=print):
         """
         Initializes a StoreMenu object.
+
+        Args:
+            context (AppContext): The session context to operate on. A default
+                context is created when none is given.
+            input (callable): Reads an answer, given the prompt to show.
+                Defaults to the built-in input.
+            output (callable): Shows a line of text to the user. Defaults to
+                the built-in print.
         """
+        self.context = context if context is not None else AppContext()
+        self.input = input
+        self.output = output
         self.menu_options = {
             "1": "Select customer type",
             "2": "Add item to cart",
@@ -31,15 +41,18 @@ class StoreMenu:
             "5": "Checkout and print receipt",
             "6": "Cancel transaction",
             "7": "Exit",
+            "8": "Load items from a scan file",
+            "9": "Show metrics",
+            "10": "Show low-stock report",
         }
 
     def display_menu(self):
         """
         Displays the menu options.
         """
-        print("===== Jerrys Quick Mart =====")
+        self.output("===== Jerrys Quick Mart =====")
         for option, description in self.menu_options.items():
-            print(f"{option}. {description}")
+            self.output(f"{option}. {description}")
 
     def get_user_choice(self):
         """
@@ -48,7 +61,7 @@ class StoreMenu:
         Returns:
             str: The user's choice.
         """
-        user_choice = input("Enter your choice: ")
+        user_choice = self.input("Enter your choice: ")
         return user_choice
 
     def validate_choice(self, choice):
@@ -68,6 +81,39 @@ class StoreMenu:
             return True
         raise InvalidInputError
 
+    def run_choice(self, choice):
+        """
+        Validates and processes the user's choice, reporting errors to the user
+        instead of raising them.
+
+        Args:
+            choice (str): The user's choice.
+
+        Returns:
+            str: A message describing the error to log, or None if the choice succeeded.
+        """
+        try:
+            self.validate_choice(choice)
+            self.process_choice(choice)
+        except InvalidInputError:
+            error_message = f"Invalid input: {choice}"
+            self.output(f"{error_message}, please try again!!")
+            return error_message
+        except ItemNotFoundError as infe:
+            error_message = f"Item not found error: {infe}"
+            self.output(error_message)
+            return error_message
+        except InsufficientQuantityError as iqe:
+            error_message = f"Insufficient Quantity Error: {iqe}"
+            self.output(error_message)
+            return error_message
+        except BatchError as be:
+            self.output("Nothing was added to the cart:")
+            for location, reason in be.errors:
+                self.output(f"  {location}: {reason}")
+            return f"Batch error: {be}"
+        return None
+
     def process_choice(self, choice):
         """
         Processes the user's choice and performs the corresponding action.
@@ -87,61 +133,135 @@ class StoreMenu:
             self.checkout()
         elif choice == "6":
             self.cancel_transaction()
+        elif choice == "8":
+            self.load_scan_file()
+        elif choice == "9":
+            self.show_metrics()
+        elif choice == "10":
+            self.show_low_stock()
         elif choice == "7":
-            print("Exiting...")
-            exit()
+            self.output("Exiting...")
+            self.context.close()
+            sys.exit()
 
     def select_customer_type(self):
         """
         Prompts the user to select the customer type (rewards member or regular customer).
         """
-        customer_type = input("Are you a rewards member? (Y/N): ")
+        customer_type = self.input("Are you a rewards member? (Y/N): ")
         rewards_member = True if customer_type.upper() == "Y" else False
-        customer.rewards_member = rewards_member
-        print(customer)
+        context = self.context
+        context.customer.rewards_member = rewards_member
+        self.output(str(context.customer))
+        if len(context.cart):
+            _, _, total = context.cart.totals(context.store, rewards_member)
+            self.output(f"Cart total: ${format_cents(total)}")
 
     def add_item_to_cart(self):
         """
         Prompts the user to add an item to the cart.
+
+        Raises:
+            InvalidInputError: If the quantity is not a positive whole number.
         """
-        item = input("Enter the item: ")
-        quantity = int(input("Enter the quantity: "))
-        store.is_item_available(item, quantity)
-        cart.add_item(item, quantity)
-        store.update_inventory(item, quantity)
-        print(f"{quantity} {item}(s) added to the cart.")
+        store = self.context.store
+        name = self.input("Enter the item: ")
+        try:
+            item = store.resolve_item(name)
+        except ItemNotFoundError:
+            suggestions = store.complete_items(name, 5)
+            if suggestions:
+                self.output(f"Did you mean: {', '.join(suggestions)}?")
+            raise
+        quantity = self.input("Enter the quantity: ").strip()
+        if not quantity.isdecimal() or int(quantity) <= 0:
+            raise InvalidInputError
+        quantity = int(quantity)
+        self.context.register.add_item(item, quantity)
+        self.output(f"{quantity} {item}(s) added to the cart.")
+
+    def load_scan_file(self):
+        """
+        Prompts for a scan file and adds all of its lines to the cart at once.
+        """
+        path = self.input("Enter the scan file (- for standard input): ").strip()
+        if path == "-":
+            added = self.context.register.add_scan(sys.stdin)
+        else:
+            try:
+                with open(path) as file:
+                    added = self.context.register.add_scan(file)
+            except OSError as error:
+                raise InvalidInputError(f"Cannot read {path}: {error.strerror}")
+        self.output(f"{added} item(s) added to the cart.")
+
+    def show_metrics(self):
+        """
+        Displays the recorded operation metrics, as Prometheus text or JSON.
+        """
+        if not metrics_enabled():
+            self.output("Metrics are disabled. Set QUICKMART_METRICS=1 to record them.")
+            return
+        metrics_format = self.input("Format (text/json): ").strip().lower()
+        if metrics_format == "json":
+            self.output(METRICS.to_json())
+        else:
+            self.output(METRICS.to_prometheus().rstrip("\n"))
+
+    def show_low_stock(self):
+        """
+        Displays the items below their reorder threshold, lowest stock first.
+        """
+        self.output("--- Low stock ---")
+        below = self.context.stock_index.below_threshold()
+        if not below:
+            self.output("No items are below their reorder threshold.")
+        for item, quantity, threshold in below:
+            self.output(f"{item}: {quantity} left (reorder below {threshold})")
 
     def delete_item_from_cart(self):
         """
-        Prompts the user to remove an item from the cart.
+        Prompts the user to remove an item from the cart. The item is found
+        by name in any case or by alias, as when adding it.
+
+        Raises:
+            ItemNotFoundError: If no item matches the name.
+            InvalidInputError: If the quantity is given but not a positive whole number.
         """
-        item_name = input("Enter the name of the item to remove (All for empty cart): ")
+        item_name = self.input("Enter the name of the item to remove (All for empty cart): ")
+        register = self.context.register
         if item_name.title() == "All":
-            del cart.items
+            register.clear()
         else:
-            cart.remove_item(item_name)
+            item = self.context.store.resolve_item(item_name)
+            quantity = self.input("Enter the quantity to remove (blank for all): ").strip()
+            if quantity and (not quantity.isdecimal() or int(quantity) <= 0):
+                raise InvalidInputError
+            register.remove_item(item, int(quantity) if quantity else None)
 
     def view_cart(self):
         """
         Displays the contents of the cart.
         """
-        print("--- Cart ---")
-        for item, quantity in cart.items:
-            print(f"{item}: {quantity}")
+        context = self.context
+        self.output("--- Cart ---")
+        rewards_member = context.customer.rewards_member
+        for line in context.cart.calculate_total(context.store, rewards_member):
+            self.output(f"{line.item}: {line.quantity}  ${format_cents(line.total)}")
+        subtotal, taxes, total = context.cart.totals(context.store, rewards_member)
+        self.output(f"Subtotal: ${format_cents(subtotal)}, Taxes: ${format_cents(taxes)}, Total: ${format_cents(total)}")
 
     def checkout(self):
         """
         Performs the checkout process.
         """
-        rewards_member = customer.rewards_member
-        print("Checkout successful!")         
-        receipt.generate_receipt(cart, store, rewards_member)               
-        store.save_inventory()
-        del cart.items
+        context = self.context
+        self.output("Checkout successful!")         
+        context.register.checkout(context.receipt)
 
     def cancel_transaction(self):
         """
         Cancels the current transaction and clears the cart.
         """
-        del cart.items
-        print("Transaction canceled. Cart cleared.")
+        self.context.register.clear()
+        self.output("Transaction canceled. Cart cleared.")
@@ -0,0 +1,163 @@
+"""
+Register lanes running in separate processes over one shared inventory.
+
+Pricing and receipt rendering hold the GIL, so register threads in one
+process share a single core. A RegisterPool starts one process per lane
+instead; all of them sell from a SharedMemoryStore, and each writes its
+receipts to its own lane directory with its own transaction numbers.
+
+Sessions are sent to the lanes in chunks, a list of
+(rewards_member, [(item, quantity), ...]) tuples each, and every lane
+answers a chunk with one SessionResult per session.
+"""
+import contextlib
+import multiprocessing
+import os
+import queue
+from collections import namedtuple
+
+from classes.customer import Customer
+from classes.receipt import Receipt
+from classes.register import Register
+from classes.shared_store import SharedMemoryStore
+
+SessionResult = namedtuple("SessionResult", ["lane", "total", "error"])
+
+# Seconds between checks that every lane is still running while waiting for results.
+LANE_CHECK_INTERVAL = 1.0
+
+
+def run_lane(store, lane, receipt_directory, sessions, results):
+    """
+    Runs sessions for one lane until it receives None.
+
+    Receipts go to the lane's own directory. Their totals would be printed
+    for the cashier; a lane process has none, so its output is discarded.
+
+    Args:
+        store (SharedMemoryStore): The shared store, attached to in this process.
+        lane (int): The lane number.
+        receipt_directory (str): The directory holding the lane directories.
+        sessions (multiprocessing.Queue): The chunks of sessions to run.
+        results (multiprocessing.Queue): Receives the results of each chunk.
+    """
+    receipt = Receipt(os.path.join(receipt_directory, f"lane-{lane:02d}"))
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for chunk in iter(sessions.get, None):
+            results.put([run_session(store, lane, receipt, *session) for session in chunk])
+    receipt.close()
+    store.close()
+
+
+def run_session(store, lane, receipt, rewards_member, items):
+    """
+    Adds the items to a new cart and checks out.
+
+    Args:
+        store (SharedMemoryStore): The shared store.
+        lane (int): The lane number.
+        receipt (Receipt): The lane's receipt writer.
+        rewards_member (bool): Whether the customer is a rewards member.
+        items (list): (item, quantity) tuples.
+
+    Returns:
+        SessionResult: The total in cents, or the error that cancelled the
+            session. Any exception cancels the session rather than the lane.
+    """
+    register = Register(store, customer=Customer(rewards_member))
+    try:
+        for item, quantity in items:
+            register.add_item(item, quantity)
+        _, _, total = register.cart.totals(store, rewards_member)
+        register.checkout(receipt)
+    except Exception as error:
+        register.clear()
+        return SessionResult(lane, None, f"{type(error).__name__}: {error}")
+    return SessionResult(lane, total, None)
+
+
+class RegisterPool:
+    """
+    Runs register sessions in worker processes sharing one inventory.
+
+    Attributes:
+        store (SharedMemoryStore): The shared store, owned by this process.
+        workers (int): The number of lane processes.
+        receipt_directory (str): The directory holding the lane receipt directories.
+    """
+    def __init__(self, inventory_file, workers=None, receipt_directory="assets/receipts"):
+        """
+        Initializes a RegisterPool object, loading the inventory into shared
+        memory and starting the lane processes.
+
+        Args:
+            inventory_file (str): The path to the inventory file.
+            workers (int): The number of lane processes. Defaults to the number of CPUs.
+            receipt_directory (str): The directory holding the lane receipt directories.
+        """
+        self.store = SharedMemoryStore(inventory_file)
+        self.workers = workers or os.cpu_count() or 1
+        self.receipt_directory = receipt_directory
+        self._sessions = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        self._processes = [
+            multiprocessing.Process(
+                target=run_lane,
+                args=(self.store, lane, receipt_directory, self._sessions, self._results),
+                daemon=True,
+            )
+            for lane in range(1, self.workers + 1)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def run(self, sessions, chunk_size=16):
+        """
+        Runs sessions on the lanes and waits for all of them.
+
+        The lanes journal every sale as it is checked out. Once all the
+        sessions are done no stock is held, so the inventory file is then
+        compacted with the shared quantities.
+
+        Args:
+            sessions (list): (rewards_member, [(item, quantity), ...]) tuples.
+            chunk_size (int): The number of sessions sent to a lane at once.
+
+        Returns:
+            list: The SessionResult of every session, in completion order.
+
+        Raises:
+            ChildProcessError: If a lane process exited, so its chunk will never be answered.
+        """
+        chunks = 0
+        for start in range(0, len(sessions), chunk_size):
+            self._sessions.put(sessions[start:start + chunk_size])
+            chunks += 1
+        results = []
+        while chunks:
+            try:
+                results.extend(self._results.get(timeout=LANE_CHECK_INTERVAL))
+            except queue.Empty:
+                for lane, process in enumerate(self._processes, 1):
+                    if not process.is_alive():
+                        raise ChildProcessError(f"Register lane {lane} exited with code {process.exitcode}.")
+                continue
+            chunks -= 1
+        self.store.compact_inventory()
+        return results
+
+    def close(self):
+        """
+        Stops the lanes, saves the inventory and frees the shared memory.
+        """
+        for _ in self._processes:
+            self._sessions.put(None)
+        for process in self._processes:
+            process.join()
+        self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
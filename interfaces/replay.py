@@ -0,0 +1,227 @@
+"""
+Headless replay of recorded menu sessions.
+
+A session script is the sequence of answers a cashier typed at the menu, one
+per line: the menu choice followed by the answers to that choice's prompts.
+A transcript recorded with `tee session.txt | python main.py` replays as is.
+Lines starting with '#' are comments; blank lines are answers.
+
+    # a rewards member buys two milks and checks out
+    1
+    Y
+    2
+    Milk
+    2
+    5
+
+The replay runs against a scratch copy of the inventory, so recorded sessions
+never touch the real databases, and times every menu operation.
+
+Usage:
+    python -m interfaces.replay SCRIPT [--inventory FILE] [--database] [--echo]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from functools import partial
+
+from classes.errors import InvalidInputError
+from interfaces.context import AppContext
+from interfaces.menu import StoreMenu
+
+OPERATIONS = {
+    "1": "customer",
+    "2": "add",
+    "3": "remove",
+    "4": "view",
+    "5": "checkout",
+    "6": "cancel",
+    "7": "exit",
+    "8": "scan",
+    "9": "metrics",
+    "10": "low_stock",
+}
+
+
+def read_script(lines):
+    """
+    Reads the answers of a session script.
+
+    Args:
+        lines (iterable): The lines of the script.
+
+    Returns:
+        list: The answers, in order, without their line endings.
+    """
+    return [line.rstrip("\r\n") for line in lines if not line.startswith("#")]
+
+
+def scratch_context(inventory_file, directory, database=False):
+    """
+    Creates a context working on a copy of an inventory inside a scratch directory.
+
+    Args:
+        inventory_file (str): The inventory file to copy.
+        directory (str): The directory holding the copy, the receipts and the ledger.
+        database (bool): Whether to back the store with a SQLite database
+            filled from the copy.
+
+    Returns:
+        AppContext: The context.
+    """
+    copy = os.path.join(directory, "inventory.txt")
+    shutil.copy(inventory_file, copy)
+    return AppContext(
+        inventory_file=copy,
+        receipt_directory=os.path.join(directory, "receipts"),
+        ledger_directory=os.path.join(directory, "ledger"),
+        database_file=os.path.join(directory, "inventory.db") if database else None,
+    )
+
+
+class _NullOutput:
+    """
+    A text stream that discards everything written to it.
+    """
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class ReplayResult:
+    """
+    The outcome of replaying a session script.
+
+    Attributes:
+        timings (dict): A dictionary mapping operation names to the duration
+            of each of their runs, in seconds.
+        transactions (int): The number of successful checkouts.
+        errors (list): The messages of the choices that failed.
+        elapsed (float): The wall time of the whole replay, in seconds.
+        exited (bool): Whether the script ended by choosing Exit.
+    """
+    def __init__(self):
+        """
+        Initializes an empty ReplayResult object.
+        """
+        self.timings = {}
+        self.transactions = 0
+        self.errors = []
+        self.elapsed = 0.0
+        self.exited = False
+
+    @property
+    def transactions_per_second(self):
+        """
+        The number of checkouts per second of replay.
+        """
+        return self.transactions / self.elapsed if self.elapsed else 0.0
+
+
+class ReplayDriver:
+    """
+    Drives a StoreMenu from a script instead of a terminal.
+
+    Attributes:
+        context (AppContext): The session context the menu operates on.
+        stdout (file): Receives everything the session prints.
+    """
+    def __init__(self, context, stdout=None):
+        """
+        Initializes a ReplayDriver object.
+
+        Args:
+            context (AppContext): The session context the menu operates on.
+            stdout (file): Receives everything the session prints. The output
+                is discarded when none is given.
+        """
+        self.context = context
+        self.stdout = stdout if stdout is not None else _NullOutput()
+
+    def run(self, answers):
+        """
+        Replays a session, the way main runs it, until the answers run out or
+        the script chooses Exit.
+
+        The context is left open unless the script exits; the caller closes it.
+
+        Args:
+            answers (iterable): The answers of the session script.
+
+        Returns:
+            ReplayResult: The timings and outcome of the replay.
+
+        Raises:
+            InvalidInputError: If the script ends in the middle of a choice.
+        """
+        remaining = iter(answers)
+
+        def read(prompt=""):
+            try:
+                return next(remaining)
+            except StopIteration:
+                raise EOFError from None
+
+        menu = StoreMenu(self.context, input=read, output=partial(print, file=self.stdout))
+        result = ReplayResult()
+        timings = result.timings
+        clock = time.perf_counter
+        with redirect_stdout(self.stdout):
+            start = clock()
+            while True:
+                menu.display_menu()
+                try:
+                    choice = menu.get_user_choice()
+                except EOFError:
+                    break
+                operation = OPERATIONS.get(choice, "invalid")
+                began = clock()
+                try:
+                    error_message = menu.run_choice(choice)
+                except SystemExit:
+                    result.exited = True
+                    break
+                except EOFError:
+                    raise InvalidInputError(f"Script ended during the {operation} choice") from None
+                timings.setdefault(operation, []).append(clock() - began)
+                if error_message is not None:
+                    result.errors.append(error_message)
+                elif operation == "checkout":
+                    result.transactions += 1
+            result.elapsed = clock() - start
+        return result
+
+
+def main():
+    """
+    Parses the command line, replays a script and prints a timing summary.
+    """
+    parser = argparse.ArgumentParser(description="Replay a recorded register session")
+    parser.add_argument("script")
+    parser.add_argument("--inventory", default="databases/inventory.txt")
+    parser.add_argument("--database", action="store_true", help="back the store with SQLite")
+    parser.add_argument("--echo", action="store_true", help="print the session output")
+    args = parser.parse_args()
+    with open(args.script) as file:
+        answers = read_script(file)
+    with tempfile.TemporaryDirectory() as directory:
+        context = scratch_context(args.inventory, directory, args.database)
+        driver = ReplayDriver(context, sys.stdout if args.echo else None)
+        result = driver.run(answers)
+        if not result.exited:
+            context.close()
+    print(f"{'operation':<10} {'count':>6} {'mean ms':>9}")
+    for operation, samples in sorted(result.timings.items()):
+        print(f"{operation:<10} {len(samples):>6} {sum(samples) / len(samples) * 1000:>9.3f}")
+    print(f"{result.transactions} transaction(s) in {result.elapsed:.3f}s, "
+          f"{result.transactions_per_second:.1f}/s, {len(result.errors)} error(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Multi-register point of sale server.
+
+Each connection is one register session with its own cart and customer. All
+sessions share one store and commit through a single inventory writer.
+Requests and responses are JSON objects, one per line:
+
+    {"op": "customer", "rewards_member": true}
+    {"op": "add", "item": "Milk", "quantity": 2}
+    {"op": "remove", "item": "Milk", "quantity": 1}
+    {"op": "view"}
+    {"op": "checkout"}
+    {"op": "cancel"}
+
+Every response has an "ok" field; failed requests carry "error" (the
+exception name) and "message".
+
+Usage:
+    python -m interfaces.server [--inventory FILE] [--host HOST] [--port PORT] [--unix PATH]
+"""
+import argparse
+import asyncio
+import json
+import signal
+
+from classes.errors import (InsufficientQuantityError, InvalidInputError,
+                            ItemNotFoundError, ReservationError)
+from classes.pricing import format_cents
+from classes.register import Register
+from classes.store import Store
+from interfaces.inventory_writer import InventoryWriter
+
+CLIENT_ERRORS = (InsufficientQuantityError, InvalidInputError, ItemNotFoundError, ReservationError)
+
+
+class RegisterServer:
+    """
+    Hosts many concurrent register sessions in front of one store.
+
+    Attributes:
+        store (Store): The store shared by all sessions.
+        writer (InventoryWriter): The writer serializing inventory saves.
+        sessions (int): The number of open sessions.
+    """
+    def __init__(self, store):
+        """
+        Initializes a RegisterServer object.
+
+        Args:
+            store (Store): The store shared by all sessions.
+        """
+        self.store = store
+        self.writer = InventoryWriter(store)
+        self.sessions = 0
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """
+        Starts listening on a TCP port, or on a Unix socket if a path is given.
+
+        Args:
+            host (str): The host to bind.
+            port (int): The TCP port to bind, 0 for any free port.
+            unix_path (str): The path of the Unix socket to bind.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        self.writer.start()
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._serve_session, unix_path)
+        else:
+            self._server = await asyncio.start_server(self._serve_session, host, port)
+        return self._server
+
+    async def close(self):
+        """
+        Stops accepting sessions and saves the outstanding sales.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.writer.close()
+
+    async def _serve_session(self, reader, writer):
+        """
+        Runs one register session until the client disconnects.
+
+        Stock still reserved by the session when it ends is released.
+
+        Args:
+            reader (asyncio.StreamReader): The client's request stream.
+            writer (asyncio.StreamWriter): The client's response stream.
+        """
+        register = Register(self.store)
+        self.sessions += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_request(register, line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            register.clear()
+            writer.close()
+
+    async def handle_request(self, register, line):
+        """
+        Performs one request of a session.
+
+        Args:
+            register (Register): The session's register.
+            line (bytes): The JSON-encoded request.
+
+        Returns:
+            dict: The response.
+        """
+        try:
+            try:
+                request = json.loads(line)
+                op = request["op"]
+            except (ValueError, KeyError, TypeError):
+                raise InvalidInputError("Requests must be JSON objects with an 'op' field.")
+            if op == "customer":
+                register.customer.rewards_member = bool(request.get("rewards_member"))
+                return {"ok": True, "customer": str(register.customer)}
+            if op == "add":
+                register.add_item(self._item(request), self._quantity(request, required=True))
+                return {"ok": True}
+            if op == "remove":
+                removed = register.remove_item(self._item(request), self._quantity(request))
+                return {"ok": True, "removed": removed}
+            if op == "view":
+                return self._cart_response(register)
+            if op == "checkout":
+                return await self._checkout(register)
+            if op == "cancel":
+                register.clear()
+                return {"ok": True}
+            raise InvalidInputError(f"Unknown op: {op!r}")
+        except CLIENT_ERRORS as error:
+            return {"ok": False, "error": type(error).__name__, "message": str(error)}
+
+    def _item(self, request):
+        """
+        Reads the item of an add or remove request.
+
+        Args:
+            request (dict): The request.
+
+        Returns:
+            str: The item.
+
+        Raises:
+            InvalidInputError: If the item is missing or not a string.
+        """
+        item = request.get("item")
+        if type(item) is not str:
+            raise InvalidInputError("The item must be a string.")
+        return item
+
+    def _quantity(self, request, required=False):
+        """
+        Reads the quantity of an add or remove request.
+
+        Args:
+            request (dict): The request.
+            required (bool): Whether the quantity must be present.
+
+        Returns:
+            int: The quantity, or None if it is absent and not required.
+
+        Raises:
+            InvalidInputError: If the quantity is missing or not a positive integer.
+        """
+        quantity = request.get("quantity")
+        if quantity is None and not required:
+            return None
+        if type(quantity) is not int or quantity <= 0:
+            raise InvalidInputError("The quantity must be a positive integer.")
+        return quantity
+
+    def _cart_response(self, register):
+        """
+        Describes the session's cart.
+
+        Args:
+            register (Register): The session's register.
+
+        Returns:
+            dict: The cart lines and totals, with amounts as dollar strings.
+        """
+        rewards_member = register.customer.rewards_member
+        lines = register.cart.calculate_total(self.store, rewards_member)
+        subtotal, tax, total = register.cart.totals(self.store, rewards_member)
+        return {
+            "ok": True,
+            "lines": [
+                {"item": line.item, "quantity": line.quantity, "total": format_cents(line.total)}
+                for line in lines
+            ],
+            "subtotal": format_cents(subtotal),
+            "tax": format_cents(tax),
+            "total": format_cents(total),
+        }
+
+    async def _checkout(self, register):
+        """
+        Commits the session's cart and waits until the sale is journaled.
+
+        Args:
+            register (Register): The session's register.
+
+        Returns:
+            dict: The cart lines and totals of the completed sale.
+        """
+        register.commit()
+        response = self._cart_response(register)
+        register.clear()
+        await self.writer.save()
+        return response
+
+
+async def serve(inventory_file, host, port, unix_path):
+    """
+    Runs the server until it is interrupted or terminated.
+
+    Args:
+        inventory_file (str): The path to the inventory file.
+        host (str): The host to bind.
+        port (int): The TCP port to bind.
+        unix_path (str): The path of the Unix socket to bind, or None for TCP.
+    """
+    server = RegisterServer(Store(inventory_file, use_snapshot=True))
+    listener = await server.start(host, port, unix_path)
+    print("Serving on", ", ".join(str(sock.getsockname()) for sock in listener.sockets), flush=True)
+    stopped = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+    try:
+        await stopped.wait()
+    finally:
+        await server.close()
+
+
+def main():
+    """
+    Parses the command line and runs the server.
+    """
+    parser = argparse.ArgumentParser(description="Jerrys Quick Mart register server")
+    parser.add_argument("--inventory", default="databases/inventory.txt")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.inventory, args.host, args.port, args.unix_path))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,43 @@
-from classes.errors import (InsufficientQuantityError, InvalidInputError,
-                    ItemNotFoundError)
+import os
+
 from classes.logger import ErrorLogger
+from classes.metrics import enable_metrics, install_dump_signal
+from interfaces.context import AppContext
 from interfaces.menu import StoreMenu
 
 LOGGER = ErrorLogger()
+METRICS_FILE = "logs/metrics.prom"
 
 
 def main():
     """
     The main function that runs the store application.
+
+    Setting QUICKMART_METRICS=1 records operation metrics, which the menu
+    shows and SIGUSR1 writes to logs/metrics.prom. Setting
+    QUICKMART_WATCH_INVENTORY=1 applies edits of the inventory file while
+    the application runs. QUICKMART_RECEIPT_FORMAT selects the format of
+    receipt files: text (the default), jsonl or csv.
     """
-    menu = StoreMenu()
+    if os.environ.get("QUICKMART_METRICS") == "1":
+        enable_metrics()
+        install_dump_signal(
+            METRICS_FILE, on_error=lambda error: LOGGER.log_error(f"Metrics dump failed: {error}")
+        )
+    menu = StoreMenu(AppContext(
+        receipt_format=os.environ.get("QUICKMART_RECEIPT_FORMAT", "text"),
+        on_receipt_error=lambda path, error: LOGGER.log_error(f"Receipt {path} could not be written: {error}")
+    ))
+    if os.environ.get("QUICKMART_WATCH_INVENTORY") == "1":
+        menu.context.watch_inventory(
+            on_error=lambda error: LOGGER.log_error(f"Inventory reload failed: {error}")
+        )
     while True:
         menu.display_menu()
         choice = menu.get_user_choice()
-        try:
-            menu.validate_choice(choice)
-            menu.process_choice(choice)
-        except InvalidInputError:
-            error_message = f"Invalid input: {choice}"
-            print(f"{error_message}, please try again!!")
-            LOGGER.log_error(error_message)
-        except ItemNotFoundError as infe:
-            error_message = f"Item not found error: {infe}"
-            print(error_message)
-            LOGGER.log_error(error_message)
-        except InsufficientQuantityError as iqe:
-            error_message = f"Insufficient Quantity Error: {iqe}"
-            print(error_message)
-            LOGGER.log_error(error_message)
+        error_message = menu.run_choice(choice)
+        if error_message is not None:
+            LOGGER.log_error(error_message, choice=choice, **menu.context.transaction_context())
 
 
 if __name__ == "__main__":
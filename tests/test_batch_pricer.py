@@ -0,0 +1,60 @@
+import unittest
+
+from classes.batch_pricer import BatchPricer, CartTotals
+from classes.cart import Cart
+from classes.columnar_store import ColumnarStore
+from classes.errors import ItemNotFoundError
+from classes.pricing import PricingEngine
+from classes.promotions import MEMBER_COUPON, MULTI_BUY, PromotionTable, parse_promotion
+from classes.store import Store
+
+
+class BatchPricerTest(unittest.TestCase):
+    def setUp(self):
+        self.store = Store("tests/test_inventory.txt")
+        self.carts = {}
+        for cart_id, lines in (("a", [("Milk", 2), ("Red Bull", 3)]), ("b", [("Red Bull", 1)])):
+            cart = Cart()
+            for item, quantity in lines:
+                cart.add_item(item, quantity)
+            self.carts[cart_id] = cart
+
+    def test_reprice_carts_matches_per_cart_pricing(self):
+        members = {"b": True}
+        engine = PricingEngine()
+        for store in (self.store, ColumnarStore("tests/test_inventory.txt")):
+            result = BatchPricer(store).reprice_carts(self.carts, members)
+            for cart_id, cart in self.carts.items():
+                lines = cart.calculate_total(store, members.get(cart_id, False))
+                self.assertEqual(result.carts[cart_id], CartTotals(*engine.totals(lines)))
+            self.assertEqual(result.tax, 84 + 26)
+            self.assertEqual(result.total, 2124 + 426)
+
+    def test_promotions_apply_before_tax(self):
+        promotions = PromotionTable.compile([
+            parse_promotion({"type": MULTI_BUY, "item": "Red Bull", "quantity": 2, "price_cents": 700}),
+            parse_promotion({"type": MEMBER_COUPON, "item": "Milk", "amount_off_cents": 50}),
+        ], self.store)
+        engine = PricingEngine(promotions=promotions)
+        members = {"a": True}
+        result = BatchPricer(self.store, promotions=promotions).reprice_carts(self.carts, members)
+        for cart_id, cart in self.carts.items():
+            lines = engine.price_items(self.store, cart.items, members.get(cart_id, False))
+            self.assertEqual(result.carts[cart_id], CartTotals(*engine.totals(lines)))
+        self.assertEqual(result.carts["a"].subtotal, 2 * 300 + 700 + 400)
+
+    def test_reprice_table_with_interleaved_lines(self):
+        result = BatchPricer(self.store).reprice_table(
+            ["a", "b", "a"], ["Milk", "Red Bull", "Red Bull"], [2, 1, 3], {"b": True}
+        )
+        self.assertEqual(list(result.carts), ["a", "b"])
+        self.assertEqual(result.carts["a"], CartTotals(2040, 84, 2124))
+        self.assertEqual(result.carts["b"], CartTotals(400, 26, 426))
+
+    def test_unknown_item(self):
+        with self.assertRaises(ItemNotFoundError):
+            BatchPricer(self.store).reprice_table(["a"], ["Water"], [1], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
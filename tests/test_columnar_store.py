@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.columnar_store import ColumnarStore
+from classes.errors import InsufficientQuantityError, ItemNotFoundError
+
+
+class ColumnarStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = ColumnarStore("tests/test_inventory.txt")
+
+    def test_get_item_price_regular_customer(self):
+        price = self.store.get_item_price("Milk", rewards_member=False)
+        self.assertEqual(price, 3.75)
+
+    def test_get_item_price_rewards_member(self):
+        price = self.store.get_item_price("Milk", rewards_member=True)
+        self.assertEqual(price, 3.50)
+
+    def test_get_item_price_not_found(self):
+        with self.assertRaises(ItemNotFoundError):
+            self.store.get_item_price("Water", rewards_member=False)
+
+    def test_update_inventory(self):
+        self.store.update_inventory("Milk", 2)
+        self.assertTrue(self.store.is_item_available("Milk", 3))
+        with self.assertRaises(InsufficientQuantityError):
+            self.store.is_item_available("Milk", 4)
+
+    def test_get_item_tax_status(self):
+        self.assertEqual(self.store.get_item_tax_status("Milk"), "Tax-Exempt")
+        self.assertEqual(self.store.get_item_tax_status("Red Bull"), "Taxable")
+
+    def test_compaction_round_trip(self):
+        directory = tempfile.mkdtemp()
+        try:
+            inventory_file = os.path.join(directory, "inventory.txt")
+            shutil.copy("tests/test_inventory.txt", inventory_file)
+            store = ColumnarStore(inventory_file)
+            store.update_inventory("Red Bull", 4)
+            store.save_inventory()
+            store.compact_inventory()
+            with open(inventory_file, "r") as file:
+                self.assertEqual(
+                    file.read(),
+                    "Milk: 5, $3.75, $3.50, Tax-Exempt\n"
+                    "Red Bull: 6, $4.30, $4.00, Taxable\n",
+                )
+        finally:
+            shutil.rmtree(directory)
+
+    def tearDown(self):
+        self.store = None
+
+
+if __name__ == "__main__":
+    unittest.main()
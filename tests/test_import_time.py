@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_US = 300_000
+
+
+def import_profile(module, cwd):
+    """
+    Imports a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: The completed process and a dict of cumulative import times in microseconds.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1")
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    cumulative = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    return process, cumulative
+
+
+class ImportTimeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_import_does_not_touch_disk(self):
+        # The working directory has no databases/, assets/ or logs/ folders,
+        # so any eager Store, Receipt or log handler would fail the import.
+        process, _ = import_profile("main", self.directory)
+        self.assertEqual(process.returncode, 0, process.stderr[-2000:])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_import_time_budget(self):
+        process, cumulative = import_profile("interfaces.menu", self.directory)
+        self.assertEqual(process.returncode, 0, process.stderr[-2000:])
+        self.assertLess(cumulative["interfaces.menu"], IMPORT_BUDGET_US)
+
+    def tearDown(self):
+        os.rmdir(self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.errors import InventoryFormatError
+from classes.inventory_parser import InventoryParser, format_inventory_line
+from classes.store import Store
+
+
+class InventoryParserTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = InventoryParser()
+
+    def test_parse_well_formed_inventory(self):
+        with open("tests/test_inventory.txt", "rb") as file:
+            rows = self.parser.parse(file.read())
+        self.assertEqual(
+            rows,
+            [
+                ("Milk", 5, 375, 350, "Tax-Exempt"),
+                ("Red Bull", 10, 430, 400, "Taxable"),
+            ],
+        )
+
+    def test_parse_loose_prices_and_blank_lines(self):
+        rows = self.parser.parse(b"Milk: 5, $3.5, $3, Tax-Exempt\r\n\nBeer: 1, $5.10, $5.70, Taxable")
+        self.assertEqual(
+            rows,
+            [("Milk", 5, 350, 300, "Tax-Exempt"), ("Beer", 1, 510, 570, "Taxable")],
+        )
+
+    def test_malformed_lines_raise_with_line_numbers(self):
+        data = b"Milk: 5, $3.75, $3.50, Tax-Exempt\nMilk 5\nBeer: x, $1.00, $1.00, Taxable\n"
+        with self.assertRaises(InventoryFormatError) as context:
+            self.parser.parse(data)
+        self.assertEqual([error[0] for error in context.exception.errors], [2, 3])
+        self.assertTrue(str(context.exception).startswith("Line 2:"))
+
+    def test_misaligned_lines_raise(self):
+        # Ten fields over two lines: the extra field of line 1 makes up for the missing one of line 2.
+        data = b"Milk: 1, $1.00, $2.00, Taxable, 5\n7, $3.00, $4.00, Taxable"
+        with self.assertRaises(InventoryFormatError) as context:
+            self.parser.parse(data)
+        self.assertEqual([error[0] for error in context.exception.errors], [1, 2])
+
+    def test_malformed_lines_are_skipped(self):
+        parser = InventoryParser(skip_errors=True)
+        rows = parser.parse(b"Milk 5\nBeer: 1, $5.10, $5.70, Taxable\n")
+        self.assertEqual(rows, [("Beer", 1, 510, 570, "Taxable")])
+        self.assertEqual(parser.errors[0][:2], (1, "Milk 5"))
+
+    def test_format_inventory_line_round_trip(self):
+        line = format_inventory_line("Flour", 49, 310, 275, "Tax-Exempt")
+        self.assertEqual(line, "Flour: 49, $3.10, $2.75, Tax-Exempt\n")
+        self.assertEqual(self.parser.parse(line.encode()), [("Flour", 49, 310, 275, "Tax-Exempt")])
+
+    def test_store_records_skipped_lines(self):
+        directory = tempfile.mkdtemp()
+        try:
+            inventory_file = os.path.join(directory, "inventory.txt")
+            shutil.copy("tests/test_inventory.txt", inventory_file)
+            with open(inventory_file, "a") as file:
+                file.write("\nBroken line\n")
+            with self.assertRaises(InventoryFormatError):
+                Store(inventory_file)
+            store = Store(inventory_file, skip_invalid_lines=True)
+            self.assertEqual(store.load_errors[0][0], 3)
+            self.assertEqual(store.get_item_price("Milk", rewards_member=False), 3.75)
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from classes.cart import Cart
+from classes.columnar_store import ColumnarStore
+from classes.errors import InsufficientQuantityError, InventoryFormatError, ItemNotFoundError
+from classes.inventory_diff import diff_inventory
+from classes.inventory_watcher import InventoryWatcher
+from classes.register import Register
+from classes.reservation import ACTIVE, EXPIRED, RELEASED
+from classes.store import Store
+
+MILK = "Milk: 5, $3.75, $3.50, Tax-Exempt\n"
+RED_BULL = "Red Bull: 10, $4.30, $4.00, Taxable\n"
+
+
+class InventoryReloadTest(unittest.TestCase):
+    store_class = Store
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        self.write(MILK + RED_BULL)
+        self.store = self.store_class(self.inventory_file)
+        self.store.reload_inventory()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, text):
+        with open(self.inventory_file, "w") as file:
+            file.write(text)
+
+    def test_diff_parses_changed_lines_only(self):
+        delta = diff_inventory(
+            (MILK + RED_BULL).encode(),
+            (MILK + "Red Bull: 4, $4.50, $4.00, Taxable\nWater: 7, $1.00, $0.90, Tax-Exempt\n").encode(),
+        )
+        self.assertEqual(delta.columns[0], ["Red Bull", "Water"])
+        self.assertEqual(list(delta.columns[1]), [-6, 7])
+        self.assertEqual(delta.removed, [])
+
+    def test_unchanged_file(self):
+        self.assertIsNone(self.store.reload_inventory())
+
+    def test_quantity_change_adjusts_stock_after_sales(self):
+        self.store.commit(self.store.reserve("Milk", 2))
+        self.store.save_inventory()
+        self.write("Milk: 15, $3.95, $3.50, Tax-Exempt\n" + RED_BULL)
+        reload = self.store.reload_inventory()
+        self.assertEqual((reload.changed, reload.added, reload.removed), (["Milk"], [], []))
+        self.assertEqual(self.store.get_item_pricing("Milk", False), (395, False))
+        self.assertEqual(self.store.version, 1)
+        self.assertTrue(self.store.is_item_available("Milk", 13))
+        self.assertIsNone(self.store.reload_inventory())
+        # The journaled sale still applies to the edited file.
+        reloaded = self.store_class(self.inventory_file)
+        self.assertTrue(reloaded.is_item_available("Milk", 13))
+        with self.assertRaises(InsufficientQuantityError):
+            reloaded.is_item_available("Milk", 14)
+
+    def test_added_and_removed_items(self):
+        reservation = self.store.reserve("Milk", 1)
+        cart = Cart(store=self.store)
+        cart.add_item("Milk", 1)
+        cart.add_item("Red Bull", 1)
+        self.write("Red Bull: 10, $5.00, $4.00, Taxable\nWater: 7, $1.00, $0.90, Tax-Exempt\n")
+        reload = self.store.reload_inventory()
+        self.assertEqual((reload.changed, reload.added, reload.removed), (["Red Bull"], ["Water"], ["Milk"]))
+        self.assertEqual(reload.reservations, [reservation])
+        self.assertEqual(reservation.state, RELEASED)
+        self.assertEqual(self.store.resolve_item("water"), "Water")
+        self.assertEqual(cart.totals(self.store, rewards_member=False), (500, 33, 533))
+        self.assertEqual(cart.items, [("Red Bull", 1)])
+        self.store.compact_inventory()
+        with open(self.inventory_file) as file:
+            self.assertEqual(file.read(), "Red Bull: 10, $5.00, $4.00, Taxable\nWater: 7, $1.00, $0.90, Tax-Exempt\n")
+
+    def test_reload_keeps_runtime_aliases(self):
+        self.store.add_item_alias("SKU-1", "Red Bull")
+        self.store.add_item_alias("SKU-2", "Milk")
+        self.write("Red Bull: 10, $5.00, $4.00, Taxable\nWater: 7, $1.00, $0.90, Tax-Exempt\n")
+        self.store.reload_inventory()
+        self.assertEqual(self.store.resolve_item("sku-1"), "Red Bull")
+        self.assertEqual(self.store.complete_items("w"), ["Water"])
+        with self.assertRaises(ItemNotFoundError):
+            self.store.resolve_item("SKU-2")
+        with self.assertRaises(ItemNotFoundError):
+            self.store.resolve_item("milk")
+
+    def test_register_after_item_removed(self):
+        register = Register(self.store)
+        register.add_item("Milk", 2)
+        register.add_item("Red Bull", 1)
+        self.write(RED_BULL)
+        self.store.reload_inventory()
+        with self.assertRaises(ItemNotFoundError):
+            register.remove_item("Milk", 1)
+        register.clear()
+        self.assertTrue(self.store.is_item_available("Red Bull", 10))
+        self.assertEqual(len(register.cart), 0)
+
+    def test_reservations_are_reconciled(self):
+        first = self.store.reserve("Red Bull", 4)
+        second = self.store.reserve("Red Bull", 5)
+        self.write(MILK + "Red Bull: 6, $4.30, $4.00, Taxable\n")
+        reload = self.store.reload_inventory()
+        self.assertEqual(reload.reservations, [second])
+        self.assertEqual((first.state, second.state), (ACTIVE, EXPIRED))
+        self.assertTrue(self.store.is_item_available("Red Bull", 2))
+        self.store.commit(first)
+        with self.assertRaises(InsufficientQuantityError):
+            self.store.commit(second)
+
+    def test_malformed_line_applies_nothing(self):
+        self.write(MILK + "Red Bull: 4, $4.50, $4.00, Taxable\nWater: seven\n")
+        with self.assertRaises(InventoryFormatError) as context:
+            self.store.reload_inventory()
+        self.assertEqual(context.exception.errors[0][0], 3)
+        self.assertTrue(self.store.is_item_available("Red Bull", 10))
+        self.assertEqual(self.store.version, 0)
+
+    def test_own_compaction_is_not_a_change(self):
+        self.store.commit(self.store.reserve("Milk", 2))
+        self.store.save_inventory()
+        self.store.compact_inventory()
+        self.assertIsNone(self.store.reload_inventory())
+        self.assertTrue(self.store.is_item_available("Milk", 3))
+
+    def test_change_before_first_reload(self):
+        store = self.store_class(self.inventory_file)
+        store.commit(store.reserve("Milk", 2))
+        store.save_inventory()
+        self.write("Milk: 5, $3.75, $3.50, Tax-Exempt\nRed Bull: 12, $4.30, $4.00, Taxable\n")
+        reload = store.reload_inventory()
+        self.assertEqual(reload.changed, ["Milk", "Red Bull"])
+        # The file was compared with the committed quantities, so it wins.
+        self.assertTrue(store.is_item_available("Milk", 5))
+        self.assertTrue(store.is_item_available("Red Bull", 12))
+        self.assertIsNone(store.reload_inventory())
+
+    def test_watcher_polling(self):
+        self.check_watcher(use_inotify=False)
+
+    def test_watcher_inotify(self):
+        if not self.check_watcher(use_inotify=True):
+            self.skipTest("inotify is not available")
+
+    def test_watcher_survives_failing_callback(self):
+        errors = []
+        failed = threading.Semaphore(0)
+
+        def on_reload(reload):
+            raise RuntimeError("promotions are broken")
+
+        def on_error(error):
+            errors.append(error)
+            failed.release()
+
+        with InventoryWatcher(self.store, interval=0.02, on_reload=on_reload, on_error=on_error,
+                              use_inotify=False):
+            for quantity in (11, 120):
+                self.write(MILK + f"Red Bull: {quantity}, $4.30, $4.00, Taxable\n")
+                self.assertTrue(failed.acquire(timeout=5))
+        self.assertEqual([str(error) for error in errors], ["promotions are broken"] * 2)
+        self.assertTrue(self.store.is_item_available("Red Bull", 120))
+
+    def check_watcher(self, use_inotify):
+        reloaded = threading.Event()
+        reloads = []
+
+        def on_reload(reload):
+            reloads.append(reload)
+            reloaded.set()
+
+        watcher = InventoryWatcher(self.store, interval=0.02, on_reload=on_reload, use_inotify=use_inotify)
+        with watcher:
+            using_inotify = watcher.using_inotify
+            temp_file = self.inventory_file + ".new"
+            with open(temp_file, "w") as file:
+                file.write(MILK + "Red Bull: 10, $4.50, $4.00, Taxable\n")
+            os.replace(temp_file, self.inventory_file)
+            self.assertTrue(reloaded.wait(5))
+        self.assertEqual(reloads[0].changed, ["Red Bull"])
+        self.assertEqual(self.store.get_item_pricing("Red Bull", False), (450, True))
+        return using_inotify
+
+
+class ColumnarInventoryReloadTest(InventoryReloadTest):
+    store_class = ColumnarStore
+
+
+if __name__ == "__main__":
+    unittest.main()
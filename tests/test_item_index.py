@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.columnar_store import ColumnarStore
+from classes.errors import ItemNotFoundError
+from classes.item_index import ItemIndex
+from classes.store import Store
+
+
+class ItemIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = ItemIndex(["Milk", "Red Bull", "Red Apple", "Flour"])
+
+    def test_resolve_ignores_case_and_spacing(self):
+        self.assertEqual(self.index.resolve("milk"), "Milk")
+        self.assertEqual(self.index.resolve("  red   BULL "), "Red Bull")
+        self.assertIsNone(self.index.resolve("Bread"))
+
+    def test_complete(self):
+        self.assertEqual(self.index.complete("red"), ["Red Apple", "Red Bull"])
+        self.assertEqual(self.index.complete("RED", limit=1), ["Red Apple"])
+        self.assertEqual(self.index.complete("x"), [])
+
+    def test_add_remove_and_aliases(self):
+        self.index.add("Redcurrant")
+        self.index.add_alias("0012345", "Red Bull")
+        self.assertEqual(self.index.complete("red"), ["Red Apple", "Red Bull", "Redcurrant"])
+        self.assertEqual(self.index.resolve("0012345"), "Red Bull")
+        self.index.remove("Red Bull")
+        self.assertIsNone(self.index.resolve("0012345"))
+        self.assertEqual(self.index.complete("red b"), [])
+
+
+    def test_remove_reveals_shadowed_name(self):
+        index = ItemIndex(["Milk", "MILK", "Bread"])
+        index.add_alias("SKU-1", "Milk")
+        index.add_alias("SKU-2", "Bread")
+        self.assertEqual(index.resolve("milk"), "Milk")
+        index.remove("Milk")
+        self.assertEqual(index.resolve("milk"), "MILK")
+        self.assertEqual(index.complete("m"), ["MILK"])
+        self.assertIsNone(index.resolve("SKU-1"))
+        self.assertEqual(index.resolve("SKU-2"), "Bread")
+        index.remove("MILK")
+        self.assertIsNone(index.resolve("milk"))
+        self.assertEqual(index.complete("m"), [])
+
+
+class StoreLookupTest(unittest.TestCase):
+    store_class = Store
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+        with open(self.inventory_file + ".aliases", "w") as file:
+            file.write("049000028911: Red Bull\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_resolve_item(self):
+        store = self.store_class(self.inventory_file)
+        self.assertEqual(store.resolve_item("red bull"), "Red Bull")
+        self.assertEqual(store.resolve_item("049000028911"), "Red Bull")
+        self.assertEqual(store.complete_items("m"), ["Milk"])
+        with self.assertRaises(ItemNotFoundError):
+            store.resolve_item("bread")
+
+    def test_add_item_alias(self):
+        store = self.store_class(self.inventory_file)
+        store.add_item_alias("SKU-1", "Milk")
+        self.assertEqual(store.resolve_item("sku-1"), "Milk")
+        with self.assertRaises(ItemNotFoundError):
+            store.add_item_alias("SKU-2", "Bread")
+
+
+class ColumnarStoreLookupTest(StoreLookupTest):
+    store_class = ColumnarStore
+
+
+if __name__ == "__main__":
+    unittest.main()
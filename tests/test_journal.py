@@ -0,0 +1,156 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.store import Store
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+        with open(self.inventory_file, "rb") as file:
+            self.original = file.read()
+
+    def test_save_inventory_appends_to_journal(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 2)
+        store.save_inventory()
+        with open(self.inventory_file, "rb") as file:
+            self.assertEqual(file.read(), self.original)
+        self.assertTrue(os.path.exists(self.inventory_file + ".journal"))
+
+    def test_load_inventory_replays_journal(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 2)
+        store.save_inventory()
+        store.update_inventory("Red Bull", 3)
+        store.save_inventory()
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 3)
+        self.assertEqual(store._inventory["Red Bull"]["quantity"], 7)
+
+    def test_uncommitted_changes_are_not_replayed(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 2)
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 5)
+
+    def test_torn_record_is_discarded(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        with open(self.inventory_file + ".journal", "ab") as file:
+            file.write(b'{"deltas":{"Milk":-')
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 4)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 3)
+
+    def test_compaction_rewrites_inventory_file(self):
+        store = Store(self.inventory_file, compact_every=2)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        with open(self.inventory_file, "r") as file:
+            self.assertEqual(file.readline(), "Milk: 3, $3.75, $3.50, Tax-Exempt\n")
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 3)
+
+    def crash(self, *args):
+        raise SystemExit("crash")
+
+    def test_crash_after_rename_keeps_folded_records_out(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 2)
+        store.save_inventory()
+        # Simulates a crash after the compacted file was renamed into place
+        # but before the journal dropped the records it includes.
+        store._journal.finish_fold = self.crash
+        with self.assertRaises(SystemExit):
+            store.compact_inventory()
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 3)
+
+    def test_crash_during_compaction_keeps_sales_saved_meanwhile(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        write_rows = store._write_rows
+
+        def write_while_selling(rows):
+            store.update_inventory("Milk", 2)
+            store.save_inventory()
+            return write_rows(rows)
+
+        store._write_rows = write_while_selling
+        store._journal.finish_fold = self.crash
+        with self.assertRaises(SystemExit):
+            store.compact_inventory()
+        self.assertEqual(Store(self.inventory_file)._inventory["Milk"]["quantity"], 2)
+
+    def test_crash_before_rename_replays_every_record(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        begin_fold = store._journal.begin_fold
+
+        def begin_and_crash(digest, offset):
+            begin_fold(digest, offset)
+            self.crash()
+
+        store._journal.begin_fold = begin_and_crash
+        with self.assertRaises(SystemExit):
+            store.compact_inventory()
+        with open(self.inventory_file, "rb") as file:
+            self.assertEqual(file.read(), self.original)
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 4)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        self.assertEqual(Store(self.inventory_file)._inventory["Milk"]["quantity"], 3)
+
+    def test_sales_saved_during_compaction_are_kept(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        write_rows = store._write_rows
+
+        def write_while_selling(rows):
+            # The stripe locks are free while the file is written.
+            store.update_inventory("Red Bull", 2)
+            store.save_inventory()
+            return write_rows(rows)
+
+        store._write_rows = write_while_selling
+        store.compact_inventory()
+        with open(self.inventory_file, "r") as file:
+            self.assertEqual(file.read(), "Milk: 4, $3.75, $3.50, Tax-Exempt\nRed Bull: 10, $4.30, $4.00, Taxable\n")
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 4)
+        self.assertEqual(store._inventory["Red Bull"]["quantity"], 8)
+
+    def test_offline_edit_keeps_saved_sales(self):
+        store = Store(self.inventory_file)
+        store.update_inventory("Milk", 2)
+        store.save_inventory()
+        with open(self.inventory_file, "wb") as file:
+            file.write(self.original.replace(b"$3.75", b"$3.95"))
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 3)
+        self.assertEqual(store.get_item_price("Milk", rewards_member=False), 3.95)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        self.assertEqual(Store(self.inventory_file)._inventory["Milk"]["quantity"], 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.logger import ErrorLogger
+
+
+class ErrorLoggerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.directory, "logs", "error_log.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_logger(self, **options):
+        error_logger = ErrorLogger(self.log_file, name="test_error_logger", **options)
+        self.addCleanup(error_logger.close)
+        return error_logger
+
+    def records(self, path=None):
+        with open(path or self.log_file) as file:
+            return [json.loads(line) for line in file]
+
+    def test_writes_json_records_with_context(self):
+        error_logger = self.make_logger()
+        error_logger.log_error("Invalid input: x", choice="x", cart_items=2)
+        error_logger.close()
+        [record] = self.records()
+        self.assertEqual(record["level"], "ERROR")
+        self.assertEqual(record["message"], "Invalid input: x")
+        self.assertEqual(record["choice"], "x")
+        self.assertEqual(record["cart_items"], 2)
+
+    def test_repeated_messages_are_counted(self):
+        error_logger = self.make_logger()
+        for _ in range(3):
+            error_logger.log_error("Invalid input: x")
+        error_logger.log_error("Invalid input: y")
+        error_logger.close()
+        records = [(record["message"], record.get("repeated")) for record in self.records()]
+        self.assertEqual(records, [
+            ("Invalid input: x", None),
+            ("Invalid input: y", None),
+            ("Invalid input: x", 2),
+        ])
+
+    def test_loggers_share_one_handler(self):
+        first = self.make_logger()
+        second = self.make_logger(dedup_window=0)
+        first.log_error("one")
+        second.log_error("two")
+        second.log_error("two")
+        self.assertEqual(len(logging.getLogger("test_error_logger").handlers), 1)
+        first.close()
+        second.log_error("three")
+        second.close()
+        self.assertEqual([record["message"] for record in self.records()], ["one", "two", "two", "three"])
+
+    def test_loggers_share_repeat_counts(self):
+        first = self.make_logger()
+        second = self.make_logger()
+        first.log_error("Invalid input: x")
+        second.log_error("Invalid input: x")
+        second.close()
+        first.close()
+        records = [(record["message"], record.get("repeated")) for record in self.records()]
+        self.assertEqual(records, [("Invalid input: x", None), ("Invalid input: x", 1)])
+
+    def test_rotates_by_size(self):
+        error_logger = self.make_logger(max_bytes=200, backup_count=2, dedup_window=0)
+        for number in range(10):
+            error_logger.log_error(f"error {number}")
+        error_logger.close()
+        self.assertTrue(os.path.exists(self.log_file + ".1"))
+        self.assertFalse(os.path.exists(self.log_file + ".3"))
+        self.assertEqual(self.records()[-1]["message"], "error 9")
+
+
+if __name__ == "__main__":
+    unittest.main()
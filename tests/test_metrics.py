@@ -0,0 +1,107 @@
+import json
+import os
+import shutil
+import signal
+import tempfile
+import unittest
+
+from classes.cart import Cart
+from classes.errors import InsufficientQuantityError
+from classes.metrics import (Metrics, disable_metrics, enable_metrics, install_dump_signal,
+                             metrics_enabled)
+from classes.register import Register
+from classes.shared_store import SharedMemoryStore
+from classes.store import Store
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+        self.metrics = Metrics()
+        self.original = Store.is_item_available
+        enable_metrics(self.metrics)
+        self.addCleanup(disable_metrics)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_records_hot_paths(self):
+        store = Store(self.inventory_file)
+        store.is_item_available("Milk", 1)
+        with self.assertRaises(InsufficientQuantityError):
+            store.is_item_available("Milk", 50)
+        cart = Cart(store=store)
+        cart.add_item("Milk", 2)
+        cart.calculate_total(store, False)
+        operations = self.metrics.snapshot()["operations"]
+        self.assertEqual(operations["load_inventory"]["calls"], 1)
+        self.assertEqual(operations["is_item_available"]["calls"], 2)
+        self.assertEqual(operations["is_item_available"]["errors"], 1)
+        self.assertEqual(operations["calculate_total"]["calls"], 1)
+        self.assertEqual(operations["update_inventory"]["calls"], 0)
+
+        text = self.metrics.to_prometheus()
+        self.assertIn('quickmart_operation_duration_seconds_count{operation="is_item_available"} 2', text)
+        self.assertIn('quickmart_operation_errors_total{operation="is_item_available"} 1', text)
+        self.assertIn('quickmart_operation_duration_seconds_bucket{operation="load_inventory",le="+Inf"} 1', text)
+
+        self.metrics.reset()
+        store.is_item_available("Milk", 1)
+        self.assertEqual(self.metrics.snapshot()["operations"]["is_item_available"]["calls"], 1)
+
+    def test_records_register_checkout(self):
+        store = Store(self.inventory_file)
+        register = Register(store)
+        register.add_item("Milk", 2)
+        register.add_scan(["Red Bull,1\n"])
+        register.commit()
+        store.compact_inventory()
+        operations = self.metrics.snapshot()["operations"]
+        self.assertEqual(operations["reserve"]["calls"], 1)
+        self.assertEqual(operations["reserve_many"]["calls"], 1)
+        self.assertEqual(operations["commit_many"]["calls"], 1)
+        self.assertEqual(operations["compact_inventory"]["calls"], 1)
+
+    def test_records_shared_store_saves(self):
+        store = SharedMemoryStore(self.inventory_file)
+        store.update_inventory("Milk", 1)
+        store.save_inventory()
+        store.close()
+        operations = self.metrics.snapshot()["operations"]
+        self.assertEqual(operations["save_inventory"]["calls"], 2)
+        self.assertEqual(operations["compact_inventory"]["calls"], 1)
+
+    def test_dump(self):
+        Store(self.inventory_file)
+        path = os.path.join(self.directory, "metrics.json")
+        self.metrics.dump(path)
+        with open(path) as file:
+            self.assertEqual(json.load(file)["operations"]["load_inventory"]["calls"], 1)
+
+    def test_dump_signal_creates_the_directory_and_reports_errors(self):
+        path = os.path.join(self.directory, "logs", "metrics.prom")
+        errors = []
+        previous = signal.getsignal(signal.SIGUSR1)
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        install_dump_signal(path, metrics=self.metrics, on_error=errors.append)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        self.assertTrue(os.path.exists(path))
+        blocked = os.path.join(self.directory, "blocked")
+        with open(blocked, "w"):
+            pass
+        install_dump_signal(os.path.join(blocked, "metrics.prom"), metrics=self.metrics, on_error=errors.append)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        self.assertEqual(len(errors), 1)
+
+    def test_disable_restores_methods(self):
+        self.assertTrue(metrics_enabled())
+        self.assertIsNot(Store.is_item_available, self.original)
+        disable_metrics()
+        self.assertFalse(metrics_enabled())
+        self.assertIs(Store.is_item_available, self.original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from classes.cart import Cart
+from classes.columnar_store import ColumnarStore
+from classes.errors import ItemNotFoundError
+from classes.pricing import LineItem, PricingEngine, format_cents, tax_cents
+from classes.store import Store
+
+
+class PricingEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.store = Store("tests/test_inventory.txt")
+        self.engine = PricingEngine()
+
+    def test_format_cents(self):
+        self.assertEqual(format_cents(375), "3.75")
+        self.assertEqual(format_cents(5), "0.05")
+        self.assertEqual(format_cents(-1250), "-12.50")
+
+    def test_tax_rounds_half_cent_up(self):
+        self.assertEqual(tax_cents(1290, 650), 84)  # 83.85
+        self.assertEqual(tax_cents(1000, 650), 65)
+        self.assertEqual(tax_cents(1, 650), 0)  # 0.065
+
+    def test_price_line(self):
+        line = self.engine.price_line(self.store, "Red Bull", 3, rewards_member=False)
+        self.assertEqual(line, LineItem("Red Bull", 3, 430, 84, 1374))
+
+    def test_fused_lookup_matches_between_backends(self):
+        columnar = ColumnarStore("tests/test_inventory.txt")
+        for item in ("Milk", "Red Bull"):
+            for rewards_member in (False, True):
+                self.assertEqual(
+                    self.store.get_item_pricing(item, rewards_member),
+                    columnar.get_item_pricing(item, rewards_member),
+                )
+        with self.assertRaises(ItemNotFoundError):
+            columnar.get_item_pricing("Water", False)
+
+    def test_totals(self):
+        cart = Cart()
+        cart.add_item("Milk", 2)
+        cart.add_item("Red Bull", 3)
+        lines = cart.calculate_total(self.store, rewards_member=True)
+        self.assertEqual(self.engine.totals(lines), (1900, 78, 1978))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+from classes.cart import Cart
+from classes.errors import PromotionFormatError
+from classes.pricing import LineItem, PricingEngine
+from classes.promotions import PromotedPrice, PromotionTable, read_promotions
+from classes.store import Store
+
+
+class PromotionsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copyfile("tests/test_inventory.txt", self.inventory_file)
+        with open(self.inventory_file + ".categories", "w") as file:
+            file.write("Milk: Dairy\nRed Bull: Drinks\nWater: Drinks\n")
+        self.store = Store(self.inventory_file)
+        self.promotions_file = os.path.join(self.directory, "promotions.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_promotions(self, *lines):
+        with open(self.promotions_file, "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def compile(self, *lines):
+        self.write_promotions(*lines)
+        return PromotionTable.compile(read_promotions(self.promotions_file), self.store)
+
+    def test_missing_file_has_no_promotions(self):
+        self.assertEqual(read_promotions(self.promotions_file), [])
+
+    def test_active_dates(self):
+        self.write_promotions(
+            "# weekly flyer",
+            '{"type": "member_coupon", "item": "Milk", "amount_off_cents": 50, "end": "2026-01-31"}',
+            '{"type": "member_coupon", "item": "Milk", "percent": 10, "start": "2026-02-01"}',
+        )
+        january = read_promotions(self.promotions_file, today=date(2026, 1, 31))
+        february = read_promotions(self.promotions_file, today=date(2026, 2, 1))
+        self.assertEqual([promotion.get("amount_off_cents") for promotion in january], [50])
+        self.assertEqual([promotion.get("basis_points") for promotion in february], [1000])
+
+    def test_malformed_lines(self):
+        self.write_promotions(
+            '{"type": "multi_buy", "item": "Red Bull", "quantity": 3}',
+            '{"type": "member_coupon", "item": "Milk", "percent": 150}',
+            "not json",
+        )
+        with self.assertRaises(PromotionFormatError) as context:
+            read_promotions(self.promotions_file)
+        self.assertEqual([line_number for line_number, _, _ in context.exception.errors], [1, 2, 3])
+
+    def test_categories_of_known_items(self):
+        self.assertEqual(self.store.item_categories(), {"Milk": "Dairy", "Red Bull": "Drinks"})
+
+    def test_multi_buy(self):
+        table = self.compile('{"type": "multi_buy", "item": "Red Bull", "quantity": 3, "price_cents": 1000}')
+        self.assertEqual(table.get("Red Bull"), PromotedPrice(430, 400, 3, 1000))
+        self.assertEqual(table.get("Red Bull").subtotal(7, rewards_member=False), 2430)
+        self.assertEqual(table.get("Red Bull").subtotal(2, rewards_member=True), 800)
+
+    def test_best_multi_buy_wins(self):
+        table = self.compile(
+            '{"type": "multi_buy", "item": "Red Bull", "quantity": 3, "price_cents": 1000}',
+            '{"type": "multi_buy", "item": "Red Bull", "quantity": 2, "price_cents": 650}',
+        )
+        self.assertEqual(table.get("Red Bull").deal_quantity, 2)
+
+    def test_category_and_member_coupon(self):
+        table = self.compile(
+            '{"type": "category_percent_off", "category": "Dairy", "percent": 10}',
+            '{"type": "category_percent_off", "category": "Dairy", "percent": 20}',
+            '{"type": "member_coupon", "item": "Milk", "amount_off_cents": 50}',
+            '{"type": "member_coupon", "item": "Milk", "percent": 5}',
+            '{"type": "member_coupon", "item": "Water", "amount_off_cents": 50}',
+        )
+        # 20% off 375 and 350, then 50 cents off the member price.
+        self.assertEqual(table.get("Milk"), PromotedPrice(300, 230, 0, 0))
+        self.assertIsNone(table.get("Red Bull"))
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.promotions, 5)
+
+    def test_discounted_line_and_cart_totals(self):
+        table = self.compile('{"type": "multi_buy", "item": "Red Bull", "quantity": 3, "price_cents": 1000}')
+        engine = PricingEngine(promotions=table)
+        line = engine.price_line(self.store, "Red Bull", 3, rewards_member=False)
+        self.assertEqual(line, LineItem("Red Bull", 3, 430, 65, 1065, 290))
+        cart = Cart(engine, store=self.store)
+        cart.add_item("Red Bull", 3)
+        cart.add_item("Milk", 1)
+        self.assertEqual(cart.totals(self.store, rewards_member=False), (1375, 65, 1440))
+        self.assertEqual(cart.totals(self.store, rewards_member=True), (1350, 65, 1415))
+        self.assertEqual(engine.price_items(self.store, [("Red Bull", 3)], False), [line])
+        batch_cart = Cart(engine, store=self.store)
+        batch_cart.add_items({"Red Bull": 2, "Milk": 1})
+        batch_cart.add_items({"Red Bull": 1})
+        self.assertEqual(batch_cart.calculate_total(self.store, False), cart.calculate_total(self.store, False))
+        self.assertEqual(batch_cart.totals(self.store, rewards_member=True), (1350, 65, 1415))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from classes.cart import Cart
+from classes.pricing import LineItem
+from classes.receipt import Receipt
+from classes.receipt_renderers import (CsvReceiptRenderer, JsonLinesReceiptRenderer,
+                                       TextReceiptRenderer)
+from classes.store import Store
+from interfaces.context import AppContext
+
+LINES = [
+    LineItem("Milk", 2, 350, 0, 700),
+    LineItem('Chips, "Salted"', 1, 200, 13, 213),
+]
+# 3 Red Bull for $10.00 instead of $12.90.
+DISCOUNTED = LineItem("Red Bull", 3, 430, 65, 1065, 290)
+DAY = date(2016, 12, 8)
+
+
+class ReceiptRendererTest(unittest.TestCase):
+    def test_text(self):
+        text = TextReceiptRenderer().render(LINES, True, 42, DAY)
+        self.assertEqual(text, (
+            "December 08, 2016\n"
+            "Transaction No. 000042\n"
+            "Client is a rewards member\n"
+            "\n"
+            "Item      Quantity      Unit Price    Tax       Total\n"
+            "\n"
+            "Milk:        2       x    $3.50  +   $0.00  =   $7.00\n"
+            'Chips, "Salted":        1       x    $2.00  +   $0.13  =   $2.13\n'
+            "\n"
+            "**************************\n"
+            "Items sold: 2\n"
+            "Taxes: $0.13\n"
+            "Total: $9.13\n"
+        ))
+
+    def test_text_discount(self):
+        text = TextReceiptRenderer().render(LINES + [DISCOUNTED], False, 1, DAY)
+        self.assertIn("Milk:        2       x    $3.50  +   $0.00  =   $7.00\n", text)
+        self.assertIn("Red Bull:        3       x    $4.30  -   $2.90  +   $0.65  =   $10.65\n", text)
+
+    def test_text_empty_cart(self):
+        text = TextReceiptRenderer().render([], False, 1, DAY)
+        self.assertIn("Items sold: 0\nTaxes: $0.00\nTotal: $0.00\n", text)
+
+    def test_text_negative_amounts(self):
+        text = TextReceiptRenderer().render([LineItem("Coupon", 1, -150, 0, -150)], False, 1, DAY)
+        self.assertIn("Coupon:        1       x    $-1.50  +   $0.00  =   $-1.50\n", text)
+
+    def test_custom_line_layout(self):
+        renderer = TextReceiptRenderer(line_layout="{quantity} x {item} @ {unit_price} (100%)\n")
+        self.assertIn("2 x Milk @ 3.50 (100%)\n", renderer.render(LINES, False, 1, DAY))
+        with self.assertRaises(ValueError):
+            TextReceiptRenderer(line_layout="{price}\n")
+
+    def test_json_lines(self):
+        records = [json.loads(line) for line in
+                   JsonLinesReceiptRenderer().render(LINES, False, 7, DAY).splitlines()]
+        self.assertEqual(records[0], {
+            "type": "receipt", "transaction": 7, "date": "2016-12-08", "rewards_member": False,
+        })
+        self.assertEqual(records[2]["item"], 'Chips, "Salted"')
+        self.assertEqual(records[2]["total_cents"], 213)
+        self.assertEqual(records[2]["discount_cents"], 0)
+        self.assertEqual(records[3], {
+            "type": "summary", "items_sold": 2, "discount_cents": 0, "tax_cents": 13, "total_cents": 913,
+        })
+        records = [json.loads(line) for line in
+                   JsonLinesReceiptRenderer().render([DISCOUNTED], False, 7, DAY).splitlines()]
+        self.assertEqual(records[1]["discount_cents"], 290)
+        self.assertEqual(records[2]["discount_cents"], 290)
+
+    def test_csv(self):
+        rows = list(csv.reader(io.StringIO(CsvReceiptRenderer().render(LINES, True, 7, DAY))))
+        self.assertEqual(rows[0], list(CsvReceiptRenderer.HEADER))
+        self.assertEqual(rows[2], ["7", "2016-12-08", "1", 'Chips, "Salted"', "1", "2.00", "0.00", "0.13", "2.13"])
+        rows = list(csv.reader(io.StringIO(CsvReceiptRenderer().render([DISCOUNTED], False, 7, DAY))))
+        self.assertEqual(rows[1][4:], ["3", "4.30", "2.90", "0.65", "10.65"])
+
+
+class ReceiptDateTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_context_receipt_format(self):
+        context = AppContext(receipt_directory=self.directory, receipt_format="csv")
+        store = Store("tests/test_inventory.txt")
+        cart = Cart(store=store)
+        cart.add_item("Milk", 1)
+        path = context.receipt.generate_receipt(cart, store, False)
+        context.close()
+        self.assertTrue(path.endswith(".csv"))
+        with open(path) as file:
+            self.assertEqual(next(csv.reader(file))[0], "transaction")
+        with self.assertRaises(ValueError):
+            AppContext(receipt_format="pdf")
+
+    def test_each_receipt_is_dated_when_rendered(self):
+        receipt = Receipt(self.directory, renderer=JsonLinesReceiptRenderer())
+        store = Store("tests/test_inventory.txt")
+        cart = Cart(store=store)
+        cart.add_item("Milk", 1)
+        paths = []
+        for day in (date(2024, 1, 1), date(2024, 1, 2)):
+            with mock.patch("classes.receipt.date") as fake_date:
+                fake_date.today.return_value = day
+                paths.append(receipt.generate_receipt(cart, store, False))
+        receipt.close()
+        self.assertTrue(paths[0].endswith("transaction_000001_01012024.jsonl"))
+        self.assertTrue(paths[1].endswith("transaction_000002_01022024.jsonl"))
+        with open(paths[1]) as file:
+            self.assertEqual(json.loads(file.readline())["date"], "2024-01-02")
+
+
+if __name__ == "__main__":
+    unittest.main()
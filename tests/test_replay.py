@@ -0,0 +1,70 @@
+import io
+import shutil
+import tempfile
+import unittest
+
+from classes.errors import InvalidInputError
+from interfaces.replay import ReplayDriver, read_script, scratch_context
+
+
+class ReplayDriverTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.context = scratch_context("tests/test_inventory.txt", self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def quantities(self):
+        return {item: quantity for item, quantity, *_ in self.context.store._iter_rows()}
+
+    def test_replays_a_session(self):
+        answers = read_script([
+            "# a member buys milk\n", "1\n", "Y\n", "2\n", "milk\n", "2\n", "2\n", "Bread\n",
+            "4\n", "3\n", "Milk\n", "1\n", "5\n", "0\n",
+        ])
+        stdout = io.StringIO()
+        result = ReplayDriver(self.context, stdout).run(answers)
+        self.context.close()
+        self.assertEqual(result.transactions, 1)
+        self.assertFalse(result.exited)
+        self.assertEqual(result.errors, [
+            "Item not found error: Bread not found in the inventory.",
+            "Invalid input: 0",
+        ])
+        self.assertEqual({operation: len(samples) for operation, samples in result.timings.items()},
+                         {"customer": 1, "add": 2, "view": 1, "remove": 1, "checkout": 1, "invalid": 1})
+        self.assertEqual(self.quantities(), {"Milk": 4, "Red Bull": 10})
+        self.assertIn("Checkout successful!", stdout.getvalue())
+        self.assertIn("Total amount: $3.50", stdout.getvalue())
+        # Closing the context compacted the sale into the inventory file.
+        with open(self.context.inventory_file) as file:
+            self.assertEqual(file.readline(), "Milk: 4, $3.75, $3.50, Tax-Exempt\n")
+
+    def test_remove_resolves_the_name(self):
+        result = ReplayDriver(self.context, io.StringIO()).run(["2", "milk", "3", "3", "MILK ", "1", "4"])
+        self.assertEqual(result.errors, [])
+        self.assertEqual(self.context.cart.items, [("Milk", 2)])
+        self.context.register.clear()
+
+    def test_exit_ends_the_replay(self):
+        result = ReplayDriver(self.context).run(["2", "Milk", "1", "7", "4"])
+        self.assertTrue(result.exited)
+        self.assertNotIn("view", result.timings)
+
+    def test_quantity_must_be_positive(self):
+        result = ReplayDriver(self.context, io.StringIO()).run(
+            ["2", "Milk", "-3", "2", "Milk", "0", "2", "Milk", "2", "3", "Milk", "\u00b2", "3", "Milk", "0", "4"]
+        )
+        self.assertEqual(result.errors, ["Invalid input: 2", "Invalid input: 2", "Invalid input: 3", "Invalid input: 3"])
+        self.assertEqual(self.quantities(), {"Milk": 3, "Red Bull": 10})
+        self.context.register.clear()
+
+    def test_truncated_script(self):
+        with self.assertRaises(InvalidInputError):
+            ReplayDriver(self.context).run(["2", "Milk"])
+        self.context.register.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from classes.columnar_store import ColumnarStore
+from classes.errors import InsufficientQuantityError, ItemNotFoundError, ReservationError
+from classes.register import Register
+from classes.store import Store
+
+
+class ReservationTest(unittest.TestCase):
+    store_class = Store
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def quantity(self, store, item):
+        return next(row[1] for row in store._iter_rows() if row[0] == item)
+
+    def test_reserve_holds_stock(self):
+        store = self.store_class(self.inventory_file)
+        store.reserve("Milk", 4)
+        self.assertEqual(self.quantity(store, "Milk"), 1)
+        with self.assertRaises(InsufficientQuantityError):
+            store.reserve("Milk", 2)
+        with self.assertRaises(ItemNotFoundError):
+            store.reserve("Bread", 1)
+
+    def test_quantities_must_be_positive(self):
+        store = self.store_class(self.inventory_file)
+        for quantity in (0, -3):
+            with self.assertRaises(ValueError):
+                store.reserve("Milk", quantity)
+            with self.assertRaises(ValueError):
+                store.reserve_many({"Red Bull": 1, "Milk": quantity})
+            with self.assertRaises(ValueError):
+                store.update_inventory("Milk", quantity)
+        self.assertEqual(self.quantity(store, "Milk"), 5)
+        self.assertEqual(self.quantity(store, "Red Bull"), 10)
+
+    def test_release_returns_stock(self):
+        store = self.store_class(self.inventory_file)
+        reservation = store.reserve("Milk", 4)
+        store.release(reservation, 1)
+        self.assertEqual(self.quantity(store, "Milk"), 2)
+        self.assertEqual(reservation.quantity, 3)
+        store.release(reservation)
+        self.assertEqual(self.quantity(store, "Milk"), 5)
+        self.assertEqual(reservation.state, "released")
+        with self.assertRaises(ReservationError):
+            store.commit(reservation)
+
+    def test_commit_is_journaled(self):
+        store = self.store_class(self.inventory_file)
+        reservation = store.reserve("Red Bull", 3)
+        store.commit(reservation)
+        with self.assertRaises(ReservationError):
+            store.commit(reservation)
+        store.save_inventory()
+        store = self.store_class(self.inventory_file)
+        self.assertEqual(self.quantity(store, "Red Bull"), 7)
+
+    def test_held_stock_is_not_compacted_away(self):
+        store = self.store_class(self.inventory_file)
+        store.reserve("Milk", 2)
+        store.commit(store.reserve("Red Bull", 1))
+        store.compact_inventory()
+        store = self.store_class(self.inventory_file)
+        self.assertEqual(self.quantity(store, "Milk"), 5)
+        self.assertEqual(self.quantity(store, "Red Bull"), 10)
+
+    def test_expired_reservation_returns_stock(self):
+        store = self.store_class(self.inventory_file, reservation_timeout=0.01)
+        reservation = store.reserve("Milk", 5)
+        time.sleep(0.02)
+        self.assertEqual(store.expire_reservations(), 1)
+        self.assertEqual(reservation.state, "expired")
+        self.assertEqual(self.quantity(store, "Milk"), 5)
+
+    def test_commit_after_expiry_takes_stock_again(self):
+        store = self.store_class(self.inventory_file)
+        late = store.reserve("Milk", 3, timeout=0)
+        store.reserve("Milk", 4)
+        with self.assertRaises(InsufficientQuantityError):
+            store.commit(late)
+        store.release(late)
+        self.assertEqual(self.quantity(store, "Milk"), 1)
+
+    def test_threads_never_oversell(self):
+        store = self.store_class(self.inventory_file)
+        sold = []
+
+        def register():
+            for _ in range(20):
+                try:
+                    store.commit(store.reserve("Red Bull", 1))
+                    sold.append(1)
+                except InsufficientQuantityError:
+                    pass
+
+        threads = [threading.Thread(target=register) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(sold), 10)
+        self.assertEqual(self.quantity(store, "Red Bull"), 0)
+
+
+class ColumnarReservationTest(ReservationTest):
+    store_class = ColumnarStore
+
+
+class RegisterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+        self.store = Store(self.inventory_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_cancel_returns_stock(self):
+        register = Register(self.store)
+        register.add_item("Milk", 2)
+        register.add_item("Milk", 1)
+        self.assertEqual(self.store._inventory["Milk"]["quantity"], 2)
+        register.remove_item("Milk", 2)
+        self.assertEqual(self.store._inventory["Milk"]["quantity"], 4)
+        register.clear()
+        self.assertEqual(self.store._inventory["Milk"]["quantity"], 5)
+        self.assertEqual(len(register.cart), 0)
+
+    def test_failed_add_releases_reservation(self):
+        register = Register(self.store)
+        with self.assertRaises(InsufficientQuantityError):
+            register.add_item("Milk", 6)
+        self.assertEqual(self.store._inventory["Milk"]["quantity"], 5)
+
+    def test_failed_commit_commits_nothing(self):
+        register = Register(self.store)
+        register.add_item("Red Bull", 2)
+        self.store.reservation_timeout = 0
+        register.add_item("Milk", 3)
+        self.store.reservation_timeout = None
+        self.store.reserve("Milk", 4)
+        with self.assertRaises(InsufficientQuantityError):
+            register.commit()
+        self.assertEqual(self.store._pending, {})
+        register.clear()
+        self.assertEqual(self.store._inventory["Red Bull"]["quantity"], 10)
+        self.assertEqual(self.store._inventory["Milk"]["quantity"], 1)
+
+    def test_checkout_commits(self):
+        class NullReceipt:
+            def next_transaction_number(self):
+                return 1
+
+            def generate_receipt(self, cart, store, rewards_member, transaction_number):
+                self.lines = cart.calculate_total(store, rewards_member)
+
+        register = Register(self.store)
+        register.add_item("Red Bull", 4)
+        receipt = NullReceipt()
+        register.checkout(receipt)
+        self.assertEqual(receipt.lines[0].quantity, 4)
+        self.assertEqual(len(register.cart), 0)
+        store = Store(self.inventory_file)
+        self.assertEqual(store._inventory["Red Bull"]["quantity"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
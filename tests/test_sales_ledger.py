@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from classes.errors import InsufficientQuantityError
+from classes.pricing import LineItem
+from classes.register import Register
+from classes.sales_ledger import SalesLedger
+from classes.store import Store
+
+MILK = LineItem("Milk", 2, 350, 0, 700)
+RED_BULL = LineItem("Red Bull", 3, 400, 78, 1278)
+JAN_1 = datetime(2024, 1, 1, 9, 30)
+JAN_2 = datetime(2024, 1, 2, 18, 0)
+FEB_1 = datetime(2024, 2, 1, 12, 0)
+
+
+class SalesLedgerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def record_sales(self, ledger):
+        ledger.record(1, [MILK, RED_BULL], True, JAN_1)
+        ledger.record(2, [MILK], False, JAN_2)
+        ledger.record(3, [RED_BULL], False, FEB_1)
+
+    def test_aggregates(self):
+        ledger = SalesLedger(self.directory)
+        self.record_sales(ledger)
+        self.assertEqual(ledger.units_sold("Milk", date(2024, 1, 1)), 2)
+        self.assertEqual(ledger.item_totals("Milk"), (4, 1400))
+        self.assertEqual(ledger.item_totals("Red Bull", end=date(2024, 1, 31)), (3, 1200))
+        self.assertEqual(ledger.day_totals(date(2024, 1, 1)),
+                         {"units": 5, "sales": 1900, "tax": 78, "transactions": 1})
+        self.assertEqual(ledger.month_totals(2024, 1),
+                         {"units": 7, "sales": 2600, "tax": 78, "transactions": 2})
+        self.assertEqual(ledger.totals()["tax"], 156)
+
+    def test_reopen_replays_after_checkpoint(self):
+        ledger = SalesLedger(self.directory, checkpoint_every=2)
+        self.record_sales(ledger)
+        reopened = SalesLedger(self.directory)
+        self.assertEqual(reopened.totals(), ledger.totals())
+        self.assertEqual(reopened.item_totals("Red Bull"), (6, 2400))
+
+    def test_torn_transaction_is_dropped(self):
+        ledger = SalesLedger(self.directory)
+        self.record_sales(ledger)
+        segment = os.path.join(self.directory, "segment_000001.jsonl")
+        with open(segment, "ab") as file:
+            file.write(b'{"txn":4,"ts":"2024-02-02T10:00:00","item":"Milk","qty":1,'
+                       b'"unit_price":350,"tax":0,"member":false,"lines":2}\n{"txn":4')
+        reopened = SalesLedger(self.directory)
+        self.assertEqual(reopened.totals()["transactions"], 3)
+        reopened.record(5, [MILK], False, FEB_1)
+        self.assertEqual(SalesLedger(self.directory).totals()["transactions"], 4)
+
+    def test_segments_roll_over(self):
+        ledger = SalesLedger(self.directory, segment_bytes=200)
+        self.record_sales(ledger)
+        segments = sorted(name for name in os.listdir(self.directory) if name.startswith("segment_"))
+        self.assertGreater(len(segments), 1)
+        self.assertEqual(SalesLedger(self.directory).totals(), ledger.totals())
+
+    def test_register_checkout_is_recorded(self):
+        class NullReceipt:
+            def next_transaction_number(self):
+                return 7
+
+            def generate_receipt(self, cart, store, rewards_member, transaction_number):
+                pass
+
+        inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", inventory_file)
+        ledger = SalesLedger(os.path.join(self.directory, "ledger"))
+        register = Register(Store(inventory_file), ledger=ledger)
+        register.add_item("Milk", 2)
+        register.checkout(NullReceipt())
+        self.assertEqual(ledger.units_sold("Milk"), 2)
+
+        def fail(*args):
+            raise OSError("disk full")
+        ledger.record = fail
+        register.add_item("Milk", 1)
+        with self.assertRaises(OSError):
+            register.checkout(NullReceipt())
+        # The sale was journaled before the ledger failed.
+        store = Store(inventory_file)
+        self.assertTrue(store.is_item_available("Milk", 2))
+        with self.assertRaises(InsufficientQuantityError):
+            store.is_item_available("Milk", 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.errors import BatchError
+from classes.register import Register
+from classes.scan_batch import ScanBatch
+from classes.sqlite_store import SQLiteStore
+from classes.store import Store
+
+
+class ScanBatchTest(unittest.TestCase):
+    def test_from_lines(self):
+        batch = ScanBatch.from_lines([
+            "Milk,2\n", "# comment\n", "\n", "Red Bull\n", "milk, 1\n", "Chips, Salted,3\n",
+            "Bread,x\n", ",2\n", "Bread,\u00b2\n",
+        ])
+        self.assertEqual(batch.quantities, {"Milk": 2, "Red Bull": 1, "milk": 1, "Chips, Salted": 3})
+        self.assertEqual(batch.errors, [
+            ("Line 7", "invalid quantity 'x'"),
+            ("Line 8", "missing item"),
+            ("Line 9", "invalid quantity '\u00b2'"),
+        ])
+        self.assertEqual(batch.location("Milk"), "Line 1 (Milk)")
+
+
+class RegisterScanTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_store(self):
+        return Store(self.inventory_file)
+
+    def quantities(self, store):
+        return {item: quantity for item, quantity, *_ in store._iter_rows()}
+
+    def test_add_scan(self):
+        store = self.make_store()
+        register = Register(store)
+        self.assertEqual(register.add_scan(["milk,2", "Red Bull,3", "MILK,1"]), 6)
+        self.assertEqual(register.cart.items, [("Milk", 3), ("Red Bull", 3)])
+        self.assertEqual(self.quantities(store), {"Milk": 2, "Red Bull": 7})
+        register.clear()
+        self.assertEqual(self.quantities(store), {"Milk": 5, "Red Bull": 10})
+
+    def test_failures_are_reported_together_and_nothing_is_added(self):
+        store = self.make_store()
+        register = Register(store)
+        with self.assertRaises(BatchError) as raised:
+            register.add_scan(["Milk,4", "Bread,1", "Red Bull,zero", "milk,2"])
+        locations = [location for location, _ in raised.exception.errors]
+        self.assertEqual(locations, ["Line 3", "Line 2 (Bread)", "Line 1 (Milk), Line 4 (milk)"])
+        self.assertEqual(len(register.cart), 0)
+        self.assertEqual(self.quantities(store), {"Milk": 5, "Red Bull": 10})
+
+    def test_short_stock_rolls_back_the_whole_batch(self):
+        store = self.make_store()
+        register = Register(store)
+        with self.assertRaises(BatchError) as raised:
+            register.add_scan(["Red Bull,3", "Milk,6"])
+        self.assertEqual(raised.exception.errors[0][0], "Line 2 (Milk)")
+        self.assertEqual(len(register.cart), 0)
+        self.assertEqual(self.quantities(store), {"Milk": 5, "Red Bull": 10})
+
+
+class SQLiteRegisterScanTest(RegisterScanTest):
+    def make_store(self):
+        store = SQLiteStore(os.path.join(self.directory, "inventory.db"), self.inventory_file)
+        self.addCleanup(store.close)
+        return store
+
+
+if __name__ == "__main__":
+    unittest.main()
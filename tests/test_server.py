@@ -0,0 +1,85 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.store import Store
+from interfaces.server import RegisterServer
+
+
+class RegisterServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+        self.store = Store(self.inventory_file)
+        self.server = RegisterServer(self.store)
+        listener = await self.server.start(port=0)
+        self.port = listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        shutil.rmtree(self.directory)
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.addAsyncCleanup(self.disconnect, writer)
+
+        async def request(**fields):
+            writer.write(json.dumps(fields).encode() + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+
+        return request
+
+    async def disconnect(self, writer):
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_checkout_is_journaled(self):
+        request = await self.connect()
+        await request(op="customer", rewards_member=True)
+        self.assertEqual((await request(op="add", item="Red Bull", quantity=3))["ok"], True)
+        response = await request(op="checkout")
+        self.assertEqual(response["lines"], [{"item": "Red Bull", "quantity": 3, "total": "12.78"}])
+        self.assertEqual(self.server.writer.saves, 1)
+        self.assertEqual(Store(self.inventory_file)._inventory["Red Bull"]["quantity"], 7)
+
+    async def test_sessions_have_separate_carts(self):
+        first = await self.connect()
+        second = await self.connect()
+        await first(op="add", item="Milk", quantity=4)
+        response = await second(op="add", item="Milk", quantity=2)
+        self.assertEqual(response["error"], "InsufficientQuantityError")
+        self.assertEqual((await second(op="view"))["lines"], [])
+        await first(op="cancel")
+        self.assertEqual((await second(op="add", item="Milk", quantity=2))["ok"], True)
+
+    async def test_invalid_requests_are_reported(self):
+        request = await self.connect()
+        self.assertEqual((await request(op="fly"))["error"], "InvalidInputError")
+        response = await request(op="add", item="Milk", quantity=-1)
+        self.assertEqual(response["error"], "InvalidInputError")
+        response = await request(op="add", item="Bread", quantity=1)
+        self.assertEqual(response["error"], "ItemNotFoundError")
+        response = await request(op="add", item=["Milk"], quantity=1)
+        self.assertEqual(response["error"], "InvalidInputError")
+        response = await request(op="remove", quantity=1)
+        self.assertEqual(response["error"], "InvalidInputError")
+
+    async def test_disconnect_releases_reservations(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b'{"op": "add", "item": "Milk", "quantity": 5}\n')
+        await reader.readline()
+        self.assertEqual(self.store._inventory["Milk"]["quantity"], 0)
+        writer.close()
+        await writer.wait_closed()
+        while self.server.sessions:
+            await asyncio.sleep(0.01)
+        self.assertEqual(self.store._inventory["Milk"]["quantity"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
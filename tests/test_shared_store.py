@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.columnar_store import ColumnarStore
+from classes.errors import InsufficientQuantityError, ReloadError
+from classes.shared_store import SharedMemoryStore
+from interfaces.register_pool import RegisterPool
+
+
+def sell_milk(store):
+    store.commit(store.reserve("Milk", 2))
+    store.save_inventory()
+    store.close()
+
+
+class SharedMemoryStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read_inventory(self):
+        with open(self.inventory_file) as file:
+            return file.read()
+
+    def test_sells_from_shared_columns(self):
+        store = SharedMemoryStore(self.inventory_file)
+        self.addCleanup(store.close)
+        self.assertEqual(store.get_item_prices("Red Bull"), (430, 400, True))
+        reservation = store.reserve("Milk", 4)
+        with self.assertRaises(InsufficientQuantityError):
+            store.reserve("Milk", 2)
+        store.commit(reservation)
+        store.close()
+        self.assertEqual(
+            self.read_inventory(),
+            "Milk: 1, $3.75, $3.50, Tax-Exempt\nRed Bull: 10, $4.30, $4.00, Taxable\n",
+        )
+
+    def test_sales_are_journaled_by_every_process(self):
+        store = SharedMemoryStore(self.inventory_file)
+        store.commit(store.reserve("Red Bull", 3))
+        store.save_inventory()
+        worker = multiprocessing.Process(target=sell_milk, args=(store,))
+        worker.start()
+        worker.join()
+        self.assertEqual(worker.exitcode, 0)
+        # The owner never compacted: a new store recovers the sales from the journal.
+        recovered = ColumnarStore(self.inventory_file)
+        self.assertEqual([row[:2] for row in recovered._iter_rows()], [("Milk", 3), ("Red Bull", 7)])
+        with self.assertRaises(ReloadError):
+            store.reload_inventory()
+        store.close()
+
+    def test_failed_sessions_and_lanes(self):
+        receipt_directory = os.path.join(self.directory, "receipts")
+        with RegisterPool(self.inventory_file, workers=1, receipt_directory=receipt_directory) as pool:
+            results = pool.run([(False, [(["Milk"], 1)]), (False, [("Milk", 1)])])
+            self.assertTrue(results[0].error.startswith("TypeError"))
+            self.assertEqual(results[1].total, 375)
+            with self.assertRaises(ChildProcessError):
+                pool.run([(False,)])
+        self.assertTrue(self.read_inventory().startswith("Milk: 4,"))
+
+    def test_lanes_never_oversell(self):
+        receipt_directory = os.path.join(self.directory, "receipts")
+        with RegisterPool(self.inventory_file, workers=2, receipt_directory=receipt_directory) as pool:
+            results = pool.run([(False, [("Milk", 1), ("Red Bull", 1)])] * 8, chunk_size=1)
+        sold = [result for result in results if result.error is None]
+        self.assertEqual(len(sold), 5)
+        self.assertEqual({result.total for result in sold}, {833})
+        self.assertTrue(self.read_inventory().startswith("Milk: 0,"))
+        self.assertIn("Red Bull: 5,", self.read_inventory())
+        receipts = [name for _, _, files in os.walk(receipt_directory) for name in files if name.endswith(".txt")]
+        self.assertEqual(len(receipts), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.columnar_store import ColumnarStore
+from classes.store import Store
+
+
+class SnapshotStore(Store):
+    parsed = 0
+
+    def _parse_columns(self, data):
+        SnapshotStore.parsed += 1
+        return super()._parse_columns(data)
+
+
+class SnapshotCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+        SnapshotStore.parsed = 0
+
+    def test_snapshot_is_written_and_reused(self):
+        SnapshotStore(self.inventory_file, use_snapshot=True)
+        self.assertTrue(os.path.exists(self.inventory_file + ".snapshot"))
+        store = SnapshotStore(self.inventory_file, use_snapshot=True)
+        self.assertEqual(SnapshotStore.parsed, 1)
+        self.assertEqual(store.get_item_price("Red Bull", rewards_member=True), 4.00)
+        self.assertEqual(store.get_item_tax_status("Red Bull"), "Taxable")
+        self.assertTrue(store.is_item_available("Milk", 5))
+
+    def test_stale_snapshot_falls_back_to_text_file(self):
+        SnapshotStore(self.inventory_file, use_snapshot=True)
+        with open(self.inventory_file, "a") as file:
+            file.write("\nFlour: 1, $3.10, $2.75, Tax-Exempt\n")
+        store = SnapshotStore(self.inventory_file, use_snapshot=True)
+        self.assertEqual(SnapshotStore.parsed, 2)
+        self.assertEqual(store.get_item_price("Flour", rewards_member=False), 3.10)
+
+    def test_touched_file_keeps_snapshot(self):
+        SnapshotStore(self.inventory_file, use_snapshot=True)
+        stat = os.stat(self.inventory_file)
+        os.utime(self.inventory_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        SnapshotStore(self.inventory_file, use_snapshot=True)
+        self.assertEqual(SnapshotStore.parsed, 1)
+
+    def test_journal_replays_over_snapshot(self):
+        store = Store(self.inventory_file, use_snapshot=True)
+        store.update_inventory("Milk", 2)
+        store.save_inventory()
+        store = ColumnarStore(self.inventory_file, use_snapshot=True)
+        self.assertTrue(store.is_item_available("Milk", 3))
+        self.assertEqual(store.get_item_price("Milk", rewards_member=True), 3.50)
+
+    def test_compaction_refreshes_snapshot(self):
+        store = Store(self.inventory_file, use_snapshot=True)
+        store.update_inventory("Milk", 2)
+        store.save_inventory()
+        store.compact_inventory()
+        store = SnapshotStore(self.inventory_file, use_snapshot=True)
+        self.assertEqual(SnapshotStore.parsed, 0)
+        self.assertEqual(store._inventory["Milk"]["quantity"], 3)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
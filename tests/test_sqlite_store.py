@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from classes.cart import Cart
+from classes.errors import InsufficientQuantityError, ItemNotFoundError, ReloadError
+from classes.inventory_watcher import InventoryWatcher
+from classes.register import Register
+from classes.sqlite_store import SQLiteStore
+
+
+def reserve_and_crash(database_file):
+    SQLiteStore(database_file).reserve("Milk", 4)
+    os._exit(0)
+
+
+class SQLiteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        self.database_file = os.path.join(self.directory, "inventory.db")
+        shutil.copy("tests/test_inventory.txt", self.inventory_file)
+        self.store = SQLiteStore(self.database_file, self.inventory_file)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_import_and_lookups(self):
+        self.assertEqual(self.store.get_item_price("Milk", True), 3.50)
+        self.assertEqual(self.store.get_item_pricing("Red Bull", False), (430, True))
+        self.assertEqual(self.store.get_item_prices("Milk"), (375, 350, False))
+        self.assertEqual(self.store.get_item_tax_status("Milk"), "Tax-Exempt")
+        self.assertEqual(list(self.store._iter_rows())[0], ("Milk", 5, 375, 350, "Tax-Exempt"))
+        with self.assertRaises(ItemNotFoundError):
+            self.store.get_item_price("Bread", False)
+
+    def test_update_inventory_is_atomic(self):
+        self.store.update_inventory("Milk", 4)
+        with self.assertRaises(InsufficientQuantityError):
+            self.store.update_inventory("Milk", 2)
+        with self.assertRaises(ItemNotFoundError):
+            self.store.update_inventory("Bread", 1)
+        self.assertTrue(self.store.is_item_available("Milk", 1))
+
+    def test_changes_are_shared_and_durable(self):
+        other = SQLiteStore(self.database_file, self.inventory_file)
+        self.addCleanup(other.close)
+        other.commit(other.reserve("Red Bull", 3))
+        self.assertEqual(self.store.get_item_pricing("Red Bull", False), (430, True))
+        with self.assertRaises(InsufficientQuantityError):
+            self.store.reserve("Red Bull", 8)
+        reservation = self.store.reserve("Red Bull", 7)
+        self.store.release(reservation)
+        self.assertTrue(self.store.is_item_available("Red Bull", 7))
+
+    def test_holds_of_crashed_processes_are_dropped(self):
+        reservation = self.store.reserve("Milk", 1)
+        worker = multiprocessing.Process(target=reserve_and_crash, args=(self.database_file,))
+        worker.start()
+        worker.join()
+        with self.assertRaises(InsufficientQuantityError):
+            self.store.reserve("Milk", 1)
+        reopened = SQLiteStore(self.database_file)
+        self.addCleanup(reopened.close)
+        self.assertEqual(list(reopened._iter_rows())[0][1], 4)
+        self.store.commit(reservation)
+        self.assertEqual(list(reopened._iter_rows())[0][1], 4)
+
+    def test_watcher_refuses_database(self):
+        watcher = InventoryWatcher(self.store, use_inotify=False)
+        with self.assertRaises(ReloadError):
+            watcher.start()
+        self.assertIsNone(watcher._thread)
+
+    def test_register_checkout(self):
+        class NullReceipt:
+            def next_transaction_number(self):
+                return 1
+
+            def generate_receipt(self, cart, store, rewards_member, transaction_number):
+                self.lines = cart.calculate_total(store, rewards_member)
+
+        register = Register(self.store, Cart(store=self.store))
+        register.add_item("Red Bull", 2)
+        register.add_item("Milk", 1)
+        register.remove_item("Milk")
+        receipt = NullReceipt()
+        register.checkout(receipt)
+        self.assertEqual(receipt.lines[0].total, 916)
+        reopened = SQLiteStore(self.database_file)
+        self.addCleanup(reopened.close)
+        rows = {item: quantity for item, quantity, *_ in reopened._iter_rows()}
+        self.assertEqual(rows, {"Milk": 5, "Red Bull": 8})
+
+    def test_threads_never_oversell(self):
+        sold = []
+
+        def register():
+            for _ in range(10):
+                try:
+                    self.store.update_inventory("Red Bull", 1)
+                    sold.append(1)
+                except InsufficientQuantityError:
+                    pass
+
+        threads = [threading.Thread(target=register) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(sold), 10)
+        self.assertFalse(self.store._has_item("Bread"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from classes.columnar_store import ColumnarStore
+from classes.stock_index import StockIndex
+from classes.store import Store
+
+
+class StockIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.reports = []
+        self.index = StockIndex(
+            [("Milk", 5), ("Red Bull", 10), ("Water", 2), ("Chips", 7)],
+            thresholds={"Milk": 6},
+            default_threshold=3,
+            on_low_stock=lambda *report: self.reports.append(report),
+        )
+
+    def test_lowest_skips_stale_entries(self):
+        self.index.update("Water", 20)
+        self.index.update("Chips", 1)
+        self.index.update("Chips", 4)
+        self.assertEqual(self.index.lowest(2), [("Chips", 4), ("Milk", 5)])
+        self.assertEqual(self.index.lowest(10), [("Chips", 4), ("Milk", 5), ("Red Bull", 10), ("Water", 20)])
+
+    def test_below_threshold(self):
+        self.assertEqual(self.index.below_threshold(), [("Water", 2, 3), ("Milk", 5, 6)])
+        self.index.update("Milk", 6)
+        self.assertEqual(self.index.below_threshold(), [("Water", 2, 3)])
+
+    def test_callback_fires_once_per_crossing(self):
+        self.index.update("Red Bull", 2)
+        self.index.update("Red Bull", 1)
+        self.index.update("Red Bull", 8)
+        self.index.update("Red Bull", 0)
+        self.assertEqual(self.reports, [("Red Bull", 2, 3), ("Red Bull", 0, 3)])
+
+    def test_set_threshold(self):
+        self.index.set_threshold("Chips", 8)
+        self.assertEqual(self.reports, [("Chips", 7, 8)])
+        self.index.set_threshold("Milk", None)
+        self.assertEqual(self.index.below_threshold(), [("Water", 2, 3), ("Chips", 7, 8)])
+
+    def test_discard_and_rebuild(self):
+        self.index.discard("Water")
+        for quantity in range(200):
+            self.index.update("Milk", quantity)
+        self.assertLess(len(self.index._heap), 2 * len(self.index) + 65)
+        self.assertEqual(self.index.lowest(1), [("Chips", 7)])
+        self.assertIsNone(self.index.quantity("Water"))
+
+
+class StoreStockIndexTest(unittest.TestCase):
+    store_class = Store
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        self.write("Milk: 5, $3.75, $3.50, Tax-Exempt\nRed Bull: 10, $4.30, $4.00, Taxable\n")
+        with open(self.inventory_file + ".reorder", "w") as file:
+            file.write("Red Bull: 8\nCheese: 4\n")
+        self.store = self.store_class(self.inventory_file)
+        self.reports = []
+        self.index = self.store.track_stock(3, lambda *report: self.reports.append(report))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, text):
+        with open(self.inventory_file, "w") as file:
+            file.write(text)
+
+    def test_thresholds_from_reorder_file(self):
+        self.assertIs(self.store.track_stock(), self.index)
+        self.assertEqual(self.index.threshold("Red Bull"), 8)
+        self.assertEqual(self.index.threshold("Milk"), 3)
+        self.assertEqual(self.index.threshold("Cheese"), 3)
+
+    def test_reserve_release_and_sale(self):
+        reservation = self.store.reserve("Red Bull", 3)
+        self.assertEqual(self.index.below_threshold(), [("Red Bull", 7, 8)])
+        self.store.release(reservation)
+        self.assertEqual(self.index.below_threshold(), [])
+        self.store.update_inventory("Milk", 4)
+        self.assertEqual(self.index.lowest(1), [("Milk", 1)])
+        self.assertEqual(self.reports, [("Red Bull", 7, 8), ("Milk", 1, 3)])
+
+    def test_reload(self):
+        self.store.reload_inventory()
+        self.write("Red Bull: 2, $4.30, $4.00, Taxable\nWater: 7, $1.00, $0.90, Tax-Exempt\n")
+        self.store.reload_inventory()
+        self.assertEqual(self.index.lowest(5), [("Red Bull", 2), ("Water", 7)])
+        self.assertEqual(self.reports, [("Red Bull", 2, 8)])
+
+
+class ColumnarStoreStockIndexTest(StoreStockIndexTest):
+    store_class = ColumnarStore
+
+
+if __name__ == "__main__":
+    unittest.main()
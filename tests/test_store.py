@@ -1,9 +1,14 @@
+import os
+import shutil
+import tempfile
 import unittest
 from datetime import date
 from classes.cart import Cart
 from classes.customer import Customer
 from classes.receipt import Receipt
+from classes.receipt_writer import ReceiptWriter
 from classes.store import Store
+from classes.transaction_counter import TransactionCounter
 from classes.errors import ItemNotFoundError, InsufficientQuantityError, InvalidInputError
 
 
@@ -54,11 +59,73 @@ class CartTest(unittest.TestCase):
         self.assertEqual(self.cart.items[0][0], "Milk")
         self.assertEqual(self.cart.items[0][1], 2)
 
+    def test_add_items_is_all_or_nothing(self):
+        cart = Cart(store=self.store)
+        cart.add_item("Milk", 1)
+        with self.assertRaises(ItemNotFoundError):
+            cart.add_items({"Milk": 1, "Bread": 1})
+        self.assertEqual(cart.items, [("Milk", 1)])
+        self.assertEqual(cart.totals(self.store, rewards_member=False), (375, 0, 375))
+
     def test_remove_item(self):
         self.cart.add_item("Milk", 2)
         self.cart.remove_item("Milk")
         self.assertEqual(len(self.cart.items), 0)
 
+    def test_add_item_merges_quantities(self):
+        self.cart.add_item("Milk", 2)
+        self.cart.add_item("Red Bull", 1)
+        self.cart.add_item("Milk", 3)
+        self.assertEqual(self.cart.items, [("Milk", 5), ("Red Bull", 1)])
+        lines = self.cart.calculate_total(self.store, rewards_member=False)
+        self.assertEqual(lines[0].quantity, 5)
+
+    def test_remove_partial_quantity(self):
+        self.cart.add_item("Milk", 5)
+        self.assertEqual(self.cart.remove_item("Milk", 2), 2)
+        self.assertEqual(self.cart.quantity_of("Milk"), 3)
+        self.assertEqual(self.cart.remove_item("Milk", 10), 3)
+        self.assertNotIn("Milk", self.cart)
+
+    def test_calculate_total_reprices_changed_lines_only(self):
+        self.cart.add_item("Milk", 2)
+        self.cart.add_item("Red Bull", 3)
+        first = self.cart.calculate_total(self.store, rewards_member=False)
+        self.cart.add_item("Red Bull", 1)
+        second = self.cart.calculate_total(self.store, rewards_member=False)
+        self.assertIs(first[0], second[0])
+        self.assertEqual(second[1].quantity, 4)
+        self.assertEqual(self.cart.totals(self.store, rewards_member=False), (2470, 112, 2582))
+
+    def test_running_totals_follow_add_and_remove(self):
+        cart = Cart(store=self.store)
+        cart.add_item("Milk", 2)
+        cart.add_item("Red Bull", 3)
+        self.assertEqual(cart.totals(self.store, rewards_member=False), (2040, 84, 2124))
+        self.assertEqual(cart.totals(self.store, rewards_member=True), (1900, 78, 1978))
+        cart.remove_item("Red Bull", 2)
+        self.assertEqual(cart.totals(self.store, rewards_member=False), (1180, 28, 1208))
+        del cart.items
+        self.assertEqual(cart.totals(self.store, rewards_member=True), (0, 0, 0))
+
+    def test_bound_cart_rejects_unknown_item(self):
+        cart = Cart(store=self.store)
+        with self.assertRaises(ItemNotFoundError):
+            cart.add_item("Water", 1)
+        self.assertEqual(len(cart), 0)
+
+    def test_quantities_must_be_positive(self):
+        cart = Cart(store=self.store)
+        with self.assertRaises(ValueError):
+            cart.add_item("Milk", 0)
+        cart.add_item("Milk", 2)
+        with self.assertRaises(ValueError):
+            cart.add_item("Milk", -2)
+        with self.assertRaises(ValueError):
+            cart.remove_item("Milk", 0)
+        self.assertEqual(cart.items, [("Milk", 2)])
+        self.assertEqual(len(cart.calculate_total(self.store, rewards_member=False)), 1)
+
     def test_remove_item_not_found(self):
         with self.assertRaises(ItemNotFoundError):
             self.cart.remove_item("Water")
@@ -66,33 +133,27 @@ class CartTest(unittest.TestCase):
     def test_calculate_total_regular_customer(self):
         self.cart.add_item("Milk", 2)
         self.cart.add_item("Red Bull", 3)
-        total = 0.0
-        result = self.cart.calculate_total(self.store, rewards_member=False)
-        for _, details in result.items():
-            unit_total = details["total"]
-            total += unit_total
-        self.assertEqual(total, 21.2385)
+        total = 0
+        for line in self.cart.calculate_total(self.store, rewards_member=False):
+            total += line.total
+        self.assertEqual(total, 2124)
 
     def test_calculate_total_rewards_member(self):
         self.cart.add_item("Milk", 2)
         self.cart.add_item("Red Bull", 3)
-        total = 0.0
-        result = self.cart.calculate_total(self.store, rewards_member=True)
-        for _, details in result.items():
-            unit_total = details["total"]
-            total += unit_total
-        self.assertEqual(total, 19.78)
+        total = 0
+        for line in self.cart.calculate_total(self.store, rewards_member=True):
+            total += line.total
+        self.assertEqual(total, 1978)
 
     def test_calculate_total_with_tax(self):
         self.store._inventory["Milk"]["tax_status"] = "Taxable"
         self.cart.add_item("Milk", 2)
         self.cart.add_item("Red Bull", 3)
-        total = 0.0
-        result = self.cart.calculate_total(self.store, rewards_member=False)
-        for _, details in result.items():
-            unit_total = details["total"]
-            total += unit_total
-        self.assertEqual(total, 21.726)
+        total = 0
+        for line in self.cart.calculate_total(self.store, rewards_member=False):
+            total += line.total
+        self.assertEqual(total, 2173)
 
     def tearDown(self):
         del self.cart.items
@@ -119,7 +180,8 @@ class CustomerTest(unittest.TestCase):
 
 class ReceiptTest(unittest.TestCase):
     def setUp(self):
-        self.receipt = Receipt("tests/test_receipt.txt")
+        self.directory = tempfile.mkdtemp()
+        self.receipt = Receipt(self.directory)
         self.cart = Cart()
         self.store = Store("tests/test_inventory.txt")
 
@@ -141,13 +203,62 @@ class ReceiptTest(unittest.TestCase):
         ]
         self.cart.add_item("Milk", 2)
         actual_output = []
-        self.receipt.generate_receipt(self.cart, self.store, rewards_member=False)
-        with open("tests/test_receipt.txt", "r") as file:
+        path = self.receipt.generate_receipt(self.cart, self.store, rewards_member=False)
+        self.receipt.flush()
+        self.assertEqual(
+            os.path.basename(path), f"transaction_000001_{today.strftime('%m%d%Y')}.txt"
+        )
+        with open(path, "r") as file:
             for line in file:
                 actual_output.append(line)
         self.assertEqual(expected_output, actual_output)
 
+    def test_transaction_numbers_survive_restart(self):
+        self.cart.add_item("Milk", 1)
+        first = self.receipt.generate_receipt(self.cart, self.store, rewards_member=False)
+        self.receipt.close()
+        receipt = Receipt(self.directory)
+        second = receipt.generate_receipt(self.cart, self.store, rewards_member=False)
+        receipt.close()
+        self.assertIn("transaction_000001_", first)
+        self.assertIn("transaction_000002_", second)
+        self.assertTrue(os.path.exists(first) and os.path.exists(second))
+
+    def test_write_errors_are_reported(self):
+        blocked = os.path.join(self.directory, "blocked")
+        with open(blocked, "w"):
+            pass
+        writer = ReceiptWriter()
+        writer.submit(os.path.join(blocked, "receipt.txt"), "text")
+        with self.assertRaises(OSError):
+            writer.flush()
+        writer.close()
+        reported = []
+        writer = ReceiptWriter(on_error=lambda path, error: reported.append(path))
+        writer.submit(os.path.join(blocked, "receipt.txt"), "text")
+        writer.close()
+        self.assertEqual(reported, [os.path.join(blocked, "receipt.txt")])
+
+    def test_writer_keeps_draining_after_unexpected_errors(self):
+        writer = ReceiptWriter()
+        writer.submit(os.path.join(self.directory, "bad.txt"), b"not text")
+        with self.assertRaises(TypeError):
+            writer.flush()
+        good = os.path.join(self.directory, "good.txt")
+        writer.submit(good, "text")
+        writer.close()
+        with open(good) as file:
+            self.assertEqual(file.read(), "text")
+
+    def test_unclosed_counter_never_reuses_numbers(self):
+        counter_file = os.path.join(self.directory, "counter")
+        counter = TransactionCounter(counter_file, block_size=10)
+        self.assertEqual([counter.next() for _ in range(3)], [1, 2, 3])
+        self.assertEqual(TransactionCounter(counter_file, block_size=10).next(), 11)
+
     def tearDown(self):
+        self.receipt.close()
+        shutil.rmtree(self.directory)
         self.receipt = None
         self.cart = None
         self.store = None
@@ -0,0 +1,121 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+from classes.batch_pricer import BatchPricer
+from classes.cart import Cart
+from classes.errors import TaxTableError
+from classes.pricing import LineItem, PricingEngine
+from classes.store import Store
+from classes.tax import EXEMPT, STANDARD, Jurisdiction, TaxEngine, TaxTable, read_tax_table
+
+TABLE = {
+    "default_jurisdiction": "county",
+    "jurisdictions": {
+        "county": {
+            "rate": 6.5,
+            "categories": {"Drinks": 8.25, "Dairy": 2},
+            "holidays": [{"name": "Energy week", "start": "2026-08-07", "end": "2026-08-09",
+                          "categories": ["Drinks", "Snacks"]}],
+        },
+        "city": {
+            "rate": 7,
+            "holidays": [{"name": "Tax-free day", "start": "2026-11-27", "end": "2026-11-27"}],
+        },
+    },
+}
+
+
+class TaxEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, "inventory.txt")
+        shutil.copyfile("tests/test_inventory.txt", self.inventory_file)
+        with open(self.inventory_file + ".categories", "w") as file:
+            file.write("Milk: Dairy\nRed Bull: Drinks\n")
+        self.store = Store(self.inventory_file)
+        self.table_file = os.path.join(self.directory, "tax_rates.json")
+        with open(self.table_file, "w") as file:
+            json.dump(TABLE, file)
+        self.table = read_tax_table(self.table_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_missing_file_is_flat(self):
+        table = read_tax_table(os.path.join(self.directory, "missing.json"), 700)
+        self.assertEqual(list(TaxEngine(table).rates(date(2026, 1, 1))), [0, 700])
+
+    def test_malformed_tables(self):
+        with self.assertRaises(TaxTableError):
+            TaxEngine(self.table, jurisdiction="state")
+        for data in ({}, {"jurisdictions": {"county": {}}},
+                     {"jurisdictions": {"county": {"rate": 120}}},
+                     {"jurisdictions": {"county": {"rate": 6, "holidays": [{"start": "2026-08-07"}]}}},
+                     {"jurisdictions": {"county": {"rate": 6, "categories": ["clothing"]}}},
+                     {"jurisdictions": {"county": {"rate": 6, "holidays": [
+                         {"start": "2026-08-07", "end": "2026-08-09", "categories": "clothing"}]}}}):
+            with open(self.table_file, "w") as file:
+                json.dump(data, file)
+            with self.assertRaises(TaxTableError):
+                read_tax_table(self.table_file)
+
+    def test_item_codes(self):
+        engine = TaxEngine(self.table)
+        codes = engine.item_codes(self.store)
+        # Milk is tax-exempt, so its category rate does not apply.
+        self.assertEqual(codes, {"Red Bull": 2})
+        self.assertIs(engine.item_codes(self.store), codes)
+        self.assertEqual(engine.rate_of(self.store, "Milk", False, date(2026, 1, 1)), 0)
+        self.assertEqual(engine.rate_of(self.store, "Red Bull", True, date(2026, 1, 1)), 825)
+
+    def test_codes_follow_store_reload_and_table_change(self):
+        engine = TaxEngine(self.table)
+        self.assertEqual(engine.item_codes(self.store), {"Red Bull": 2})
+        with open(self.inventory_file + ".categories", "w") as file:
+            file.write("Red Bull: Candy\n")
+        self.assertEqual(engine.item_codes(Store(self.inventory_file)), {})
+        engine.use_table(TaxTable.flat(500))
+        self.assertEqual(engine.rates(date(2026, 8, 8)), TaxEngine(TaxTable.flat(500)).rates())
+
+    def test_holidays(self):
+        engine = TaxEngine(self.table)
+        self.assertEqual(list(engine.rates(date(2026, 8, 6))), [0, 650, 825, 200, 650])
+        self.assertEqual(list(engine.rates(date(2026, 8, 9))), [0, 650, 0, 200, 0])
+        city = TaxEngine(self.table, jurisdiction="city")
+        self.assertEqual(list(city.rates(date(2026, 11, 27))), [0, 0])
+        self.assertEqual(city.rates(date(2026, 11, 28))[STANDARD], 700)
+        self.assertEqual(city.rates(date(2026, 11, 28))[EXEMPT], 0)
+
+    def test_pricing_with_category_rate(self):
+        tax = TaxEngine(TaxTable({"county": Jurisdiction(650, {"Drinks": 825, "Dairy": 200}, ())}, "county"))
+        engine = PricingEngine(tax=tax)
+        self.assertEqual(
+            engine.price_line(self.store, "Red Bull", 3, rewards_member=False),
+            LineItem("Red Bull", 3, 430, 106, 1396),  # 8.25% of 1290
+        )
+        self.assertEqual(engine.price_items(self.store, [("Red Bull", 3)], False)[0].tax, 106)
+        cart = Cart(engine, store=self.store)
+        cart.add_item("Red Bull", 3)
+        cart.add_item("Milk", 2)
+        self.assertEqual(cart.totals(self.store, rewards_member=True), (1900, 99, 1999))
+        result = BatchPricer(self.store, tax=tax).reprice_carts({"a": cart}, {"a": True})
+        self.assertEqual(result.carts["a"], (1900, 99, 1999))
+
+    def test_cart_reprices_when_the_day_rolls_over(self):
+        cart = Cart(PricingEngine(tax=TaxEngine(self.table)), store=self.store)
+        with mock.patch("classes.tax.date") as fake_date:
+            fake_date.today.return_value = date(2026, 8, 6)
+            cart.add_item("Red Bull", 3)
+            self.assertEqual(cart.totals(self.store, rewards_member=False), (1290, 106, 1396))
+            # Energy week starts at midnight: drinks are tax-free.
+            fake_date.today.return_value = date(2026, 8, 7)
+            self.assertEqual(cart.totals(self.store, rewards_member=False), (1290, 0, 1290))
+
+
+if __name__ == "__main__":
+    unittest.main()